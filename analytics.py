@@ -0,0 +1,111 @@
+import bisect
+from collections import defaultdict
+
+import journal
+from constants import (
+    TURNAROUND_FROM,
+    TURNAROUND_TO,
+    TURNAROUND_PERCENTILES,
+    TURNAROUND_BUCKETS_HOURS,
+    TURNAROUND_UNKNOWN_LESSON
+)
+
+
+QWORDS_PER_RECORD = journal.RECORD.size // 8
+SECONDS_IN_HOUR = 3600
+
+
+def read_columns(data):
+    """Выделяет столбцы журнала срезами с шагом без разбора записей."""
+    size = journal.count_records(data) * journal.RECORD.size
+    view = memoryview(data)[:size]
+    qwords = view.cast('q')
+    octets = view.cast('B')
+    step = QWORDS_PER_RECORD
+    return {
+        'homework_id': qwords[
+            journal.HOMEWORK_ID_OFFSET // 8::step
+        ].tolist(),
+        'date_updated': qwords[
+            journal.DATE_UPDATED_OFFSET // 8::step
+        ].tolist(),
+        'new_status': octets[
+            journal.NEW_STATUS_OFFSET::journal.RECORD.size
+        ].tolist()
+    }
+
+
+def review_durations(columns):
+    """Находит длительности проверок от взятия в работу до вердикта.
+
+    Идентификатор работы в Практикуме уникален, поэтому аккаунт
+    в ключ не входит.
+    """
+    start_code = journal.status_code(TURNAROUND_FROM)
+    final_codes = frozenset(
+        journal.status_code(status) for status in TURNAROUND_TO
+    )
+    started = {}
+    keys = []
+    durations = []
+    for key, date_updated, status in zip(
+        columns['homework_id'],
+        columns['date_updated'],
+        columns['new_status']
+    ):
+        if status == start_code:
+            started[key] = date_updated
+        elif status in final_codes and key in started:
+            keys.append(key)
+            durations.append(date_updated - started.pop(key))
+    return keys, durations
+
+
+def percentile(ordered, share):
+    """Вычисляет перцентиль отсортированной выборки с интерполяцией."""
+    position = (len(ordered) - 1) * share / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        position - lower
+    )
+
+
+def summarize(durations, percentiles=TURNAROUND_PERCENTILES,
+              buckets=TURNAROUND_BUCKETS_HOURS):
+    """Собирает распределение длительностей проверки в часах."""
+    ordered = sorted(durations)
+    bounds = [hours * SECONDS_IN_HOUR for hours in buckets]
+    counts = []
+    previous = 0
+    for bound in bounds:
+        position = bisect.bisect_left(ordered, bound)
+        counts.append(position - previous)
+        previous = position
+    counts.append(len(ordered) - previous)
+    return {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered) / SECONDS_IN_HOUR,
+        'percentiles': {
+            share: percentile(ordered, share) / SECONDS_IN_HOUR
+            for share in percentiles
+        },
+        'buckets': counts
+    }
+
+
+def turnaround(path, lessons=None, percentiles=TURNAROUND_PERCENTILES):
+    """Считает распределения времени проверки по урокам.
+
+    `lessons` сопоставляет id работы название урока.
+    """
+    data = journal.open_mapped(path)
+    keys, durations = review_durations(read_columns(data))
+    lessons = lessons or {}
+    grouped = defaultdict(list)
+    for key, duration in zip(keys, durations):
+        grouped[lessons.get(key, TURNAROUND_UNKNOWN_LESSON)].append(duration)
+    return {
+        lesson: summarize(values, percentiles)
+        for lesson, values in sorted(grouped.items())
+    }
@@ -0,0 +1,217 @@
+import codecs
+import json
+import logging
+from http import HTTPStatus
+
+import requests
+
+import config
+import storage
+from records import Homework
+from constants import (
+    DEFAULT_ACCOUNT,
+    BACKFILL_FROM_DATE,
+    BACKFILL_BATCH_SIZE,
+    BACKFILL_CHUNK_SIZE,
+    BACKFILL_DONE,
+    BACKFILL_SKIPPED,
+    ERROR_API_RESPONSE,
+    ERROR_API_JSON,
+    ERROR_MISSING_HOMEWORKS_KEY,
+    ERROR_INCOMPLETE_JSON,
+    ERROR_UNEXPECTED_JSON,
+    EXPECTED_TYPE,
+    EXPECTED_LIST,
+    ERROR_UNKNOWN_ACCOUNT
+)
+
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE = ' \t\n\r'
+ERROR_KEYS = ('code', 'error')
+# Тип значения по первому символу, чтобы не декодировать его целиком
+JSON_TYPE_NAMES = {'{': 'dict', '[': 'list', '"': 'str', 'n': 'NoneType'}
+# Хвост числа, который raw_decode оставляет неразобранным: `.`, `e`, `e+`
+NUMBER_TAIL = frozenset('0123456789.eE+-')
+NUMBER_TAIL_SIZE = 2
+decoder = json.JSONDecoder()
+
+
+class JsonStream:
+    """Текстовый буфер поверх потока байтов с подгрузкой по требованию."""
+
+    def __init__(self, chunks):
+        """Запоминает источник кусков ответа."""
+        self.chunks = iter(chunks)
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Дочитывает следующий кусок, отбрасывая уже разобранный текст."""
+        if self.eof:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            self.buffer = self.buffer[self.pos:] + self.text_decoder.decode(
+                b'', final=True
+            )
+        else:
+            self.buffer = self.buffer[self.pos:] + self.text_decoder.decode(
+                chunk
+            )
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Возвращает следующий значимый символ, пропуская пробелы."""
+        while True:
+            while (
+                self.pos < len(self.buffer)
+                and self.buffer[self.pos] in WHITESPACE
+            ):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError(ERROR_INCOMPLETE_JSON)
+
+    def expect(self, char):
+        """Пропускает ожидаемый символ-разделитель."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(ERROR_UNEXPECTED_JSON.format(
+                char=found, pos=self.pos
+            ))
+        self.pos += 1
+
+    def value(self):
+        """Декодирует очередное JSON-значение целиком."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise ValueError(ERROR_INCOMPLETE_JSON)
+                continue
+            # Число на границе буфера может продолжаться в следующем куске
+            tail = self.buffer[end:]
+            if (
+                len(tail) <= NUMBER_TAIL_SIZE and set(tail) <= NUMBER_TAIL
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+def json_type_name(char):
+    """Определяет тип JSON-значения по его первому символу."""
+    return JSON_TYPE_NAMES.get(char, 'scalar')
+
+
+def iter_homeworks(chunks, params=None, key='homeworks'):
+    """Поэлементно разбирает массив `homeworks` из потока ответа API."""
+    stream = JsonStream(chunks)
+    first = stream.peek()
+    if first != '{':
+        raise TypeError(EXPECTED_TYPE.format(type_name=json_type_name(first)))
+    stream.pos += 1
+    while True:
+        if stream.peek() == '}':
+            raise KeyError(ERROR_MISSING_HOMEWORKS_KEY)
+        name = stream.value()
+        stream.expect(':')
+        if name != key:
+            value = stream.value()
+            if name in ERROR_KEYS:
+                raise RuntimeError(ERROR_API_JSON.format(
+                    key=name, value=value, params=params
+                ))
+            if stream.peek() == ',':
+                stream.pos += 1
+            continue
+        if stream.peek() != '[':
+            raise TypeError(EXPECTED_LIST.format(
+                key=key, type_name=json_type_name(stream.peek())
+            ))
+        stream.pos += 1
+        yield from iter_array(stream)
+        return
+
+
+def iter_array(stream):
+    """Отдаёт элементы массива, начало которого уже пропущено."""
+    if stream.peek() == ']':
+        return
+    while True:
+        yield stream.value()
+        if stream.peek() == ']':
+            return
+        stream.expect(',')
+
+
+def iter_batches(items, size):
+    """Группирует элементы потока в списки заданного размера."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def find_account(name):
+    """Находит аккаунт в настройках по имени.
+
+    Неизвестное имя — ошибка: иначе история чужого аккаунта
+    сохранилась бы под запрошенным именем.
+    """
+    for account in config.current().accounts:
+        if account.name == name:
+            return account
+    raise KeyError(ERROR_UNKNOWN_ACCOUNT.format(account=name))
+
+
+def backfill(connection, account=DEFAULT_ACCOUNT,
+             from_date=BACKFILL_FROM_DATE, batch_size=BACKFILL_BATCH_SIZE):
+    """Загружает историю домашних работ в хранилище пачками."""
+    params = {'from_date': from_date}
+    try:
+        response = requests.get(
+            config.current().endpoint,
+            headers=config.auth_headers(find_account(account).token),
+            params=params,
+            stream=True
+        )
+    except requests.RequestException as e:
+        raise ConnectionError(
+            f'Ошибка соединения: {e}, параметры: {params}'
+        ) from e
+    with response:
+        if response.status_code != HTTPStatus.OK:
+            raise RuntimeError(ERROR_API_RESPONSE.format(
+                status_code=response.status_code,
+                params=params
+            ))
+        saved = skipped = 0
+        homeworks = iter_homeworks(
+            response.iter_content(chunk_size=BACKFILL_CHUNK_SIZE), params
+        )
+        for batch in iter_batches(homeworks, batch_size):
+            valid = []
+            for homework in batch:
+                if isinstance(homework, dict) and 'id' in homework:
+                    valid.append(Homework.from_payload(homework))
+                else:
+                    skipped += 1
+                    logger.warning(BACKFILL_SKIPPED.format(homework=homework))
+            saved += storage.save_homeworks(connection, account, valid)
+    logger.info(BACKFILL_DONE.format(saved=saved, skipped=skipped))
+    return saved
@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import Counter
+from itertools import count
+
+from constants import (
+    NOTIFY_BATCH_WINDOW,
+    TELEGRAM_MESSAGE_LIMIT,
+    NOTIFY_QUEUE_LIMIT
+)
+
+
+# Виды строк очереди в порядке отбрасывания при переполнении
+ERROR = 'error'
+STATUS = 'status'
+SHED_ORDER = (ERROR, STATUS)
+
+
+def split_message(lines, limit=TELEGRAM_MESSAGE_LIMIT):
+    """Склеивает строки в сообщения не длиннее лимита Telegram.
+
+    Возвращает пары (текст, номера вошедших строк). Строка длиннее
+    лимита режется на части.
+    """
+    chunks = []
+    current = []
+    indexes = []
+    size = 0
+    for index, line in enumerate(lines):
+        pieces = [
+            line[start:start + limit]
+            for start in range(0, len(line), limit)
+        ] or ['']
+        for piece in pieces:
+            extra = len(piece) + (1 if current else 0)
+            if current and size + extra > limit:
+                chunks.append(('\n'.join(current), indexes))
+                current, indexes, size = [], [], 0
+                extra = len(piece)
+            current.append(piece)
+            if not indexes or indexes[-1] != index:
+                indexes.append(index)
+            size += extra
+    if current:
+        chunks.append(('\n'.join(current), indexes))
+    return chunks
+
+
+class Coalescer:
+    """Копит изменения статусов по чатам и отдаёт их одним сообщением.
+
+    Изменения одного чата собираются в течение `window` секунд с
+    момента первого из них; цикл опроса досылает их по истечении окна,
+    не дожидаясь следующего цикла. Повторное изменение той же работы заменяет
+    предыдущее, так что в сообщение попадает только последний статус.
+    Очередь ограничена `max_items` строками: при переполнении первыми
+    отбрасываются уведомления об ошибках, затем самые старые изменения.
+    Очередь пополняется и разбирается из разных потоков.
+    """
+
+    def __init__(self, window=NOTIFY_BATCH_WINDOW,
+                 limit=TELEGRAM_MESSAGE_LIMIT, max_items=NOTIFY_QUEUE_LIMIT):
+        """Настраивает окно накопления, лимит длины и размер очереди."""
+        self.window = window
+        self.limit = limit
+        self.max_items = max_items
+        self.pending = {}
+        self.started = {}
+        self.sequence = count()
+        self.size = 0
+        self.collapsed = 0
+        self.shed = Counter()
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        """Возвращает число ожидающих отправки изменений."""
+        return self.size
+
+    def add(self, chat_id, key, line, payload=None, kind=STATUS):
+        """Ставит строку об изменении в очередь чата."""
+        with self.lock:
+            items = self.pending.setdefault(chat_id, {})
+            if items.pop(key, None) is None:
+                self.size += 1
+            else:
+                self.collapsed += 1
+            items[key] = (next(self.sequence), kind, line, payload)
+            self.started.setdefault(chat_id, time.monotonic())
+            while self.size > self.max_items:
+                self.shed_oldest()
+
+    def shed_oldest(self):
+        """Отбрасывает самую старую строку с наименьшим приоритетом."""
+        chat_id, key = min(
+            (SHED_ORDER.index(item[1]), item[0], chat_id, key)
+            for chat_id, items in self.pending.items()
+            for key, item in items.items()
+        )[2:]
+        items = self.pending[chat_id]
+        self.shed[items.pop(key)[1]] += 1
+        self.size -= 1
+        if not items:
+            del self.pending[chat_id]
+            del self.started[chat_id]
+
+    def stats(self):
+        """Возвращает длину очереди, число схлопнутых и отброшенных строк."""
+        with self.lock:
+            return {
+                'queued': self.size,
+                'collapsed': self.collapsed,
+                'shed_errors': self.shed[ERROR],
+                'shed_statuses': self.shed[STATUS]
+            }
+
+    def due(self, now=None):
+        """Возвращает чаты, окно накопления которых истекло."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            return [
+                chat_id for chat_id, started in self.started.items()
+                if started + self.window <= now
+            ]
+
+    def take(self, chat_id):
+        """Забирает сообщения одного чата.
+
+        Возвращает тройки (чат, текст, полезные нагрузки строк).
+        """
+        with self.lock:
+            # Очередь чата могла уйти целиком при переполнении
+            if chat_id not in self.pending:
+                return []
+            del self.started[chat_id]
+            items = list(self.pending.pop(chat_id).values())
+            self.size -= len(items)
+        return [
+            (chat_id, text, [items[index][3] for index in indexes])
+            for text, indexes in split_message(
+                [item[2] for item in items], self.limit
+            )
+        ]
+
+    def flush(self, now=None):
+        """Забирает все готовые к отправке сообщения."""
+        return [
+            batch for chat_id in self.due(now) for batch in self.take(chat_id)
+        ]
@@ -0,0 +1,54 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from telebot import TeleBot, apihelper  # noqa: E402
+
+import botapi  # noqa: E402
+from telegram_stub import serve  # noqa: E402
+
+
+MESSAGES = 2000
+WORKERS = 8
+CHAT_ID = 12345
+
+
+def measure(name, function):
+    """Печатает скорость отправки."""
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    print(f'{name:>28}: {MESSAGES / elapsed:8.0f} сообщений/с')
+
+
+def main():
+    """Сравнивает TeleBot и встроенный клиент на локальной заглушке."""
+    server, url = serve()
+    apihelper.API_URL = url + '/bot{0}/{1}'
+    telebot_bot = TeleBot('1234:stub')
+    client = botapi.BotApiClient('1234:stub', base_url=url, workers=WORKERS)
+    texts = [f'Сообщение {number}' for number in range(MESSAGES)]
+
+    def send_each(bot):
+        for text in texts:
+            bot.send_message(chat_id=CHAT_ID, text=text)
+
+    def send_concurrently(bot):
+        with ThreadPoolExecutor(WORKERS) as executor:
+            list(executor.map(
+                lambda text: bot.send_message(chat_id=CHAT_ID, text=text),
+                texts
+            ))
+
+    measure('TeleBot, подряд', lambda: send_each(telebot_bot))
+    measure('BotApiClient, подряд', lambda: send_each(client))
+    measure('TeleBot, 8 потоков', lambda: send_concurrently(telebot_bot))
+    measure('BotApiClient, 8 потоков', lambda: send_concurrently(client))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import botapi  # noqa: E402
+import botpool  # noqa: E402
+from telegram_stub import serve  # noqa: E402
+
+
+MESSAGES = 200
+CHATS = 60
+RATE = 50
+WORKERS = 8
+
+
+def measure(url, bots):
+    """Печатает скорость отправки пулом из `bots` ботов."""
+    pool = botpool.BotPool([
+        botapi.BotApiClient(f'{number}:stub', base_url=url, workers=WORKERS)
+        for number in range(bots)
+    ], rate=RATE)
+    messages = [
+        (number % CHATS, f'Сообщение {number}') for number in range(MESSAGES)
+    ]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(WORKERS) as executor:
+        list(executor.map(
+            lambda message: pool.send_message(*message), messages
+        ))
+    elapsed = time.perf_counter() - started
+    print(f'{bots} бот(ов) по {RATE} сообщений/с: '
+          f'{MESSAGES / elapsed:6.0f} сообщений/с')
+
+
+def main():
+    """Показывает рост общей скорости отправки с числом ботов."""
+    server, url = serve()
+    for bots in (1, 2, 4):
+        measure(url, bots)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
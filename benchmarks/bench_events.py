@@ -0,0 +1,66 @@
+import io
+import logging
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import events  # noqa: E402
+from constants import SEND_MESSAGE_DEBUG  # noqa: E402
+
+
+CALLS = 100_000
+TEXT = 'Изменился статус проверки работы "hw.zip". Работа проверена.'
+
+
+def make_logger(name, level, formatter):
+    """Создаёт отдельный логгер, пишущий в память."""
+    logger = logging.getLogger(f'bench.{name}')
+    logger.propagate = False
+    logger.setLevel(level)
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+    return logger, handler.stream
+
+
+def measure(name, level, formatter, function):
+    """Печатает время на запись и объём журнала."""
+    logger, stream = make_logger(name, level, formatter)
+    elapsed = timeit.timeit(lambda: function(logger), number=CALLS)
+    print(f'{name:>36}: {elapsed / CALLS * 1e6:6.2f} мкс, '
+          f'{len(stream.getvalue().encode()) / 1024:8.0f} КБ')
+
+
+def format_eagerly(logger):
+    logger.debug(SEND_MESSAGE_DEBUG.format(text=TEXT))
+
+
+def emit_event(logger):
+    events.emit(
+        logger, logging.DEBUG, 'message_sent', SEND_MESSAGE_DEBUG,
+        chat_id=12345, text=TEXT
+    )
+
+
+def main():
+    """Сравнивает строки с форматированием и события с выборкой."""
+    text = logging.Formatter(
+        '%(asctime)s, %(levelname)s, %(name)s, %(funcName)s,'
+        'line %(lineno)d, %(message)s'
+    )
+    for level in (logging.INFO, logging.DEBUG):
+        level_name = logging.getLevelName(level)
+        measure(f'строка, {level_name}', level, text, format_eagerly)
+        measure(f'событие, {level_name}', level, text, emit_event)
+    json_lines = events.JsonFormatter()
+    measure('событие, JSON', logging.DEBUG, json_lines, emit_event)
+    events.sampler = events.Sampler({'message_sent': 100})
+    measure(
+        'событие, JSON, каждое сотое', logging.DEBUG, json_lines, emit_event
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import validation  # noqa: E402
+from constants import HOMEWORK_VERDICTS  # noqa: E402
+
+
+ITEMS = 10_000
+REPEAT = 20
+STATUSES = list(HOMEWORK_VERDICTS)
+
+
+def payload(items=ITEMS, broken_every=None):
+    """Собирает ответ API с каждой `broken_every`-й плохой записью."""
+    homeworks = []
+    for number in range(items):
+        if broken_every and number % broken_every == 0:
+            homeworks.append({'id': number, 'status': 'unknown'})
+            continue
+        homeworks.append({
+            'id': number,
+            'homework_name': f'hw{number}.zip',
+            'status': STATUSES[number % len(STATUSES)],
+            'lesson_name': 'Проект спринта',
+            'date_updated': '2021-04-11T10:31:09Z'
+        })
+    return homeworks
+
+
+def check_each(homeworks):
+    """Прежний способ: исключение на плохую запись, ловится снаружи."""
+    valid = []
+    for homework in homeworks:
+        try:
+            if not isinstance(homework, dict):
+                raise TypeError(type(homework).__name__)
+            for key in ('homework_name', 'status'):
+                if key not in homework:
+                    raise KeyError(key)
+            if homework['status'] not in HOMEWORK_VERDICTS:
+                raise ValueError(homework['status'])
+        except (TypeError, KeyError, ValueError):
+            continue
+        valid.append(homework)
+    return valid
+
+
+def main():
+    """Сравнивает проверку по записям и однопроходную проверку."""
+    validator = validation.Validator(HOMEWORK_VERDICTS)
+    for broken_every in (None, 100, 2):
+        homeworks = payload(broken_every=broken_every)
+        share = 1 / broken_every if broken_every else 0
+        print(f'доля плохих записей {share:.0%}:')
+        for name, function in (
+            ('check_each', lambda: check_each(homeworks)),
+            ('Validator.split', lambda: validator.split(homeworks)),
+        ):
+            best = min(timeit.repeat(function, number=1, repeat=REPEAT))
+            print(f'{name:>18}: {best * 1000:.2f} мс на {ITEMS} записей')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class BotApiHandler(BaseHTTPRequestHandler):
+    """Заглушка Bot API: отвечает на любой метод успешным сообщением."""
+
+    protocol_version = 'HTTP/1.1'
+    # Иначе заголовки и тело ответа ждут друг друга по алгоритму Нейгла
+    disable_nagle_algorithm = True
+    lock = threading.Lock()
+    message_id = 0
+
+    def read_params(self):
+        """Читает параметры из JSON или формы, как их шлют клиенты."""
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            return json.loads(body or b'{}')
+        query = body.decode() or self.path.partition('?')[2]
+        return {key: values[0] for key, values in parse_qs(query).items()}
+
+    def handle_method(self):
+        """Отвечает как sendMessage."""
+        params = self.read_params()
+        with self.lock:
+            BotApiHandler.message_id += 1
+            message_id = BotApiHandler.message_id
+        body = json.dumps({'ok': True, 'result': {
+            'message_id': message_id,
+            'date': 0,
+            'chat': {'id': int(params.get('chat_id', 0)), 'type': 'private'},
+            'text': params.get('text', '')
+        }}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = handle_method
+
+    def log_message(self, *args):
+        """Не засоряет вывод замера."""
+
+
+def serve():
+    """Запускает заглушку на свободном порту, возвращает сервер и адрес."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BotApiHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
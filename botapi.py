@@ -0,0 +1,124 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import prewarm
+from constants import (
+    BOT_API_URL,
+    BOT_API_WORKERS,
+    NOTIFY_TIMEOUT,
+    BOT_API_ERROR,
+    BOT_API_RATE_LIMITED
+)
+
+
+class BotApiError(RuntimeError):
+    """Ошибка Bot API с кодом и, для 429, временем ожидания."""
+
+    def __init__(self, method, code, description, retry_after=None):
+        """Запоминает разобранный ответ Telegram."""
+        super().__init__(BOT_API_ERROR.format(
+            method=method, code=code, description=description
+        ))
+        self.method = method
+        self.code = code
+        self.description = description
+        self.retry_after = retry_after
+
+
+class BotApiClient:
+    """Минимальный клиент Bot API для отправки и правки сообщений.
+
+    Повторяет нужную боту часть интерфейса TeleBot (`send_message`,
+    `edit_message_text`, `pin_chat_message`), поэтому подставляется
+    вместо него без изменения вызывающего кода. Запросы идут через
+    общую сессию с пулом соединений, поэтому потоки этапа отправки
+    конвейера шлют сообщения параллельно, не открывая новых
+    соединений. Ответ 429 запоминается для чата:
+    до истечения `retry_after` запросы в этот чат сразу завершаются
+    ошибкой, не расходуя лимит.
+    """
+
+    def __init__(self, token, base_url=BOT_API_URL, session=None,
+                 workers=BOT_API_WORKERS, clock=time.monotonic):
+        """Настраивает адрес API, сессию и размер пула соединений."""
+        self.url = f'{base_url.rstrip("/")}/bot{token}/'
+        self.session = (
+            session or prewarm.session or prewarm.create_session(workers)
+        )
+        self.clock = clock
+        self.blocked = {}
+        self.lock = threading.Lock()
+
+    def call(self, method, chat_id, timeout=None, **params):
+        """Вызывает метод Bot API и возвращает поле `result`."""
+        chat_id = str(chat_id)
+        self.check_rate_limit(method, chat_id)
+        response = self.session.post(
+            self.url + method,
+            json={'chat_id': chat_id, **params},
+            timeout=timeout or NOTIFY_TIMEOUT
+        )
+        try:
+            payload = response.json()
+        except ValueError:
+            raise BotApiError(method, response.status_code, response.text)
+        if payload.get('ok'):
+            return payload['result']
+        retry_after = payload.get('parameters', {}).get('retry_after')
+        if retry_after is not None:
+            with self.lock:
+                self.blocked[chat_id] = self.clock() + retry_after
+        raise BotApiError(
+            method,
+            payload.get('error_code', response.status_code),
+            payload.get('description', ''),
+            retry_after
+        )
+
+    def check_rate_limit(self, method, chat_id):
+        """Не пускает запрос в чат, для которого действует 429."""
+        with self.lock:
+            until = self.blocked.get(chat_id)
+            if until is None:
+                return
+            left = until - self.clock()
+            if left <= 0:
+                del self.blocked[chat_id]
+                return
+        raise BotApiError(
+            method, 429,
+            BOT_API_RATE_LIMITED.format(chat_id=chat_id, seconds=left),
+            left
+        )
+
+    def rate_limits(self):
+        """Возвращает чаты под ограничением и оставшиеся секунды."""
+        now = self.clock()
+        with self.lock:
+            return {
+                chat_id: until - now for chat_id, until in self.blocked.items()
+                if until > now
+            }
+
+    def send_message(self, chat_id=None, text=None, timeout=None, **params):
+        """Отправляет сообщение, возвращает объект с `message_id`."""
+        return SimpleNamespace(**self.call(
+            'sendMessage', chat_id, timeout, text=text, **params
+        ))
+
+    def edit_message_text(self, text, chat_id=None, message_id=None,
+                          timeout=None, **params):
+        """Меняет текст отправленного сообщения."""
+        return self.call(
+            'editMessageText', chat_id, timeout,
+            message_id=message_id, text=text, **params
+        )
+
+    def pin_chat_message(self, chat_id, message_id,
+                         disable_notification=False, timeout=None):
+        """Закрепляет сообщение в чате."""
+        return self.call(
+            'pinChatMessage', chat_id, timeout,
+            message_id=message_id, disable_notification=disable_notification
+        )
@@ -0,0 +1,213 @@
+import inspect
+import logging
+import threading
+import time
+import zlib
+from functools import lru_cache
+
+import deadline
+from constants import (
+    TELEGRAM_TOKENS,
+    BOT_RATE_LIMIT,
+    NOTIFY_TIMEOUT,
+    BOT_THROTTLED,
+    BOT_CHAT_MOVED,
+    BOT_POOL_BUSY
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def retry_after(error):
+    """Возвращает `retry_after` из ответа 429 или None для других ошибок.
+
+    Понимает исключения встроенного клиента и `ApiTelegramException`.
+    """
+    seconds = getattr(error, 'retry_after', None)
+    if seconds is not None:
+        return seconds
+    if getattr(error, 'error_code', None) != 429:
+        return None
+    result_json = getattr(error, 'result_json', None) or {}
+    return result_json.get('parameters', {}).get('retry_after', 1)
+
+
+@lru_cache(maxsize=None)
+def takes_timeout(bot_type, method):
+    """Проверяет, принимает ли метод бота аргумент `timeout`.
+
+    У `TeleBot` его принимает только `send_message`.
+    """
+    parameters = inspect.signature(getattr(bot_type, method)).parameters
+    return 'timeout' in parameters or any(
+        parameter.kind is parameter.VAR_KEYWORD
+        for parameter in parameters.values()
+    )
+
+
+def parse_tokens(primary, raw=TELEGRAM_TOKENS):
+    """Возвращает основной токен и дополнительные без повторов."""
+    tokens = [primary]
+    for token in raw.split(','):
+        token = token.strip()
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+class BotSlot:
+    """Один бот пула и учёт его отправок."""
+
+    def __init__(self, bot, rate):
+        """Запоминает бота и его предел сообщений в секунду."""
+        self.bot = bot
+        self.interval = 1 / rate if rate else 0
+        self.next_at = 0
+        self.blocked_until = 0
+        self.sent = 0
+        self.throttled = 0
+        self.chats = 0
+
+    def wait(self, now):
+        """Возвращает, сколько ждать до ближайшего окна отправки."""
+        return max(0, self.blocked_until - now, self.next_at - now)
+
+    def reserve(self, now):
+        """Занимает ближайшее окно отправки, возвращает ожидание до него."""
+        start = max(now, self.next_at, self.blocked_until)
+        self.next_at = start + self.interval
+        return start - now
+
+
+class BotPool:
+    """Пул ботов, между которыми делятся исходящие сообщения.
+
+    Подставляется вместо одного бота: чат закрепляется за ботом по
+    хешу id, так что отправка и правка сообщений одного чата идут от
+    одного бота. Каждый бот отправляет не чаще `rate` сообщений в
+    секунду, поэтому общий поток растёт с числом ботов. Получив 429,
+    бот выводится из ротации на `retry_after` секунд, а его чаты при
+    следующей отправке переезжают на наименее загруженный свободный бот.
+    Если ждать окна отправки дольше таймаута этапа `send`, запрос
+    сразу завершается `TimeoutError`, и изменение уходит в следующем
+    цикле.
+    """
+
+    def __init__(self, bots, rate=BOT_RATE_LIMIT, clock=time.monotonic,
+                 sleep=time.sleep):
+        """Настраивает ботов, предел скорости и источник времени."""
+        self.slots = [BotSlot(bot, rate) for bot in bots]
+        self.clock = clock
+        self.sleep = sleep
+        self.assignments = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        """Возвращает число ботов в пуле."""
+        return len(self.slots)
+
+    def least_blocked(self, now):
+        """Возвращает наименее загруженный свободный бот.
+
+        Если ограничены все, возвращает тот, что освободится раньше.
+        """
+        free = [slot for slot in self.slots if slot.blocked_until <= now]
+        if free:
+            return min(free, key=lambda slot: slot.chats)
+        return min(self.slots, key=lambda slot: slot.blocked_until)
+
+    def slot_for(self, chat_id):
+        """Возвращает бота чата, при необходимости переселяя чат."""
+        now = self.clock()
+        slot = self.assignments.get(chat_id)
+        if slot is None:
+            slot = self.slots[
+                zlib.crc32(chat_id.encode()) % len(self.slots)
+            ]
+            if slot.blocked_until > now:
+                slot = self.least_blocked(now)
+        elif slot.blocked_until <= now:
+            return slot
+        else:
+            slot.chats -= 1
+            slot = self.least_blocked(now)
+            logger.warning(BOT_CHAT_MOVED.format(
+                chat_id=chat_id, bot=self.slots.index(slot)
+            ))
+        slot.chats += 1
+        self.assignments[chat_id] = slot
+        return slot
+
+    def call(self, chat, method, *args, **kwargs):
+        """Вызывает метод бота, закреплённого за чатом, соблюдая пределы."""
+        limit = deadline.timeout('send', NOTIFY_TIMEOUT)
+        with self.lock:
+            slot = self.slot_for(str(chat))
+            now = self.clock()
+            wait = slot.wait(now)
+            if wait <= limit:
+                delay = slot.reserve(now)
+        if wait > limit:
+            raise TimeoutError(BOT_POOL_BUSY.format(
+                bot=self.slots.index(slot), seconds=wait
+            ))
+        if delay > 0:
+            self.sleep(delay)
+        if 'timeout' in kwargs and not takes_timeout(type(slot.bot), method):
+            del kwargs['timeout']
+        try:
+            result = getattr(slot.bot, method)(*args, **kwargs)
+        except Exception as error:
+            seconds = retry_after(error)
+            if seconds is not None:
+                self.throttle(slot, seconds)
+            raise
+        with self.lock:
+            slot.sent += 1
+        return result
+
+    def throttle(self, slot, seconds):
+        """Выводит бота из ротации на время ограничения Telegram."""
+        with self.lock:
+            slot.throttled += 1
+            slot.blocked_until = max(
+                slot.blocked_until, self.clock() + seconds
+            )
+        logger.warning(BOT_THROTTLED.format(
+            bot=self.slots.index(slot), seconds=seconds
+        ))
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        """Отправляет сообщение от бота чата."""
+        return self.call(
+            chat_id, 'send_message', chat_id=chat_id, text=text, **kwargs
+        )
+
+    def edit_message_text(self, text, chat_id=None, message_id=None,
+                          **kwargs):
+        """Правит сообщение от бота чата."""
+        return self.call(
+            chat_id, 'edit_message_text', text,
+            chat_id=chat_id, message_id=message_id, **kwargs
+        )
+
+    def pin_chat_message(self, chat_id, message_id, **kwargs):
+        """Закрепляет сообщение от бота чата."""
+        return self.call(
+            chat_id, 'pin_chat_message', chat_id, message_id, **kwargs
+        )
+
+    def stats(self):
+        """Возвращает по каждому боту отправки, 429, чаты и остаток паузы."""
+        now = self.clock()
+        with self.lock:
+            return [
+                {
+                    'sent': slot.sent,
+                    'throttled': slot.throttled,
+                    'chats': slot.chats,
+                    'blocked_for': max(0, slot.blocked_until - now)
+                }
+                for slot in self.slots
+            ]
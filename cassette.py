@@ -0,0 +1,119 @@
+import gzip
+import json
+import logging
+import threading
+import time
+from functools import wraps
+
+from constants import CASSETTE_STARTED, CASSETTE_WRITE_ERROR
+
+
+logger = logging.getLogger(__name__)
+
+
+class Recorder:
+    """Запись запросов и ответов в сжатый JSONL-файл (кассету).
+
+    Каждая строка — событие вида `{"kind", "offset", "elapsed",
+    "request", "response" | "error"}`, где `offset` отсчитывается от
+    начала записи. Кассета дописывается новым gzip-блоком, поэтому
+    перезапуск бота продолжает тот же файл.
+    """
+
+    def __init__(self, path, clock=time.monotonic):
+        """Открывает кассету на дозапись."""
+        self.path = path
+        self.clock = clock
+        self.started = clock()
+        self.file = gzip.open(path, 'at', encoding='utf-8')
+        self.lock = threading.Lock()
+
+    def write(self, kind, request, started, response=None, error=None):
+        """Добавляет событие в кассету."""
+        event = {
+            'kind': kind,
+            'offset': started - self.started,
+            'elapsed': self.clock() - started,
+            'request': request
+        }
+        if error is None:
+            event['response'] = response
+        else:
+            event['error'] = {
+                'type': type(error).__name__, 'message': str(error)
+            }
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self.lock:
+            self.file.write(line + '\n')
+            # Сбрасываем блок сразу: при падении бота кассета не теряется
+            self.file.flush()
+
+    def close(self):
+        """Закрывает кассету."""
+        with self.lock:
+            self.file.close()
+
+
+recorder = None
+
+
+def start(path):
+    """Включает запись трафика в кассету."""
+    global recorder
+    recorder = Recorder(path)
+    logger.info(CASSETTE_STARTED.format(path=path))
+    return recorder
+
+
+def stop():
+    """Выключает запись и закрывает кассету."""
+    global recorder
+    if recorder is not None:
+        recorder.close()
+    recorder = None
+
+
+def recorded(kind, describe):
+    """Записывает вызовы функции в кассету, если запись включена.
+
+    `describe` получает аргументы вызова и возвращает описание запроса,
+    пригодное для JSON; секреты в него попадать не должны.
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            active = recorder
+            if active is None:
+                return function(*args, **kwargs)
+            started = active.clock()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as error:
+                save(active, kind, describe(*args, **kwargs), started,
+                     error=error)
+                raise
+            save(active, kind, describe(*args, **kwargs), started,
+                 response=result)
+            return result
+        return wrapper
+    return decorator
+
+
+def save(active, kind, request, started, **outcome):
+    """Пишет событие, не давая ошибке записи сломать основной цикл."""
+    try:
+        active.write(kind, request, started, **outcome)
+    except Exception as error:
+        logger.error(CASSETTE_WRITE_ERROR.format(error=error))
+
+
+def read(path):
+    """Читает события кассеты по порядку."""
+    with gzip.open(path, 'rt', encoding='utf-8') as source:
+        try:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+        except EOFError:
+            # Последний блок оборван при падении бота, остальное цело
+            return
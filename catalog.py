@@ -0,0 +1,89 @@
+import threading
+from functools import lru_cache
+
+from constants import (
+    DEFAULT_LOCALE,
+    UNKNOWN_STATUS_FALLBACK,
+    MESSAGE_CACHE_SIZE,
+    LOCALIZED_VERDICTS,
+    STATUS_CHANGED_TEMPLATES,
+    UNKNOWN_VERDICTS,
+    INVALID_STATUS
+)
+
+
+PLACEHOLDER = '{homework_name}'
+
+
+def compile_template(locale, verdict):
+    """Подставляет вердикт заранее и делит шаблон вокруг имени работы."""
+    template = STATUS_CHANGED_TEMPLATES.get(
+        locale, STATUS_CHANGED_TEMPLATES[DEFAULT_LOCALE]
+    )
+    prefix, suffix = template.split(PLACEHOLDER)
+    return prefix, suffix.format(verdict=verdict)
+
+
+class Catalog:
+    """Каталог сообщений о статусах с заранее собранными шаблонами.
+
+    Шаблоны для каждой пары (статус, язык) собираются при создании,
+    готовые сообщения запоминаются по (имя работы, статус, язык).
+    Неизвестный статус либо вызывает ValueError (`fallback='raise'`),
+    либо описывается общим текстом (`fallback='generic'`).
+    """
+
+    def __init__(self, verdicts, fallback=UNKNOWN_STATUS_FALLBACK):
+        """Собирает шаблоны для вердиктов всех языков."""
+        self.verdicts = verdicts
+        self.fallback = fallback
+        self.by_locale = {**LOCALIZED_VERDICTS, DEFAULT_LOCALE: verdicts}
+        self.templates = {
+            (status, locale): compile_template(locale, verdict)
+            for locale, locale_verdicts in self.by_locale.items()
+            for status, verdict in locale_verdicts.items()
+        }
+        self.render = lru_cache(maxsize=MESSAGE_CACHE_SIZE)(self.build)
+
+    def template(self, status, locale):
+        """Находит шаблон статуса, при необходимости — запасной."""
+        template = (
+            self.templates.get((status, locale))
+            or self.templates.get((status, DEFAULT_LOCALE))
+        )
+        if template is not None:
+            return template
+        if self.fallback != 'generic':
+            raise ValueError(INVALID_STATUS.format(homework_status=status))
+        verdict = UNKNOWN_VERDICTS.get(
+            locale, UNKNOWN_VERDICTS[DEFAULT_LOCALE]
+        ).format(status=status)
+        return compile_template(locale, verdict)
+
+    def verdict(self, status, locale=DEFAULT_LOCALE):
+        """Возвращает текст вердикта на языке чата или сам статус."""
+        return (
+            self.by_locale.get(locale, {}).get(status)
+            or self.verdicts.get(status, status)
+        )
+
+    def build(self, homework_name, status, locale=DEFAULT_LOCALE):
+        """Формирует сообщение без кэша."""
+        prefix, suffix = self.template(status, locale)
+        return f'{prefix}{homework_name}{suffix}'
+
+
+catalog = None
+lock = threading.Lock()
+
+
+def for_verdicts(verdicts):
+    """Возвращает каталог для текущих вердиктов, пересобирая его при смене.
+
+    Настройки подменяются целиком, поэтому достаточно сравнить ссылки.
+    """
+    global catalog
+    with lock:
+        if catalog is None or catalog.verdicts is not verdicts:
+            catalog = Catalog(verdicts)
+        return catalog
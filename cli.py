@@ -0,0 +1,241 @@
+import argparse
+import logging
+import sys
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from telebot import TeleBot
+
+import analytics
+import backfill
+import config
+import deadletters
+import homework
+import journal
+import replay
+import storage
+import validation
+from records import Homework
+from constants import (
+    DEFAULT_ACCOUNT,
+    STATE_DB_PATH,
+    BACKFILL_FROM_DATE,
+    BACKFILL_BATCH_SIZE,
+    JOURNAL_PATH,
+    JOURNAL_NO_EVENTS,
+    JOURNAL_EVENT,
+    TURNAROUND_BUCKETS_HOURS,
+    TURNAROUND_HEADER,
+    TURNAROUND_PERCENTILE,
+    TURNAROUND_BUCKET,
+    TURNAROUND_BUCKET_LAST,
+    TURNAROUND_EMPTY,
+    CASSETTE_PATH,
+    REPLAY_REPORT,
+    REPLAY_MISMATCH,
+    DEAD_LETTERS_EMPTY,
+    DEAD_LETTER_LINE,
+    DEAD_LETTERS_REPROCESSED,
+    CLI_MEMORY_DB
+)
+
+
+def run_backfill(args):
+    """Загружает историю домашних работ аккаунта в хранилище."""
+    connection = storage.connect(args.db)
+    try:
+        backfill.backfill(
+            connection,
+            account=args.account,
+            from_date=args.from_date,
+            batch_size=args.batch_size
+        )
+    finally:
+        connection.close()
+
+
+def format_time(timestamp):
+    """Форматирует метку времени UTC для вывода."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def run_journal_index(args):
+    """Перестраивает индекс журнала изменений статуса."""
+    journal.build_index(args.journal)
+
+
+def run_journal_query(args):
+    """Выводит изменения статуса работы из журнала."""
+    events = journal.query(args.journal, args.account, args.homework_id)
+    if not events:
+        print(JOURNAL_NO_EVENTS)
+    for event in events:
+        print(JOURNAL_EVENT.format(
+            account=event['account'],
+            homework_id=event['homework_id'],
+            old_status=event['old_status'] or '-',
+            new_status=event['new_status'],
+            date_updated=format_time(event['date_updated']),
+            notified_at=format_time(event['notified_at'])
+        ))
+
+
+def run_turnaround(args):
+    """Выводит распределение времени проверки по урокам."""
+    connection = storage.connect(args.db)
+    try:
+        lessons = storage.load_lessons(connection)
+    finally:
+        connection.close()
+    report = analytics.turnaround(args.journal, lessons)
+    if not report:
+        print(TURNAROUND_EMPTY)
+    for lesson, summary in report.items():
+        print(TURNAROUND_HEADER.format(lesson=lesson, **summary))
+        for percentile, hours in summary['percentiles'].items():
+            print(TURNAROUND_PERCENTILE.format(
+                percentile=percentile, hours=hours
+            ))
+        for hours, count in zip(TURNAROUND_BUCKETS_HOURS, summary['buckets']):
+            print(TURNAROUND_BUCKET.format(hours=hours, count=count))
+        print(TURNAROUND_BUCKET_LAST.format(
+            hours=TURNAROUND_BUCKETS_HOURS[-1], count=summary['buckets'][-1]
+        ))
+
+
+def run_replay(args):
+    """Воспроизводит кассету с записанным трафиком без сети."""
+    report = replay.run(args.cassette, speed=args.speed)
+    print(REPLAY_REPORT.format(**report))
+    for text, count in report['mismatches'].items():
+        print(REPLAY_MISMATCH.format(count=count, text=text))
+
+
+def run_dead_letters(args):
+    """Выводит отложенные записи, которые не удалось обработать."""
+    connection = storage.connect(args.db)
+    try:
+        letters = storage.load_dead_letters(connection)
+    finally:
+        connection.close()
+    if not letters:
+        print(DEAD_LETTERS_EMPTY)
+    for account, fingerprint, payload, reason, first_seen, _ in letters:
+        print(DEAD_LETTER_LINE.format(
+            account=account,
+            fingerprint=fingerprint,
+            first_seen=format_time(first_seen),
+            reason=reason,
+            payload=payload
+        ))
+
+
+def run_reprocess(args):
+    """Повторно обрабатывает отложенные записи с текущими настройками.
+
+    Исправленные записи отправляются в основной чат и сохраняются
+    в хранилище как известные боту.
+    """
+    connection = storage.connect(args.db)
+    settings = config.reload()
+    bot = None if args.dry_run else TeleBot(token=homework.TELEGRAM_TOKEN)
+
+    def deliver(account, item):
+        if not homework.send_message(bot, homework.parse_status(item)):
+            return False
+        storage.save_homeworks(
+            connection, account, [Homework.from_payload(item)]
+        )
+        return True
+
+    try:
+        resolved, remaining = deadletters.reprocess(
+            connection,
+            validation.Validator(settings.verdicts),
+            deliver,
+            dry_run=args.dry_run
+        )
+    finally:
+        connection.close()
+    print(DEAD_LETTERS_REPROCESSED.format(
+        resolved=resolved, remaining=remaining
+    ))
+
+
+def build_parser():
+    """Собирает разбор аргументов служебных команд."""
+    parser = argparse.ArgumentParser(description='Служебные команды бота.')
+    parser.add_argument('--db', default=STATE_DB_PATH,
+                        help='путь к хранилищу состояния')
+    parser.add_argument('--account', default=DEFAULT_ACCOUNT,
+                        help='аккаунт Практикума')
+    parser.add_argument('--journal', default=JOURNAL_PATH,
+                        help='путь к журналу изменений статуса')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    backfill_parser = subparsers.add_parser(
+        'backfill', help='загрузить полную историю домашних работ'
+    )
+    backfill_parser.add_argument('--from-date', type=int,
+                                 default=BACKFILL_FROM_DATE)
+    backfill_parser.add_argument('--batch-size', type=int,
+                                 default=BACKFILL_BATCH_SIZE)
+    backfill_parser.set_defaults(handler=run_backfill, needs_db=True)
+
+    subparsers.add_parser(
+        'journal-index', help='перестроить индекс журнала'
+    ).set_defaults(handler=run_journal_index)
+
+    query_parser = subparsers.add_parser(
+        'journal-query', help='когда менялся статус работы'
+    )
+    query_parser.add_argument('homework_id', type=int)
+    query_parser.set_defaults(handler=run_journal_query)
+
+    subparsers.add_parser(
+        'turnaround', help='время проверки работ по урокам'
+    ).set_defaults(handler=run_turnaround, needs_db=True)
+
+    replay_parser = subparsers.add_parser(
+        'replay', help='воспроизвести записанный трафик'
+    )
+    replay_parser.add_argument('cassette', nargs='?', default=CASSETTE_PATH)
+    replay_parser.add_argument(
+        '--speed', type=float, default=None,
+        help='ускорение относительно записи; без него — без пауз'
+    )
+    replay_parser.set_defaults(handler=run_replay)
+
+    subparsers.add_parser(
+        'dead-letters', help='показать отложенные записи'
+    ).set_defaults(handler=run_dead_letters, needs_db=True)
+
+    reprocess_parser = subparsers.add_parser(
+        'reprocess', help='повторно обработать отложенные записи'
+    )
+    reprocess_parser.add_argument(
+        '--dry-run', action='store_true',
+        help='только проверить, ничего не отправляя'
+    )
+    reprocess_parser.set_defaults(handler=run_reprocess, needs_db=True)
+    return parser
+
+
+def main(argv=None):
+    """Запускает служебную команду из командной строки."""
+    load_dotenv()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # Хранилище в памяти пропало бы вместе с результатом команды
+    if getattr(args, 'needs_db', False) and args.db == ':memory:':
+        parser.error(CLI_MEMORY_DB)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s, %(levelname)s, %(name)s, %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    main()
@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import catalog
+import config
+from constants import (
+    DEFAULT_LOCALE,
+    STATUS_CACHE_TTL,
+    STATUS_HISTORY_SIZE,
+    STATUS_REPLY_EMPTY,
+    STATUS_REPLY_LINE,
+    STATUS_REPLY_CHECKED,
+    STATUS_REPLY_STALE,
+    HISTORY_REPLY_EMPTY,
+    HISTORY_REPLY_LINE,
+    COMMAND_FOREIGN_CHAT
+)
+
+
+logger = logging.getLogger(__name__)
+
+TIME_FORMAT = '%d.%m.%Y %H:%M'
+
+
+class StatusCache:
+    """Последние известные статусы работ, которые заполняет опрос API.
+
+    Команды бота читают только этот кэш и никогда не обращаются к API.
+    Если опрос не обновлял аккаунт дольше `ttl` секунд, ответ
+    помечается как устаревший.
+    """
+
+    def __init__(self, ttl=STATUS_CACHE_TTL, history_size=STATUS_HISTORY_SIZE):
+        """Настраивает срок свежести и длину истории."""
+        self.ttl = ttl
+        self.history_size = history_size
+        self.homeworks = {}
+        self.history = {}
+        self.checked_at = {}
+        self.lock = threading.Lock()
+
+    def touch(self, account):
+        """Отмечает успешный опрос API для аккаунта."""
+        with self.lock:
+            self.checked_at[account] = time.time()
+
+    def seed(self, account, records):
+        """Заполняет статусы из хранилища, не трогая историю и время опроса.
+
+        Уже известные кэшу записи новее сохранённых и не заменяются.
+        """
+        with self.lock:
+            homeworks = self.homeworks.setdefault(account, {})
+            for record in records:
+                homeworks.setdefault(record.key, record)
+
+    def add(self, account, record):
+        """Запоминает новый статус работы."""
+        with self.lock:
+            self.homeworks.setdefault(account, {})[record.key] = record
+            self.history.setdefault(
+                account, deque(maxlen=self.history_size)
+            ).append((time.time(), record))
+
+    def status(self, account):
+        """Возвращает текущие записи аккаунта и время последнего опроса."""
+        with self.lock:
+            return (
+                list(self.homeworks.get(account, {}).values()),
+                self.checked_at.get(account)
+            )
+
+    def changes(self, account):
+        """Возвращает последние изменения статуса аккаунта."""
+        with self.lock:
+            return list(self.history.get(account, ()))
+
+    def is_stale(self, checked_at):
+        """Проверяет, не устарели ли данные опроса."""
+        return checked_at is None or time.time() - checked_at > self.ttl
+
+
+def format_time(timestamp):
+    """Форматирует время для ответа пользователю."""
+    return datetime.fromtimestamp(timestamp).strftime(TIME_FORMAT)
+
+
+def verdict(record, locale=DEFAULT_LOCALE):
+    """Возвращает текст вердикта по текущим настройкам и языку чата."""
+    return catalog.for_verdicts(config.current().verdicts).verdict(
+        record.status, locale
+    )
+
+
+def render_status(cache, account, locale=DEFAULT_LOCALE):
+    """Формирует ответ на команду /status."""
+    records, checked_at = cache.status(account)
+    lines = [
+        STATUS_REPLY_LINE.format(
+            homework_name=record.homework_name,
+            verdict=verdict(record, locale)
+        )
+        for record in records
+    ] or [STATUS_REPLY_EMPTY]
+    if checked_at is not None:
+        template = (
+            STATUS_REPLY_STALE if cache.is_stale(checked_at)
+            else STATUS_REPLY_CHECKED
+        )
+        lines.append(template.format(checked_at=format_time(checked_at)))
+    return '\n'.join(lines)
+
+
+def render_history(cache, account, locale=DEFAULT_LOCALE):
+    """Формирует ответ на команду /history."""
+    lines = [
+        HISTORY_REPLY_LINE.format(
+            changed_at=format_time(changed_at),
+            homework_name=record.homework_name,
+            verdict=verdict(record, locale)
+        )
+        for changed_at, record in cache.changes(account)
+    ]
+    return '\n'.join(lines) or HISTORY_REPLY_EMPTY
+
+
+def register(bot, cache, chat_accounts):
+    """Подключает команды /status и /history к боту.
+
+    `chat_accounts` сопоставляет id чата аккаунт, команды из других
+    чатов игнорируются. Вердикты выводятся на языке чата.
+    """
+    renderers = {'status': render_status, 'history': render_history}
+
+    @bot.message_handler(commands=list(renderers))
+    def answer(message):
+        account = chat_accounts.get(str(message.chat.id))
+        if account is None:
+            logger.warning(COMMAND_FOREIGN_CHAT.format(
+                chat_id=message.chat.id
+            ))
+            return
+        command = message.text.split()[0].lstrip('/').split('@')[0]
+        locale = config.current().chat_locales.get(
+            str(message.chat.id), DEFAULT_LOCALE
+        )
+        bot.reply_to(message, renderers[command](cache, account, locale))
+
+    return answer
+
+
+def start_polling(bot):
+    """Запускает приём команд в фоновом потоке, не блокируя опрос API."""
+    thread = threading.Thread(
+        target=bot.infinity_polling, name='bot-commands', daemon=True
+    )
+    thread.start()
+    return thread
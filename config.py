@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import threading
+from collections import namedtuple
+
+from constants import (
+    RETRY_PERIOD,
+    ENDPOINT,
+    HOMEWORK_VERDICTS,
+    DEFAULT_ACCOUNT,
+    CHAT_LOCALES,
+    CONFIG_PATH,
+    CONFIG_RELOADED,
+    CONFIG_RELOAD_ERROR,
+    ERROR_CONFIG_ACCOUNT
+)
+
+
+logger = logging.getLogger(__name__)
+
+Account = namedtuple('Account', ('name', 'token'))
+Settings = namedtuple(
+    'Settings',
+    ('retry_period', 'endpoint', 'verdicts', 'accounts', 'chat_locales')
+)
+
+
+def auth_headers(token):
+    """Формирует заголовок авторизации в API Практикума."""
+    return {'Authorization': f'OAuth {token}'}
+
+
+def parse_chat_locales(raw):
+    """Разбирает строку вида `chat_id:locale,chat_id:locale`."""
+    return dict(
+        pair.strip().split(':', 1) for pair in raw.split(',') if pair.strip()
+    )
+
+
+def defaults():
+    """Собирает настройки из constants.py и окружения.
+
+    Токен читается при вызове, а не при импорте, поэтому переменные
+    из .env уже загружены.
+    """
+    return Settings(
+        RETRY_PERIOD,
+        ENDPOINT,
+        dict(HOMEWORK_VERDICTS),
+        (Account(DEFAULT_ACCOUNT, os.getenv('PRACTICUM_TOKEN')),),
+        parse_chat_locales(CHAT_LOCALES)
+    )
+
+
+def parse_account(raw):
+    """Разбирает описание аккаунта из файла конфигурации."""
+    for key in Account._fields:
+        if key not in raw:
+            raise KeyError(ERROR_CONFIG_ACCOUNT.format(account=raw, key=key))
+    return Account(raw['name'], raw['token'])
+
+
+def parse(raw, base):
+    """Накладывает значения из файла на базовые настройки."""
+    accounts = base.accounts
+    if 'accounts' in raw:
+        accounts = tuple(parse_account(account) for account in raw['accounts'])
+    return Settings(
+        int(raw.get('retry_period', base.retry_period)),
+        raw.get('endpoint', base.endpoint),
+        {**base.verdicts, **raw.get('verdicts', {})},
+        accounts,
+        {**base.chat_locales, **{
+            str(chat_id): locale
+            for chat_id, locale in raw.get('chat_locales', {}).items()
+        }}
+    )
+
+
+class ConfigWatcher:
+    """Следит за файлом конфигурации и подменяет настройки целиком.
+
+    Новый снимок настроек подставляется одной заменой ссылки, поэтому
+    код, уже получивший снимок, дорабатывает цикл со старыми значениями.
+    """
+
+    def __init__(self, path=CONFIG_PATH):
+        """Запоминает путь к файлу, настройки читаются при первом запросе."""
+        self.path = path
+        self.settings = None
+        self.mtime = None
+        self.lock = threading.Lock()
+
+    def current(self):
+        """Возвращает действующий снимок настроек."""
+        if self.settings is None:
+            with self.lock:
+                if self.settings is None:
+                    self.settings = defaults()
+        return self.settings
+
+    def reload(self):
+        """Перечитывает файл, если он изменился, и возвращает настройки."""
+        settings = self.current()
+        if not self.path:
+            return settings
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self.mtime:
+                return settings
+            # Запоминаем версию сразу, чтобы не повторять ошибку каждый цикл
+            self.mtime = mtime
+            with open(self.path, encoding='utf-8') as source:
+                settings = parse(json.load(source), defaults())
+        except Exception as error:
+            logger.error(CONFIG_RELOAD_ERROR.format(
+                path=self.path, error=error
+            ))
+            return settings
+        self.settings = settings
+        logger.info(CONFIG_RELOADED.format(path=self.path))
+        return settings
+
+
+watcher = ConfigWatcher()
+
+
+def current():
+    """Возвращает действующие настройки."""
+    return watcher.current()
+
+
+def reload():
+    """Подхватывает изменения файла конфигурации на границе цикла."""
+    return watcher.reload()
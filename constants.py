@@ -16,7 +16,7 @@ HOMEWORK_VERDICTS = {
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
 
-SEND_MESSAGE_DEBUG = 'Бот отправил сообщение: {}'
+SEND_MESSAGE_DEBUG = 'Бот отправил сообщение: {text}'
 SEND_MESSAGE_ERROR = 'Сообщение не отправлено: "{}". Ошибка: {}'
 
 STATUS_CHANGED = (
@@ -46,3 +46,252 @@ EXPECTED_LIST = 'Ожидался list для ключа "{key}", но полу
 NEW_STATUSES = 'Нет новых статусов для проверки.'
 
 ERROR_FAILURE = 'Сбой в работе программы: {error}'
+
+DEFAULT_ACCOUNT = os.getenv('PRACTICUM_ACCOUNT', 'default')
+STATE_DB_PATH = os.getenv(
+    'STATE_DB_PATH', os.path.expanduser('~/homework_bot.sqlite3')
+)
+
+BACKFILL_FROM_DATE = 0
+BACKFILL_BATCH_SIZE = 500
+BACKFILL_CHUNK_SIZE = 64 * 1024
+
+BACKFILL_DONE = (
+    'Загрузка истории завершена: сохранено {saved}, пропущено {skipped}.'
+)
+BACKFILL_SKIPPED = 'Пропущена запись без идентификатора: {homework}'
+ERROR_INCOMPLETE_JSON = 'Ответ API оборвался до конца JSON-документа.'
+ERROR_UNEXPECTED_JSON = (
+    'Неожиданный символ "{char}" в ответе API на позиции {pos}.'
+)
+
+JOURNAL_PATH = os.getenv('JOURNAL_PATH')
+JOURNAL_STATUSES = ('', 'reviewing', 'approved', 'rejected')
+JOURNAL_UNKNOWN_STATUS = 'unknown'
+
+JOURNAL_INDEX_BUILT = 'Индекс журнала построен: {count} записей.'
+JOURNAL_CORRUPTED_TAIL = 'Обрезан неполный хвост журнала: {size} байт.'
+JOURNAL_NO_EVENTS = 'Изменений статуса не найдено.'
+JOURNAL_EVENT = (
+    '{notified_at}: {account} #{homework_id} {old_status} -> {new_status}'
+    ' (обновлено {date_updated})'
+)
+ERROR_JOURNAL_INDEX = 'Файл "{path}" не является индексом журнала.'
+
+TURNAROUND_FROM = 'reviewing'
+TURNAROUND_TO = ('approved', 'rejected')
+TURNAROUND_PERCENTILES = (50, 90, 95, 99)
+TURNAROUND_BUCKETS_HOURS = (1, 6, 24, 72)
+TURNAROUND_UNKNOWN_LESSON = 'Урок неизвестен'
+TURNAROUND_HEADER = '{lesson}: {count} проверок, в среднем {mean:.1f} ч'
+TURNAROUND_PERCENTILE = '  p{percentile}: {hours:.1f} ч'
+TURNAROUND_BUCKET = '  до {hours} ч: {count}'
+TURNAROUND_BUCKET_LAST = '  от {hours} ч: {count}'
+TURNAROUND_EMPTY = 'В журнале нет завершённых проверок.'
+
+LATENCY_RELATIVE_ACCURACY = 0.01
+LATENCY_MAX_BUCKETS = 2048
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+LATENCY_SLO_SECONDS = int(os.getenv('LATENCY_SLO_SECONDS', 900))
+LATENCY_SLO_QUANTILE = float(os.getenv('LATENCY_SLO_QUANTILE', 0.95))
+LATENCY_REPORT_EVERY = int(os.getenv('LATENCY_REPORT_EVERY', 10))
+LATENCY_EXPORT_PATH = os.getenv('LATENCY_EXPORT_PATH')
+
+LATENCY_REPORT = (
+    'Задержка уведомлений за {count} сообщений: '
+    'p50 {p50:.0f} с, p95 {p95:.0f} с, p99 {p99:.0f} с.'
+)
+LATENCY_SLO_BREACHED = (
+    'Нарушен SLO задержки уведомлений: p{quantile:g} = {value:.0f} с '
+    'при допустимых {slo} с.'
+)
+LATENCY_SLO_RESTORED = (
+    'Задержка уведомлений вернулась в пределы SLO: p{quantile:g} = '
+    '{value:.0f} с.'
+)
+
+STATE_CACHE_SIZE = int(os.getenv('STATE_CACHE_SIZE', 1000))
+STATE_CACHE_TTL = int(os.getenv('STATE_CACHE_TTL', 24 * 60 * 60))
+STATE_SPILLED = 'Состояние аккаунта {account} выгружено в хранилище.'
+
+BOT_COMMANDS = os.getenv('BOT_COMMANDS', '').lower() in ('1', 'true', 'yes')
+STATUS_CACHE_TTL = int(os.getenv('STATUS_CACHE_TTL', 3 * 600))
+STATUS_HISTORY_SIZE = 20
+
+STATUS_REPLY_EMPTY = 'Пока нет данных о домашних работах.'
+STATUS_REPLY_LINE = '{homework_name}: {verdict}'
+STATUS_REPLY_CHECKED = 'Последняя проверка API: {checked_at}.'
+STATUS_REPLY_STALE = (
+    'Данные могут быть устаревшими: API давно не отвечал, последняя '
+    'успешная проверка {checked_at}.'
+)
+HISTORY_REPLY_EMPTY = 'Изменений статуса пока не было.'
+HISTORY_REPLY_LINE = '{changed_at}: {homework_name}: {verdict}'
+COMMAND_FOREIGN_CHAT = 'Команда из чужого чата {chat_id} проигнорирована.'
+
+EDIT_STATUS_MESSAGES = os.getenv(
+    'EDIT_STATUS_MESSAGES', ''
+).lower() in ('1', 'true', 'yes')
+EDIT_MESSAGE_DEBUG = 'Бот обновил сообщение {message_id}: {message}'
+EDIT_MESSAGE_ERROR = (
+    'Не удалось обновить сообщение {message_id}, отправляем новое. '
+    'Ошибка: {error}'
+)
+PIN_MESSAGE_ERROR = 'Не удалось закрепить сообщение {message_id}: {error}'
+
+NOTIFY_BATCH_WINDOW = int(os.getenv('NOTIFY_BATCH_WINDOW', 0))
+TELEGRAM_MESSAGE_LIMIT = 4096
+NOTIFY_QUEUE_LIMIT = int(os.getenv('NOTIFY_QUEUE_LIMIT', 1000))
+NOTIFY_QUEUE_STATS = (
+    'Очередь уведомлений: {queued} строк, схлопнуто {collapsed}, '
+    'отброшено ошибок {shed_errors}, изменений {shed_statuses}'
+)
+
+NOTIFY_TIMEOUT = float(os.getenv('NOTIFY_TIMEOUT', 10))
+NOTIFY_TELEGRAM_CHATS = os.getenv('NOTIFY_TELEGRAM_CHATS', '')
+NOTIFY_WEBHOOK_URL = os.getenv('NOTIFY_WEBHOOK_URL')
+NOTIFY_SMTP_HOST = os.getenv('NOTIFY_SMTP_HOST', 'localhost')
+NOTIFY_SMTP_PORT = int(os.getenv('NOTIFY_SMTP_PORT', 25))
+NOTIFY_EMAIL_FROM = os.getenv('NOTIFY_EMAIL_FROM', 'homework-bot@localhost')
+NOTIFY_EMAIL_TO = os.getenv('NOTIFY_EMAIL_TO', '')
+NOTIFY_EMAIL_SUBJECT = 'Статус домашней работы'
+
+NOTIFIER_SENT = 'Канал {name} доставил сообщение.'
+NOTIFIER_ERROR = 'Канал {name} не доставил сообщение "{message}": {error}'
+NOTIFY_SINK_QUEUE = int(os.getenv('NOTIFY_SINK_QUEUE', 100))
+NOTIFIER_TIMEOUT = 'Канал {name} не ответил за {timeout} с'
+NOTIFIER_DROPPED = (
+    'Очередь канала {name} переполнена, отброшено сообщений: {dropped}'
+)
+
+ROUTES_PATH = os.getenv('ROUTES_PATH')
+ROUTES_LOADED = 'Загружено правил маршрутизации: {count}.'
+ERROR_ROUTE_RULE = 'В правиле маршрутизации {rule} нет ключа "chat_id".'
+
+CONFIG_PATH = os.getenv('CONFIG_PATH')
+CONFIG_RELOADED = 'Конфигурация перечитана из {path}.'
+CONFIG_RELOAD_ERROR = (
+    'Не удалось перечитать конфигурацию {path}, работаем со старой: {error}'
+)
+ERROR_CONFIG_ACCOUNT = 'В описании аккаунта {account} нет ключа "{key}".'
+ERROR_UNKNOWN_ACCOUNT = 'Аккаунт {account} не найден в настройках.'
+
+DEFAULT_LOCALE = 'ru'
+CHAT_LOCALES = os.getenv('CHAT_LOCALES', '')
+UNKNOWN_STATUS_FALLBACK = os.getenv('UNKNOWN_STATUS_FALLBACK', 'raise')
+MESSAGE_CACHE_SIZE = 4096
+LOCALIZED_VERDICTS = {
+    'en': {
+        'approved': 'The work has been reviewed: the reviewer liked it. '
+                    'Hooray!',
+        'reviewing': 'The work has been taken for review.',
+        'rejected': 'The work has been reviewed: the reviewer has remarks.'
+    }
+}
+STATUS_CHANGED_TEMPLATES = {
+    'ru': STATUS_CHANGED,
+    'en': 'Review status of "{homework_name}" has changed. {verdict}'
+}
+UNKNOWN_VERDICTS = {
+    'ru': 'Новый статус проверки: "{status}".',
+    'en': 'New review status: "{status}".'
+}
+
+HOMEWORK_QUARANTINED = (
+    'Запись аккаунта {account} отложена: {reason}. Запись: {homework!r}'
+)
+INVALID_RECORD_TYPE = 'ожидался dict, получен {type_name}'
+INVALID_FIELD_TYPE = 'поле "{key}" должно быть {expected}, получено {actual}'
+DATE_CACHE_SIZE = 4096
+INVALID_DATE = 'поле "date_updated" не в формате ISO 8601: {value}'
+
+CYCLE_BUDGET = float(os.getenv('CYCLE_BUDGET', 120))
+# Доли бюджета цикла: запросы к API, разбор ответа, отправка сообщений
+CYCLE_SHARES = {'api': 0.5, 'parse': 0.1, 'send': 0.4}
+API_TIMEOUT = float(os.getenv('API_TIMEOUT', 30))
+STAGE_TIMEOUT = (
+    'Этап "{stage}" не уложился в бюджет цикла: '
+    'потрачено {spent:.1f} из {limit:.1f} с.'
+)
+STAGE_SKIPPED = 'Этап "{stage}" пропущен: бюджет цикла исчерпан.'
+ERROR_API_TIMEOUT = 'API не ответил за {timeout:.1f} с, параметры: {params}'
+
+CASSETTE_PATH = os.getenv('CASSETTE_PATH')
+CASSETTE_STARTED = 'Запись трафика в кассету {path}'
+CASSETTE_WRITE_ERROR = 'Не удалось записать событие в кассету: {error}'
+REPLAY_REPORT = (
+    'Воспроизведено запросов к API: {api_calls}, отправлено сообщений: '
+    '{sends} (в записи {recorded_sends}) за {elapsed:.2f} с, '
+    '{throughput:.1f} запросов/с.'
+)
+REPLAY_MISMATCH = 'Расхождение с записью ({count:+d}): {text}'
+
+PROFILE_DIR = os.getenv('PROFILE_DIR')
+PROFILE_SECONDS = float(os.getenv('PROFILE_SECONDS', 30))
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL', 0.01))
+PROFILE_STARTED = 'Профилирование запущено на {seconds:.0f} с'
+PROFILE_RUNNING = 'Профилирование уже идёт, сигнал пропущен'
+PROFILE_SAVED = 'Профиль ({samples} выборок) сохранён в {path}'
+
+WATCHDOG_THRESHOLD = float(os.getenv('WATCHDOG_THRESHOLD', 0))
+WATCHDOG_EXIT = os.getenv('WATCHDOG_EXIT', '').lower() in ('1', 'true', 'yes')
+WATCHDOG_EXIT_CODE = 70
+WATCHDOG_STALL = (
+    'Этап "{stage}" в потоке {thread} выполняется {elapsed:.0f} с '
+    '(порог {threshold:.0f} с). Стек:\n{stack}'
+)
+WATCHDOG_EXITING = 'Цикл опроса завис, процесс завершается для перезапуска'
+
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 100))
+PIPELINE_FETCH_WORKERS = int(os.getenv('PIPELINE_FETCH_WORKERS', 4))
+PIPELINE_SEND_WORKERS = int(os.getenv('PIPELINE_SEND_WORKERS', 4))
+
+DEAD_LETTERS_EMPTY = 'Отложенных записей нет.'
+DEAD_LETTER_LINE = (
+    '{account} {fingerprint} {first_seen}: {reason}\n  {payload}'
+)
+DEAD_LETTERS_REPROCESSED = (
+    'Обработано отложенных записей: {resolved}, осталось: {remaining}.'
+)
+CLI_MEMORY_DB = (
+    'Команде нужно хранилище в файле: укажите --db или STATE_DB_PATH.'
+)
+
+# За сколько секунд до опроса открывать соединения; 0 — не прогревать
+PREWARM_LEAD = float(os.getenv('PREWARM_LEAD', 0))
+PREWARM_TIMEOUT = float(os.getenv('PREWARM_TIMEOUT', 5))
+TELEGRAM_API_URL = 'https://api.telegram.org/'
+PREWARM_DONE = 'Соединение с {url} прогрето за {elapsed:.3f} с'
+PREWARM_ERROR = 'Не удалось прогреть соединение с {url}: {error}'
+API_TTFB = 'Первый байт ответа API через {elapsed:.3f} с'
+
+# telebot — клиент pyTelegramBotAPI, light — встроенный клиент Bot API
+BOT_API_CLIENT = os.getenv('BOT_API_CLIENT', 'telebot')
+BOT_API_URL = os.getenv('BOT_API_URL', 'https://api.telegram.org')
+BOT_API_WORKERS = int(os.getenv('BOT_API_WORKERS', 8))
+BOT_API_ERROR = 'Bot API {method}: {code} {description}'
+BOT_API_RATE_LIMITED = (
+    'Чат {chat_id} ограничен Telegram ещё на {seconds:.0f} с'
+)
+
+# Дополнительные токены ботов через запятую, отправка делится между ними
+TELEGRAM_TOKENS = os.getenv('TELEGRAM_TOKENS', '')
+# Предел сообщений в секунду на бота, 0 — без ограничения
+BOT_RATE_LIMIT = float(os.getenv('BOT_RATE_LIMIT', 0))
+BOT_THROTTLED = 'Бот {bot} получил 429, пауза {seconds} с'
+BOT_CHAT_MOVED = 'Чат {chat_id} переведён на бота {bot}'
+BOT_POOL_BUSY = (
+    'Бот {bot} освободится через {seconds:.1f} с, отправка отложена'
+)
+
+# Доли записи частых событий: `message_sent=0.01,no_new_statuses=0.1`
+EVENT_SAMPLE_RATES = os.getenv('EVENT_SAMPLE_RATES', '')
+EVENT_SAMPLE_RATE_INVALID = (
+    'Доля записи "{item}" в EVENT_SAMPLE_RATES не разобрана, '
+    'ожидается `событие=доля`; событие пишется целиком.'
+)
+# text — прежние строки, json — строки JSON с полями событий
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+STATUS_CHANGED_DEBUG = (
+    'Статус работы {homework_name} аккаунта {account}: {status}'
+)
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import threading
+import time
+
+import storage
+
+
+# Отличает отсутствие записи в кэше от записи None
+MISSING = object()
+
+
+def recent_key(homework):
+    """Дешёвый ключ записи для узнавания без отпечатка или None."""
+    key = (
+        (homework.get('id'), homework.get('date_updated'))
+        if type(homework) is dict else homework
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def fingerprint(homework):
+    """Отпечаток записи: одинаковый для одинакового содержимого."""
+    return hashlib.blake2b(
+        json.dumps(
+            homework, sort_keys=True, ensure_ascii=False, default=str
+        ).encode('utf-8'),
+        digest_size=16
+    ).hexdigest()
+
+
+class DeadLetters:
+    """Хранилище записей, которые не удалось обработать.
+
+    Запись сохраняется вместе с исходным содержимым и причиной отказа.
+    Отпечатки уже отложенных записей держатся в памяти, поэтому та же
+    запись в следующих ответах API пропускается без повторной записи
+    в хранилище и в журнал. Запись, уже отложенная в этом процессе,
+    узнаётся ещё до проверки по `id` и `date_updated` и сравнению с
+    сохранённой копией, без сериализации и хеширования.
+    """
+
+    def __init__(self, connection, clock=time.time):
+        """Подключает хранилище."""
+        self.connection = connection
+        self.clock = clock
+        self.known = {}
+        self.recent = {}
+        self.version = storage.data_version(connection)
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        """Перечитывает отпечатки, если хранилище меняли другие процессы.
+
+        Возвращает аккаунты, отложенные записи которых разобраны
+        (например, командой `reprocess`).
+        """
+        version = storage.data_version(self.connection)
+        resolved = []
+        with self.lock:
+            if version == self.version:
+                return resolved
+            self.version = version
+            for account, known in self.known.items():
+                fresh = storage.load_dead_fingerprints(
+                    self.connection, account
+                )
+                if known - fresh:
+                    resolved.append(account)
+                self.known[account] = fresh
+            self.recent.clear()
+        return resolved
+
+    def skip_known(self, account, homeworks):
+        """Убирает из списка записи, уже отложенные в этом процессе."""
+        recent = self.recent.get(account)
+        if not recent:
+            return homeworks
+        return [
+            homework for homework in homeworks
+            if recent.get(recent_key(homework), MISSING) != homework
+        ]
+
+    def fingerprints(self, account):
+        """Отпечатки отложенных записей аккаунта, загружаются один раз."""
+        with self.lock:
+            known = self.known.get(account)
+            if known is None:
+                known = self.known[account] = storage.load_dead_fingerprints(
+                    self.connection, account
+                )
+            return known
+
+    def remember(self, account, homework):
+        """Запоминает отложенную запись для узнавания до проверки."""
+        key = recent_key(homework)
+        if key is not None:
+            with self.lock:
+                self.recent.setdefault(account, {})[key] = homework
+
+    def add(self, account, homework, reason):
+        """Откладывает запись, возвращает False для уже известной."""
+        key = fingerprint(homework)
+        known = self.fingerprints(account)
+        self.remember(account, homework)
+        if key in known:
+            return False
+        storage.save_dead_letter(
+            self.connection, account, key,
+            json.dumps(homework, ensure_ascii=False, default=str),
+            reason, int(self.clock())
+        )
+        with self.lock:
+            known.add(key)
+        return True
+
+    def __len__(self):
+        """Возвращает число известных отпечатков в памяти."""
+        with self.lock:
+            return sum(len(known) for known in self.known.values())
+
+
+def reprocess(connection, validator, deliver, dry_run=False):
+    """Повторно проверяет отложенные записи после исправления.
+
+    Прошедшие проверку записи передаются в `deliver(account, homework)`
+    и удаляются из хранилища, если он вернул истину. С `dry_run`
+    записи только проверяются, хранилище не меняется. Возвращает число
+    обработанных и оставшихся записей.
+    """
+    resolved = 0
+    remaining = 0
+    for account, key, payload, *_ in storage.load_dead_letters(connection):
+        homework = json.loads(payload)
+        if not validator.is_valid(homework):
+            remaining += 1
+            if dry_run:
+                continue
+            storage.save_dead_letter(
+                connection, account, key, payload,
+                validator.reason(homework), int(time.time())
+            )
+            continue
+        if dry_run:
+            resolved += 1
+            continue
+        if not deliver(account, homework):
+            remaining += 1
+            continue
+        storage.delete_dead_letter(connection, account, key)
+        resolved += 1
+    return resolved, remaining
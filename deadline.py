@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from constants import CYCLE_BUDGET, CYCLE_SHARES, STAGE_TIMEOUT, STAGE_SKIPPED
+
+
+logger = logging.getLogger(__name__)
+
+
+class Deadline:
+    """Бюджет времени одного цикла опроса, поделённый между этапами.
+
+    Каждый этап (`api`, `parse`, `send`) получает свою долю бюджета.
+    Операция этапа получает таймаут не больше остатка его доли и
+    остатка всего цикла, поэтому зависший сокет не задерживает цикл
+    дольше бюджета. На этап засчитывается время, пока идёт хотя бы
+    одна его операция: параллельные операции не тратят долю быстрее
+    настенных часов.
+    """
+
+    def __init__(self, budget=CYCLE_BUDGET, shares=CYCLE_SHARES,
+                 clock=time.monotonic):
+        """Запускает отсчёт бюджета."""
+        self.clock = clock
+        self.expires = clock() + budget
+        self.limits = {
+            stage: budget * share for stage, share in shares.items()
+        }
+        self.spent = defaultdict(float)
+        self.active = Counter()
+        self.busy_since = {}
+        self.overruns = set()
+        self.timeouts = Counter()
+        self.lock = threading.Lock()
+
+    def remaining(self):
+        """Возвращает остаток бюджета всего цикла."""
+        return max(0.0, self.expires - self.clock())
+
+    def used(self, stage, now):
+        """Возвращает время этапа с учётом идущих операций."""
+        spent = self.spent[stage]
+        if self.active[stage]:
+            spent += now - self.busy_since[stage]
+        return spent
+
+    def timeout(self, stage):
+        """Возвращает, сколько секунд ещё можно потратить на этап."""
+        with self.lock:
+            used = self.used(stage, self.clock())
+        return max(0.0, min(self.limits[stage] - used, self.remaining()))
+
+    def expired(self, stage):
+        """Проверяет, исчерпан ли бюджет этапа."""
+        return self.timeout(stage) <= 0
+
+    @contextmanager
+    def stage(self, name):
+        """Учитывает время, потраченное внутри блока, на этап."""
+        with self.lock:
+            if not self.active[name]:
+                self.busy_since[name] = self.clock()
+            self.active[name] += 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                now = self.clock()
+                self.active[name] -= 1
+                if not self.active[name]:
+                    self.spent[name] += now - self.busy_since[name]
+                    self.busy_since[name] = now
+                spent = self.used(name, now)
+                # Выход за долю учитываем один раз
+                overrun = (
+                    spent > self.limits[name] and name not in self.overruns
+                )
+                if overrun:
+                    self.overruns.add(name)
+            if overrun:
+                self.record_timeout(name, STAGE_TIMEOUT.format(
+                    stage=name, spent=spent, limit=self.limits[name]
+                ))
+
+    def record_timeout(self, stage, message):
+        """Учитывает таймаут этапа."""
+        with self.lock:
+            self.timeouts[stage] += 1
+        logger.warning(message)
+
+    def skip(self, stage):
+        """Учитывает операцию, отменённую из-за исчерпанного бюджета."""
+        self.record_timeout(stage, STAGE_SKIPPED.format(stage=stage))
+
+
+current = None
+
+
+def start(budget=CYCLE_BUDGET):
+    """Начинает бюджет нового цикла."""
+    global current
+    current = Deadline(budget)
+    return current
+
+
+def timeout(stage, default):
+    """Таймаут операции этапа; вне цикла действует значение по умолчанию.
+
+    Нулевой таймаут requests и TeleBot не принимают, поэтому при
+    исчерпанном бюджете этапа сразу вызывается TimeoutError.
+    """
+    if current is None:
+        return default
+    seconds = min(default, current.timeout(stage))
+    if seconds <= 0:
+        raise TimeoutError(STAGE_SKIPPED.format(stage=stage))
+    return seconds
+
+
+def expired(stage):
+    """Проверяет, исчерпан ли бюджет этапа текущего цикла."""
+    return current is not None and current.expired(stage)
+
+
+@contextmanager
+def stage(name):
+    """Учитывает время блока на этап текущего цикла, если он начат."""
+    if current is None:
+        yield
+        return
+    with current.stage(name):
+        yield
+
+
+def record_timeout(stage, message):
+    """Учитывает таймаут операции этапа."""
+    if current is None:
+        logger.warning(message)
+        return
+    current.record_timeout(stage, message)
+
+
+def skip(stage):
+    """Учитывает операцию, отменённую из-за исчерпанного бюджета."""
+    if current is not None:
+        current.skip(stage)
@@ -0,0 +1,111 @@
+import itertools
+import json
+import logging
+
+from constants import EVENT_SAMPLE_RATES, EVENT_SAMPLE_RATE_INVALID
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_sample_rates(raw):
+    """Разбирает `событие=доля,...` в «записывать каждое N-е».
+
+    Доля 0 отключает событие, события без доли пишутся все.
+    Неразобранная запись пропускается с предупреждением: из-за опечатки
+    в настройке бот не должен падать при запуске.
+    """
+    every = {}
+    for item in raw.split(','):
+        name, _, rate = item.partition('=')
+        if not name.strip():
+            continue
+        try:
+            rate = float(rate)
+        except ValueError:
+            logger.warning(EVENT_SAMPLE_RATE_INVALID.format(item=item.strip()))
+            continue
+        every[name.strip()] = max(1, round(1 / rate)) if rate > 0 else None
+    return every
+
+
+class Event:
+    """Событие журнала: имя и поля, текст собирается только при выводе."""
+
+    __slots__ = ('name', 'template', 'fields', 'every')
+
+    def __init__(self, name, template, fields, every=1):
+        """Запоминает событие без форматирования."""
+        self.name = name
+        self.template = template
+        self.fields = fields
+        self.every = every
+
+    def __str__(self):
+        """Возвращает прежнее текстовое сообщение."""
+        return self.template.format(**self.fields)
+
+
+class Sampler:
+    """Пропускает каждое N-е событие каждого типа."""
+
+    def __init__(self, every):
+        """Запоминает частоту записи по именам событий."""
+        self.every = every
+        self.counters = {name: itertools.count() for name in every}
+
+    def keep(self, name):
+        """Решает, записывать ли очередное событие."""
+        every = self.every.get(name, 1)
+        if every == 1:
+            return True
+        if every is None:
+            return False
+        return next(self.counters[name]) % every == 0
+
+
+sampler = Sampler(parse_sample_rates(EVENT_SAMPLE_RATES))
+
+
+def emit(logger, level, name, template, /, **fields):
+    """Записывает событие `name` с полями, если уровень и выборка позволяют.
+
+    Текст по шаблону собирается, только когда запись дошла до
+    обработчика, в формате JSON его нет вовсе. Первые аргументы только
+    позиционные, поэтому поля могут называться так же.
+    """
+    if not logger.isEnabledFor(level) or not sampler.keep(name):
+        return
+    logger.log(
+        level, Event(name, template, fields, sampler.every.get(name, 1)),
+        stacklevel=2
+    )
+
+
+class JsonFormatter(logging.Formatter):
+    """Выводит записи журнала компактными строками JSON.
+
+    Для событий пишутся имя и поля, для прочих записей — текст.
+    Поле `sample` — частота выборки N: в журнал попадает каждое N-е
+    событие этого типа.
+    """
+
+    def format(self, record):
+        """Собирает строку JSON из записи."""
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name
+        }
+        if isinstance(record.msg, Event):
+            entry['event'] = record.msg.name
+            if record.msg.every > 1:
+                entry['sample'] = record.msg.every
+            entry.update(record.msg.fields)
+        else:
+            entry['message'] = record.getMessage()
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(
+            entry, ensure_ascii=False, separators=(',', ':'), default=str
+        )
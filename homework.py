@@ -4,28 +4,76 @@ import logging
 import time
 from http import HTTPStatus
 
+from collections import namedtuple
+from contextlib import contextmanager
+
 import requests
 from telebot import TeleBot
 from dotenv import load_dotenv
 
-from constants import (
-    REQUIRED_TOKENS,
-    MISSING_TOKENS,
+import botapi
+import botpool
+import cassette
+import catalog
+import commands
+import config
+import deadline
+import events
+import deadletters
+import journal
+import notifiers
+import prewarm
+import profiler
+import watchdog
+import routing
+import status_messages
+import storage
+import validation
+from batching import ERROR, Coalescer
+from latency import LatencyTracker
+from pipeline import Pipeline, Stage
+from records import Homework, homework_key
+from state_cache import StateCache
+# Значения по умолчанию; действующие настройки отдаёт config.current()
+from constants import (  # noqa: F401
     RETRY_PERIOD,
     ENDPOINT,
     HEADERS,
-    HOMEWORK_VERDICTS,
+    HOMEWORK_VERDICTS
+)
+from constants import (
+    REQUIRED_TOKENS,
+    MISSING_TOKENS,
     SEND_MESSAGE_DEBUG,
     SEND_MESSAGE_ERROR,
-    STATUS_CHANGED,
-    INVALID_STATUS,
     ERROR_API_RESPONSE,
     ERROR_API_JSON,
     EXPECTED_LIST,
     ERROR_MISSING_HOMEWORKS_KEY,
     EXPECTED_TYPE,
     NEW_STATUSES,
-    ERROR_FAILURE
+    STATUS_CHANGED_DEBUG,
+    ERROR_FAILURE,
+    JOURNAL_PATH,
+    BOT_COMMANDS,
+    EDIT_STATUS_MESSAGES,
+    NOTIFY_TIMEOUT,
+    ROUTES_PATH,
+    DEFAULT_LOCALE,
+    HOMEWORK_QUARANTINED,
+    CYCLE_BUDGET,
+    API_TIMEOUT,
+    ERROR_API_TIMEOUT,
+    CASSETTE_PATH,
+    PROFILE_DIR,
+    WATCHDOG_THRESHOLD,
+    NOTIFY_QUEUE_STATS,
+    PIPELINE_FETCH_WORKERS,
+    PIPELINE_SEND_WORKERS,
+    PREWARM_LEAD,
+    TELEGRAM_API_URL,
+    BOT_API_CLIENT,
+    LOG_FORMAT
 )
 
 
@@ -38,6 +86,21 @@ TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 logger = logging.getLogger(__name__)
 
+# Общие объекты цикла опроса, создаются один раз в main()
+Runtime = namedtuple('Runtime', (
+    'bot', 'connection', 'states', 'latency', 'coalescer', 'router',
+    'status_cache', 'dead_letters'
+))
+# Уведомление об ошибке в очереди отправки
+ErrorNotice = namedtuple('ErrorNotice', ('state', 'message'))
+
+
+@contextmanager
+def stage(name):
+    """Учитывает этап цикла в бюджете времени и у сторожа зависаний."""
+    with deadline.stage(name), watchdog.watch(name):
+        yield
+
 
 def check_tokens():
     """Проверяет наличие всех необходимых токенов и логгирует отсутствующие."""
@@ -50,27 +113,69 @@ def check_tokens():
         raise EnvironmentError(MISSING_TOKENS.format(missing_tokens))
 
 
-def send_message(bot, message):
-    """Отправляет сообщение."""
+@cassette.recorded('send', lambda bot, chat_id, message: {
+    'chat_id': str(chat_id), 'text': message
+})
+def send_to_chat(bot, chat_id, message):
+    """Отправляет сообщение в указанный чат Telegram."""
     try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
-        logger.debug(SEND_MESSAGE_DEBUG.format(message))
+        timeout = deadline.timeout('send', NOTIFY_TIMEOUT)
+        bot.send_message(chat_id=chat_id, text=message, timeout=timeout)
+        events.emit(
+            logger, logging.DEBUG, 'message_sent', SEND_MESSAGE_DEBUG,
+            chat_id=chat_id, text=message
+        )
         return True
+    except (requests.Timeout, TimeoutError) as e:
+        deadline.record_timeout(
+            'send', SEND_MESSAGE_ERROR.format(message, e)
+        )
+        return False
     except Exception as e:
         logger.error(SEND_MESSAGE_ERROR.format(message, e), exc_info=True)
         return False
 
 
+def send_message(bot, message):
+    """Отправляет сообщение в Telegram и дополнительные каналы.
+
+    Каналы получают сообщение, только когда Telegram его принял:
+    неотправленное изменение повторится в следующем цикле.
+    """
+    if not send_to_chat(bot, TELEGRAM_CHAT_ID, message):
+        return False
+    notifiers.broadcast(message)
+    return True
+
+
 def get_api_answer(timestamp):
     """Делает запрос к API Практикума и возвращает ответ."""
+    return get_account_answer(config.current().accounts[0], timestamp)
+
+
+@cassette.recorded('api', lambda account, timestamp: {
+    'account': account.name, 'from_date': timestamp
+})
+def get_account_answer(account, timestamp):
+    """Запрашивает статусы работ аккаунта с текущими настройками."""
     params = {'from_date': timestamp}
+    timeout = deadline.timeout('api', API_TIMEOUT)
     try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=params)
-
+        response = prewarm.http_get()(
+            config.current().endpoint,
+            headers=config.auth_headers(account.token),
+            params=params,
+            timeout=timeout
+        )
+    except requests.Timeout as e:
+        raise TimeoutError(
+            ERROR_API_TIMEOUT.format(timeout=timeout, params=params)
+        ) from e
     except requests.RequestException as e:
         raise ConnectionError(
             f'Ошибка соединения: {e}, параметры: {params}'
         ) from e
+    prewarm.observe(response)
     if response.status_code != HTTPStatus.OK:
         raise RuntimeError(
             ERROR_API_RESPONSE.format(
@@ -121,23 +226,309 @@ def parse_status(homework):
     if 'status' not in homework:
         error_message = ERROR_MISSING_HOMEWORKS_KEY.format(key='status')
         raise KeyError(error_message)
-    status = homework['status']
-    if status not in HOMEWORK_VERDICTS:
-        raise ValueError(INVALID_STATUS.format(homework_status=status))
-    verdict = HOMEWORK_VERDICTS[status]
-    return STATUS_CHANGED.format(homework_name=homework_name, verdict=verdict)
+    return catalog.for_verdicts(config.current().verdicts).render(
+        homework_name, homework['status'], DEFAULT_LOCALE
+    )
+
+
+def localize(homework, chat_id, message):
+    """Возвращает сообщение на языке чата."""
+    settings = config.current()
+    locale = settings.chat_locales.get(str(chat_id), DEFAULT_LOCALE)
+    if locale == DEFAULT_LOCALE:
+        return message
+    return catalog.for_verdicts(settings.verdicts).render(
+        homework['homework_name'], homework['status'], locale
+    )
+
+
+def collect_changes(state, homeworks):
+    """Отбирает работы, статус которых изменился с прошлой проверки."""
+    changes = []
+    for homework in homeworks or ():
+        known = state.homeworks.get(homework_key(homework))
+        if known is None or known.status != homework.get('status'):
+            changes.append(homework)
+    return changes
+
+
+def queue_changes(runtime, state, changes):
+    """Ставит изменения статусов в очередь отправки по чатам.
+
+    В режиме обновления сообщений каждая работа сразу правит своё
+    сообщение, такие работы возвращаются как доставленные. Сообщение
+    работы ищется по её `id`, работы без него идут обычной очередью.
+    """
+    delivered = []
+    for homework, message in changes:
+        chats = runtime.router.route(
+            state.account, homework.get('status'), homework.get('lesson_name')
+        )
+        if not EDIT_STATUS_MESSAGES or homework.get('id') is None:
+            for chat_id in chats:
+                runtime.coalescer.add(
+                    chat_id,
+                    (state.account, homework_key(homework)),
+                    localize(homework, chat_id, message),
+                    (state, homework)
+                )
+            continue
+        # Основной чат в маршруте всегда идёт первым
+        results = [
+            status_messages.publish(
+                runtime.bot, runtime.connection, state.account,
+                homework.get('id'), chat_id,
+                localize(homework, chat_id, message)
+            )
+            for chat_id in chats
+        ]
+        if results[0]:
+            # Дополнительные каналы получают изменение один раз на все чаты
+            notifiers.broadcast(message)
+            delivered.append((state, homework))
+    return delivered
+
+
+def flush_changes(runtime):
+    """Отправляет накопленные изменения, возвращает доставленные работы.
 
+    Изменения одного чата уходят одним сообщением, разные чаты
+    обслуживаются параллельно. Доставленной считается работа,
+    сообщение о которой получил основной чат, дополнительные чаты из
+    правил маршрутизации получают копии. Чаты, на которые не хватило
+    бюджета цикла, остаются в очереди до следующего цикла.
+    """
+    cycle = Cycle(runtime)
+    delivered = Pipeline(
+        [Stage('send', cycle.send, PIPELINE_SEND_WORKERS)], cycle.on_error
+    ).run(runtime.coalescer.due())
+    events.emit(
+        logger, logging.DEBUG, 'notify_queue', NOTIFY_QUEUE_STATS,
+        **runtime.coalescer.stats()
+    )
+    return delivered
+
+
+def send_batches(runtime, retry_period):
+    """Досылает изменения по истечении окна, возвращает остаток паузы.
+
+    Окно накопления короче периода опроса: изменения этого цикла
+    уходят через `window` секунд, а не в следующем цикле.
+    """
+    window = runtime.coalescer.window
+    if not window or not len(runtime.coalescer) or window >= retry_period:
+        return retry_period
+    time.sleep(window)
+    deadline.start(CYCLE_BUDGET)
+    try:
+        record_delivered(runtime, flush_changes(runtime))
+    except Exception as error:
+        logger.error(ERROR_FAILURE.format(error=error), exc_info=True)
+    return retry_period - window
 
-def handle_error(bot, error, last_error):
-    """Обработка ошибок."""
+
+def mark_sent(payloads, text):
+    """Отмечает отправленные строки, возвращает доставленные работы."""
+    delivered = []
+    for payload in payloads:
+        if isinstance(payload, ErrorNotice):
+            payload.state.last_error = payload.message
+            continue
+        payload[0].last_status = text
+        delivered.append(payload)
+    return delivered
+
+
+def record_status_change(homework, state, latency):
+    """Запоминает новый статус работы и пишет изменение в журнал."""
+    notified_at = time.time()
+    record = Homework.from_payload(homework)
+    previous = state.homeworks.get(record.key)
+    state.homeworks[record.key] = record
+    latency.observe(record.date_updated, notified_at)
+    if JOURNAL_PATH and record.id is not None:
+        journal.append(JOURNAL_PATH, [journal.pack(
+            state.account,
+            record.id,
+            previous.status if previous else None,
+            record.status,
+            record.date_updated,
+            notified_at
+        )])
+    return record
+
+
+def handle_error(runtime, state, error):
+    """Ставит уведомление об ошибке в очередь основного чата.
+
+    Повтор уже отправленной ошибки пропускается. При переполнении
+    очереди такие уведомления отбрасываются первыми.
+    """
     message = ERROR_FAILURE.format(error=error)
-    if message != last_error:
-        try:
-            send_message(bot, message)
-            last_error = message
-        except Exception as error:
-            logger.error(error)
-    return last_error
+    if message != state.last_error:
+        runtime.coalescer.add(
+            str(TELEGRAM_CHAT_ID),
+            (ERROR, state.account),
+            message,
+            ErrorNotice(state, message),
+            kind=ERROR
+        )
+
+
+def record_delivered(runtime, delivered):
+    """Фиксирует доставленные изменения в состоянии, кэше и хранилище."""
+    for state, homework in delivered:
+        runtime.status_cache.add(
+            state.account,
+            record_status_change(homework, state, runtime.latency)
+        )
+    if delivered:
+        runtime.states.flush({state.account for state, _ in delivered})
+
+
+def quarantine(runtime, state, rejected):
+    """Откладывает некорректные записи, не прерывая обработку остальных.
+
+    Уже отложенная запись пропускается молча.
+    """
+    for homework, reason in rejected:
+        if runtime.dead_letters.add(state.account, homework, reason):
+            logger.warning(HOMEWORK_QUARANTINED.format(
+                account=state.account, reason=reason, homework=homework
+            ))
+
+
+class Cycle:
+    """Этапы цикла опроса для конвейера.
+
+    Элементы этапов до отправки — кортежи, первым в которых идёт
+    состояние аккаунта. Функции модуля ищутся при каждом вызове,
+    поэтому их подмена действует сразу.
+    """
+
+    def __init__(self, runtime):
+        """Запоминает общие объекты цикла."""
+        self.runtime = runtime
+
+    def fetch(self, item):
+        """Запрашивает статусы работ аккаунта."""
+        state, account = item
+        if deadline.expired('api'):
+            deadline.skip('api')
+            return []
+        with stage('api'):
+            return [(state, get_account_answer(account, state.timestamp))]
+
+    def check(self, item):
+        """Проверяет ответ API и откладывает некорректные записи."""
+        state, response = item
+        with stage('parse'):
+            homeworks, rejected = validation.for_verdicts(
+                config.current().verdicts
+            ).split(self.runtime.dead_letters.skip_known(
+                state.account, check_response(response)
+            ))
+            quarantine(self.runtime, state, rejected)
+            self.runtime.status_cache.touch(state.account)
+        return [(state, response, homeworks)]
+
+    def diff(self, item):
+        """Отбирает работы с изменившимся статусом."""
+        state, response, homeworks = item
+        with stage('parse'):
+            changes = collect_changes(state, homeworks)
+        if not changes:
+            events.emit(
+                logger, logging.DEBUG, 'no_new_statuses', NEW_STATUSES,
+                account=state.account
+            )
+            # Окно опроса сдвигаем, только когда всё из него доставлено
+            state.timestamp = response.get('current_date', state.timestamp)
+        return [(state, homework) for homework in changes]
+
+    def parse(self, item):
+        """Формирует сообщение об изменении."""
+        state, homework = item
+        with stage('parse'):
+            try:
+                message = parse_status(homework)
+            except (KeyError, ValueError) as error:
+                quarantine(self.runtime, state, [(homework, str(error))])
+                return []
+        events.emit(
+            logger, logging.DEBUG, 'status_changed', STATUS_CHANGED_DEBUG,
+            account=state.account, homework_id=homework.get('id'),
+            homework_name=homework.get('homework_name'),
+            status=homework.get('status')
+        )
+        return [(state, homework, message)]
+
+    def route(self, item):
+        """Ставит сообщение в очередь чатов, возвращает доставленное."""
+        state, homework, message = item
+        with stage('send'):
+            return queue_changes(self.runtime, state, [(homework, message)])
+
+    def send(self, chat_id):
+        """Отправляет очередь одного чата, возвращает доставленное."""
+        if deadline.expired('send'):
+            deadline.skip('send')
+            return []
+        delivered = []
+        for _, text, payloads in self.runtime.coalescer.take(chat_id):
+            with stage('send'):
+                if chat_id != str(TELEGRAM_CHAT_ID):
+                    send_to_chat(self.runtime.bot, chat_id, text)
+                elif send_message(self.runtime.bot, text):
+                    delivered.extend(mark_sent(payloads, text))
+        return delivered
+
+    def on_error(self, name, item, error):
+        """Обрабатывает ошибку этапа, не прерывая остальные элементы."""
+        if isinstance(error, TimeoutError):
+            # Таймаут под нагрузкой не ошибка бота: учитываем без уведомления
+            deadline.record_timeout(name, str(error))
+        elif name == 'send':
+            logger.error(ERROR_FAILURE.format(error=error), exc_info=True)
+        else:
+            handle_error(self.runtime, item[0], error)
+
+
+def poll_accounts(runtime, accounts):
+    """Опрашивает аккаунты конвейером и ставит изменения в очередь.
+
+    Запросы к API разных аккаунтов идут параллельно и перекрываются
+    с проверкой и разбором уже полученных ответов.
+    """
+    cycle = Cycle(runtime)
+    delivered = Pipeline([
+        Stage('fetch', cycle.fetch, PIPELINE_FETCH_WORKERS),
+        Stage('check', cycle.check, 1),
+        Stage('diff', cycle.diff, 1),
+        Stage('parse', cycle.parse, 1),
+        Stage('route', cycle.route, 1),
+    ], cycle.on_error).run(
+        (runtime.states.get(account.name), account) for account in accounts
+    )
+    record_delivered(runtime, delivered)
+
+
+def poll_account(runtime, account):
+    """Опрашивает API для одного аккаунта."""
+    poll_accounts(runtime, [account])
+
+
+def create_sender(bot):
+    """Возвращает отправителя сообщений: бота или пул по всем токенам."""
+    def connect(token):
+        if BOT_API_CLIENT == 'light':
+            return botapi.BotApiClient(token)
+        return bot if token == TELEGRAM_TOKEN else TeleBot(token=token)
+
+    senders = [
+        connect(token) for token in botpool.parse_tokens(TELEGRAM_TOKEN)
+    ]
+    return senders[0] if len(senders) == 1 else botpool.BotPool(senders)
 
 
 def main():
@@ -145,36 +536,81 @@ def main():
     check_tokens()
     # Создаем объект класса бота
     bot = TeleBot(token=TELEGRAM_TOKEN)
-    timestamp = int(time.time())
-    last_status = None
-    last_error = None
+    if CASSETTE_PATH:
+        cassette.start(CASSETTE_PATH)
+    if PROFILE_DIR:
+        profiler.install(PROFILE_DIR)
+    if WATCHDOG_THRESHOLD:
+        watchdog.start()
+    prewarmer = (
+        prewarm.Prewarmer(prewarm.configure()) if PREWARM_LEAD else None
+    )
+    # Команды принимает TeleBot, отправлять можно встроенным клиентом
+    # и несколькими ботами
+    sender = create_sender(bot)
+    notifiers.configure(notifiers.from_env(sender))
+    connection = storage.connect()
+    runtime = Runtime(
+        bot=sender,
+        connection=connection,
+        states=StateCache(connection),
+        latency=LatencyTracker(),
+        coalescer=Coalescer(),
+        router=routing.load(ROUTES_PATH, default_chats=[TELEGRAM_CHAT_ID]),
+        status_cache=commands.StatusCache(),
+        dead_letters=deadletters.DeadLetters(connection)
+    )
+    if BOT_COMMANDS:
+        # После перезапуска /status отвечает по сохранённым работам
+        for account in config.current().accounts:
+            runtime.status_cache.seed(
+                account.name, storage.load_homeworks(connection, account.name)
+            )
+        commands.register(bot, runtime.status_cache, {
+            str(TELEGRAM_CHAT_ID): config.current().accounts[0].name
+        })
+        commands.start_polling(bot)
     while True:
+        # Новые настройки вступают в силу только между циклами
+        settings = config.reload()
+        retry_period = settings.retry_period
+        deadline.start(CYCLE_BUDGET)
         try:
-            response = get_api_answer(timestamp)
-            response = check_response(response)
-            if not response:
-                logger.debug(NEW_STATUSES)
-            status = parse_status(response[0])
-            if status != last_status:
-                if send_message(bot, status):
-                    last_status = status
-                    timestamp = response.get('current_date', timestamp)
+            # Состояния меняются до конца отправки, вытеснять их раньше нельзя
+            with runtime.states.pinned(
+                account.name for account in settings.accounts
+            ):
+                # Записи, разобранные командой reprocess, уже отправлены
+                for account in runtime.dead_letters.refresh():
+                    runtime.states.merge_stored(account)
+                poll_accounts(runtime, settings.accounts)
+                record_delivered(runtime, flush_changes(runtime))
         except Exception as error:
-            last_error = handle_error(bot, error, last_error)
+            logger.error(ERROR_FAILURE.format(error=error), exc_info=True)
         finally:
-            time.sleep(RETRY_PERIOD)
+            pause = send_batches(runtime, retry_period)
+            if prewarmer is not None:
+                prewarmer.schedule(
+                    pause - PREWARM_LEAD,
+                    [settings.endpoint, TELEGRAM_API_URL]
+                )
+            time.sleep(pause)
 
 
 if __name__ == '__main__':
 
     log_file = os.path.join(os.path.expanduser('~'), f'{__file__}.log')
+    handlers = [
+        logging.StreamHandler(sys.stdout),  # Вывод в консоль
+        logging.FileHandler(log_file, encoding='utf-8')  # Логи в файл
+    ]
+    if LOG_FORMAT == 'json':
+        for handler in handlers:
+            handler.setFormatter(events.JsonFormatter())
     logging.basicConfig(
         level=logging.DEBUG,
         format=('%(asctime)s, %(levelname)s, %(name)s, %(funcName)s,'
                 'line %(lineno)d, %(message)s'),
-        handlers=[
-            logging.StreamHandler(sys.stdout),  # Вывод в консоль
-            logging.FileHandler(log_file, encoding='utf-8')  # Логи в файл
-        ]
+        handlers=handlers
     )
     main()
@@ -0,0 +1,223 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+
+from constants import (
+    JOURNAL_STATUSES,
+    JOURNAL_UNKNOWN_STATUS,
+    JOURNAL_INDEX_BUILT,
+    JOURNAL_CORRUPTED_TAIL,
+    ERROR_JOURNAL_INDEX
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Запись журнала фиксированной ширины, поля int64 выровнены по 8 байтам:
+# аккаунт, id работы, date_updated, время уведомления, старый и новый статус
+RECORD = struct.Struct('<16sqqqBB6x')
+ACCOUNT_OFFSET = 0
+HOMEWORK_ID_OFFSET = 16
+DATE_UPDATED_OFFSET = 24
+NOTIFIED_AT_OFFSET = 32
+OLD_STATUS_OFFSET = 40
+NEW_STATUS_OFFSET = 41
+
+# Индекс: заголовок и отсортированные пары (ключ, номер записи)
+INDEX_HEADER = struct.Struct('<4sIQ')
+INDEX_ENTRY = struct.Struct('<QI')
+INDEX_MAGIC = b'HWJI'
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx'
+
+UNKNOWN_STATUS_CODE = 255
+STATUS_CODES = {status: code for code, status in enumerate(JOURNAL_STATUSES)}
+
+
+def status_code(status):
+    """Кодирует статус одним байтом."""
+    return STATUS_CODES.get(status or '', UNKNOWN_STATUS_CODE)
+
+
+def status_name(code):
+    """Раскодирует байт статуса."""
+    if code < len(JOURNAL_STATUSES):
+        return JOURNAL_STATUSES[code]
+    return JOURNAL_UNKNOWN_STATUS
+
+
+def encode_account(account):
+    """Приводит имя аккаунта к полю фиксированной ширины."""
+    return account.encode('utf-8')[:16]
+
+
+def decode_account(raw):
+    """Восстанавливает имя аккаунта из поля фиксированной ширины."""
+    return raw.rstrip(b'\0').decode('utf-8', errors='ignore')
+
+
+def pack(account, homework_id, old_status, new_status, date_updated,
+         notified_at):
+    """Упаковывает изменение статуса в запись журнала.
+
+    `date_updated` и `notified_at` передаются в секундах UTC.
+    """
+    return RECORD.pack(
+        encode_account(account),
+        homework_id,
+        date_updated,
+        int(notified_at),
+        status_code(old_status),
+        status_code(new_status)
+    )
+
+
+def unpack(raw):
+    """Распаковывает запись журнала в словарь."""
+    account, homework_id, date_updated, notified_at, old, new = (
+        RECORD.unpack(raw)
+    )
+    return {
+        'account': decode_account(account),
+        'homework_id': homework_id,
+        'old_status': status_name(old),
+        'new_status': status_name(new),
+        'date_updated': date_updated,
+        'notified_at': notified_at
+    }
+
+
+def raw_key(account, homework_id):
+    """Вычисляет 64-битный ключ индекса по сырым полям записи."""
+    digest = hashlib.blake2b(
+        account.rstrip(b'\0') + homework_id, digest_size=8
+    ).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def record_key(account, homework_id):
+    """Вычисляет ключ индекса для аккаунта и работы."""
+    return raw_key(
+        encode_account(account),
+        homework_id.to_bytes(8, 'little', signed=True)
+    )
+
+
+def append(path, records):
+    """Дописывает упакованные записи в конец журнала."""
+    with open(path, 'ab') as journal:
+        # После аварийной остановки в конце может остаться неполная запись
+        tail = journal.tell() % RECORD.size
+        if tail:
+            journal.truncate(journal.tell() - tail)
+            journal.seek(0, os.SEEK_END)
+            logger.warning(JOURNAL_CORRUPTED_TAIL.format(size=tail))
+        journal.write(b''.join(records))
+
+
+def open_mapped(path):
+    """Отображает файл в память только для чтения."""
+    with open(path, 'rb') as source:
+        if not os.fstat(source.fileno()).st_size:
+            return b''
+        return mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def count_records(data):
+    """Возвращает количество целых записей в журнале."""
+    return len(data) // RECORD.size
+
+
+def read_record(data, recno):
+    """Возвращает сырую запись журнала по её номеру."""
+    return data[recno * RECORD.size:(recno + 1) * RECORD.size]
+
+
+def build_index(path):
+    """Строит индекс журнала по аккаунту и работе."""
+    data = open_mapped(path)
+    total = count_records(data)
+    entries = sorted(
+        (
+            raw_key(
+                data[offset:offset + HOMEWORK_ID_OFFSET],
+                data[offset + HOMEWORK_ID_OFFSET:offset + DATE_UPDATED_OFFSET]
+            ),
+            recno
+        )
+        for recno, offset in enumerate(
+            range(0, total * RECORD.size, RECORD.size)
+        )
+    )
+    temporary = path + INDEX_SUFFIX + '.tmp'
+    with open(temporary, 'wb') as index:
+        index.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, total))
+        index.write(b''.join(INDEX_ENTRY.pack(*entry) for entry in entries))
+    # Подменяем индекс атомарно: читатели видят либо старый, либо новый
+    os.replace(temporary, path + INDEX_SUFFIX)
+    logger.info(JOURNAL_INDEX_BUILT.format(count=total))
+    return total
+
+
+def read_index(path):
+    """Открывает индекс журнала, если он есть."""
+    index_path = path + INDEX_SUFFIX
+    if not os.path.exists(index_path):
+        return b'', 0
+    index = open_mapped(index_path)
+    if len(index) < INDEX_HEADER.size:
+        raise ValueError(ERROR_JOURNAL_INDEX.format(path=index_path))
+    magic, version, indexed = INDEX_HEADER.unpack_from(index)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        raise ValueError(ERROR_JOURNAL_INDEX.format(path=index_path))
+    return index, indexed
+
+
+def index_lookup(index, key):
+    """Бинарным поиском находит номера записей с заданным ключом."""
+    size = (len(index) - INDEX_HEADER.size) // INDEX_ENTRY.size
+    low, high = 0, size
+    while low < high:
+        middle = (low + high) // 2
+        found, _ = INDEX_ENTRY.unpack_from(
+            index, INDEX_HEADER.size + middle * INDEX_ENTRY.size
+        )
+        if found < key:
+            low = middle + 1
+        else:
+            high = middle
+    recnos = []
+    while low < size:
+        found, recno = INDEX_ENTRY.unpack_from(
+            index, INDEX_HEADER.size + low * INDEX_ENTRY.size
+        )
+        if found != key:
+            break
+        recnos.append(recno)
+        low += 1
+    return recnos
+
+
+def query(path, account, homework_id):
+    """Возвращает изменения статуса работы в порядке записи в журнал."""
+    data = open_mapped(path)
+    total = count_records(data)
+    index, indexed = read_index(path)
+    indexed = min(indexed, total)
+    candidates = [
+        recno
+        for recno in index_lookup(index, record_key(account, homework_id))
+        if recno < indexed
+    ]
+    # Записи, добавленные после построения индекса, просматриваем подряд
+    candidates.extend(range(indexed, total))
+    account_field = encode_account(account).ljust(16, b'\0')
+    events = []
+    for recno in candidates:
+        event = read_record(data, recno)
+        # Совпадение 64-битного ключа проверяем по самой записи
+        if RECORD.unpack(event)[:2] == (account_field, homework_id):
+            events.append(unpack(event))
+    return events
@@ -0,0 +1,128 @@
+import json
+import logging
+import math
+import os
+
+from constants import (
+    LATENCY_RELATIVE_ACCURACY,
+    LATENCY_MAX_BUCKETS,
+    LATENCY_QUANTILES,
+    LATENCY_SLO_SECONDS,
+    LATENCY_SLO_QUANTILE,
+    LATENCY_REPORT_EVERY,
+    LATENCY_EXPORT_PATH,
+    LATENCY_REPORT,
+    LATENCY_SLO_BREACHED,
+    LATENCY_SLO_RESTORED
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class QuantileSketch:
+    """Потоковая оценка квантилей с ограниченной памятью.
+
+    Значения раскладываются по логарифмическим корзинам, поэтому
+    относительная ошибка квантиля не превышает `relative_accuracy`.
+    При переполнении сливаются самые младшие корзины: точность
+    теряется только на малых задержках, которые для SLO не важны.
+    """
+
+    def __init__(self, relative_accuracy=LATENCY_RELATIVE_ACCURACY,
+                 max_buckets=LATENCY_MAX_BUCKETS):
+        """Настраивает точность и предельное число корзин."""
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        """Учитывает очередное значение."""
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            lowest, second = sorted(self.buckets)[:2]
+            self.buckets[second] += self.buckets.pop(lowest)
+
+    def quantile(self, share):
+        """Оценивает квантиль, `share` задаётся долей от 0 до 1."""
+        if not self.count:
+            return None
+        rank = share * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class LatencyTracker:
+    """Следит за задержкой от `date_updated` до доставки уведомления."""
+
+    def __init__(self, slo_seconds=LATENCY_SLO_SECONDS,
+                 slo_quantile=LATENCY_SLO_QUANTILE,
+                 report_every=LATENCY_REPORT_EVERY,
+                 export_path=LATENCY_EXPORT_PATH):
+        """Настраивает порог SLO и периодичность отчётов."""
+        self.sketch = QuantileSketch()
+        self.slo_seconds = slo_seconds
+        self.slo_quantile = slo_quantile
+        self.report_every = report_every
+        self.export_path = export_path
+        self.breached = False
+
+    def observe(self, updated_at, delivered_at):
+        """Учитывает доставленное уведомление."""
+        if not updated_at:
+            return
+        self.sketch.add(delivered_at - updated_at)
+        if self.sketch.count % self.report_every == 0:
+            self.report()
+
+    def snapshot(self):
+        """Возвращает текущие квантили задержки в секундах."""
+        return {
+            'count': self.sketch.count,
+            **{
+                f'p{share * 100:g}': self.sketch.quantile(share)
+                for share in LATENCY_QUANTILES
+            }
+        }
+
+    def report(self):
+        """Выводит квантили в лог и проверяет SLO."""
+        snapshot = self.snapshot()
+        logger.info(LATENCY_REPORT.format(**snapshot))
+        value = self.sketch.quantile(self.slo_quantile)
+        breached = value > self.slo_seconds
+        if breached and not self.breached:
+            logger.error(LATENCY_SLO_BREACHED.format(
+                quantile=self.slo_quantile * 100,
+                value=value,
+                slo=self.slo_seconds
+            ))
+        elif self.breached and not breached:
+            logger.info(LATENCY_SLO_RESTORED.format(
+                quantile=self.slo_quantile * 100, value=value
+            ))
+        self.breached = breached
+        if self.export_path:
+            self.export(snapshot)
+        return snapshot
+
+    def export(self, snapshot):
+        """Атомарно записывает квантили в JSON-файл для сбора метрик."""
+        temporary = self.export_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as target:
+            json.dump({**snapshot, 'slo_breached': self.breached}, target)
+        os.replace(temporary, self.export_path)
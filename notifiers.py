@@ -0,0 +1,242 @@
+import logging
+import queue
+from abc import ABC, abstractmethod
+import smtplib
+import threading
+from concurrent.futures import Future
+from email.message import EmailMessage
+
+import requests
+
+import events
+from constants import (
+    NOTIFY_TIMEOUT,
+    NOTIFY_TELEGRAM_CHATS,
+    NOTIFY_WEBHOOK_URL,
+    NOTIFY_SMTP_HOST,
+    NOTIFY_SMTP_PORT,
+    NOTIFY_EMAIL_FROM,
+    NOTIFY_EMAIL_TO,
+    NOTIFY_EMAIL_SUBJECT,
+    NOTIFY_SINK_QUEUE,
+    NOTIFIER_SENT,
+    NOTIFIER_ERROR,
+    NOTIFIER_TIMEOUT,
+    NOTIFIER_DROPPED
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class Notifier(ABC):
+    """Канал доставки уведомлений.
+
+    Наследник реализует `deliver`. Время доставки ограничивает
+    `SinkWorker`: вызов дольше `timeout` считается неудачным. Сетевые
+    каналы передают `timeout` и своим клиентам.
+    """
+
+    name = 'notifier'
+
+    def __init__(self, timeout=NOTIFY_TIMEOUT):
+        """Запоминает предельное время доставки."""
+        self.timeout = timeout
+
+    @abstractmethod
+    def deliver(self, message):
+        """Доставляет сообщение или выбрасывает исключение."""
+
+    def send(self, message):
+        """Доставляет сообщение и логирует результат."""
+        try:
+            self.deliver(message)
+        except Exception as e:
+            logger.error(NOTIFIER_ERROR.format(
+                name=self.name, message=message, error=e
+            ))
+            return False
+        events.emit(
+            logger, logging.DEBUG, 'notifier_sent', NOTIFIER_SENT,
+            name=self.name
+        )
+        return True
+
+
+class TelegramNotifier(Notifier):
+    """Копия сообщения в дополнительный чат Telegram."""
+
+    name = 'telegram'
+
+    def __init__(self, bot, chat_id, timeout=NOTIFY_TIMEOUT):
+        """Запоминает бота и чат."""
+        super().__init__(timeout)
+        self.bot = bot
+        self.chat_id = chat_id
+
+    def deliver(self, message):
+        """Отправляет сообщение в чат."""
+        self.bot.send_message(
+            chat_id=self.chat_id, text=message, timeout=int(self.timeout)
+        )
+
+
+class WebhookNotifier(Notifier):
+    """POST-запрос с JSON `{"text": ...}` на произвольный адрес."""
+
+    name = 'webhook'
+
+    def __init__(self, url, timeout=NOTIFY_TIMEOUT):
+        """Запоминает адрес вебхука."""
+        super().__init__(timeout)
+        self.url = url
+
+    def deliver(self, message):
+        """Отправляет сообщение на вебхук."""
+        response = requests.post(
+            self.url, json={'text': message}, timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+class EmailNotifier(Notifier):
+    """Письмо через SMTP-сервер, по умолчанию локальный."""
+
+    name = 'email'
+
+    def __init__(self, recipients, host=NOTIFY_SMTP_HOST,
+                 port=NOTIFY_SMTP_PORT, sender=NOTIFY_EMAIL_FROM,
+                 timeout=NOTIFY_TIMEOUT):
+        """Запоминает сервер, отправителя и получателей."""
+        super().__init__(timeout)
+        self.recipients = recipients
+        self.host = host
+        self.port = port
+        self.sender = sender
+
+    def deliver(self, message):
+        """Отправляет письмо с текстом сообщения."""
+        email = EmailMessage()
+        email['Subject'] = NOTIFY_EMAIL_SUBJECT
+        email['From'] = self.sender
+        email['To'] = ', '.join(self.recipients)
+        email.set_content(message)
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(email)
+
+
+def split_list(value):
+    """Разбирает список через запятую из переменной окружения."""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def from_env(bot):
+    """Создаёт дополнительные каналы по настройкам окружения."""
+    sinks = [
+        TelegramNotifier(bot, chat_id)
+        for chat_id in split_list(NOTIFY_TELEGRAM_CHATS)
+    ]
+    if NOTIFY_WEBHOOK_URL:
+        sinks.append(WebhookNotifier(NOTIFY_WEBHOOK_URL))
+    if split_list(NOTIFY_EMAIL_TO):
+        sinks.append(EmailNotifier(split_list(NOTIFY_EMAIL_TO)))
+    return sinks
+
+
+class SinkWorker:
+    """Своя очередь и поток доставки для одного канала.
+
+    Очередь ограничена `queue_size` сообщениями, при переполнении новые
+    сообщения канала отбрасываются. Доставка, не уложившаяся в таймаут
+    канала, считается неудачной; пока зависший вызов не завершится,
+    следующие сообщения канала ждут его не дольше таймаута, так что
+    на канал приходится не больше одного зависшего потока.
+    """
+
+    def __init__(self, sink, queue_size=NOTIFY_SINK_QUEUE):
+        """Запускает поток доставки канала."""
+        self.sink = sink
+        self.queue = queue.Queue(queue_size)
+        self.pending = None
+        self.dropped = 0
+        threading.Thread(
+            target=self.run, name=f'notifier-{sink.name}', daemon=True
+        ).start()
+
+    def submit(self, message):
+        """Ставит сообщение в очередь канала, возвращает future."""
+        future = Future()
+        try:
+            self.queue.put_nowait((message, future))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(NOTIFIER_DROPPED.format(
+                name=self.sink.name, dropped=self.dropped
+            ))
+            future.set_result(False)
+        return future
+
+    def run(self):
+        """Доставляет сообщения из очереди по одному."""
+        while True:
+            message, future = self.queue.get()
+            future.set_result(self.deliver(message))
+
+    def deliver(self, message):
+        """Доставляет сообщение, не дожидаясь канала дольше таймаута."""
+        timeout = self.sink.timeout
+        if self.pending is not None:
+            self.pending.join(timeout)
+            if self.pending.is_alive():
+                logger.error(NOTIFIER_TIMEOUT.format(
+                    name=self.sink.name, timeout=timeout
+                ))
+                return False
+        results = []
+        self.pending = threading.Thread(
+            target=lambda: results.append(self.sink.send(message)),
+            name=f'notifier-{self.sink.name}-call',
+            daemon=True
+        )
+        self.pending.start()
+        self.pending.join(timeout)
+        if self.pending.is_alive():
+            logger.error(NOTIFIER_TIMEOUT.format(
+                name=self.sink.name, timeout=timeout
+            ))
+            return False
+        self.pending = None
+        return results[0]
+
+
+class Fanout:
+    """Параллельная рассылка по каналам без ожидания их ответа.
+
+    У каждого канала своя ограниченная очередь и свой поток, поэтому
+    медленный или зависший канал не задерживает ни остальные, ни цикл
+    опроса, а память не растёт без предела.
+    """
+
+    def __init__(self, sinks=()):
+        """Запускает потоки доставки каналов."""
+        self.sinks = list(sinks)
+        self.workers = [SinkWorker(sink) for sink in self.sinks]
+
+    def send(self, message):
+        """Ставит сообщение в очередь всех каналов, возвращает futures."""
+        return [worker.submit(message) for worker in self.workers]
+
+
+fanout = Fanout()
+
+
+def configure(sinks):
+    """Подключает дополнительные каналы ко всем уведомлениям бота."""
+    global fanout
+    fanout = Fanout(sinks)
+    return fanout
+
+
+def broadcast(message):
+    """Рассылает сообщение по дополнительным каналам."""
+    return fanout.send(message)
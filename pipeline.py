@@ -0,0 +1,95 @@
+import queue
+import threading
+from collections import namedtuple
+
+from constants import PIPELINE_QUEUE_SIZE
+
+
+# Этап конвейера: функция получает элемент и возвращает список
+# элементов для следующего этапа, `workers` — число потоков этапа
+Stage = namedtuple('Stage', ('name', 'function', 'workers'))
+
+STOP = object()
+
+
+class Pipeline:
+    """Конвейер этапов, связанных ограниченными очередями.
+
+    Каждый этап обрабатывается своим числом потоков, поэтому этапы
+    ввода-вывода идут одновременно с вычислительными, а пропускная
+    способность определяется самым медленным этапом. Ошибка при
+    обработке элемента передаётся в `on_error` и не останавливает
+    остальные элементы. `run()` возвращается, когда все этапы
+    обработали все элементы.
+    """
+
+    def __init__(self, stages, on_error, queue_size=PIPELINE_QUEUE_SIZE):
+        """Запоминает этапы и обработчик ошибок."""
+        self.stages = stages
+        self.on_error = on_error
+        self.queue_size = queue_size
+
+    def run(self, items):
+        """Пропускает элементы через все этапы, возвращает выход последнего.
+
+        Исключения вне `Exception` (например, SystemExit) повторно
+        поднимаются в вызывающем потоке после остановки конвейера.
+        """
+        queues = [queue.Queue(self.queue_size) for _ in self.stages]
+        results = []
+        failures = []
+        remaining = [stage.workers for stage in self.stages]
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(index, queues, results, failures, remaining, lock),
+                name=f'{stage.name}-{number}',
+                daemon=True
+            )
+            for index, stage in enumerate(self.stages)
+            for number in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for item in items:
+                queues[0].put(item)
+        finally:
+            for _ in range(self.stages[0].workers):
+                queues[0].put(STOP)
+            for thread in threads:
+                thread.join()
+        if failures:
+            raise failures[0]
+        return results
+
+    def work(self, index, queues, results, failures, remaining, lock):
+        """Обрабатывает элементы этапа до сигнала остановки."""
+        stage = self.stages[index]
+        source = queues[index]
+        output = (
+            queues[index + 1].put if index + 1 < len(queues)
+            else results.append
+        )
+        try:
+            for item in iter(source.get, STOP):
+                try:
+                    produced = stage.function(item)
+                except Exception as error:
+                    self.on_error(stage.name, item, error)
+                    continue
+                for result in produced:
+                    output(result)
+        except BaseException as error:
+            failures.append(error)
+            # Разбираем очередь, чтобы предыдущие этапы не зависли на put
+            for _ in iter(source.get, STOP):
+                pass
+        finally:
+            with lock:
+                remaining[index] -= 1
+                last = remaining[index] == 0
+            if last and index + 1 < len(queues):
+                for _ in range(self.stages[index + 1].workers):
+                    queues[index + 1].put(STOP)
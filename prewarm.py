@@ -0,0 +1,117 @@
+import logging
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from telebot import apihelper
+
+import events
+from constants import (
+    PREWARM_TIMEOUT,
+    PIPELINE_FETCH_WORKERS,
+    PIPELINE_SEND_WORKERS,
+    PREWARM_DONE,
+    PREWARM_ERROR,
+    API_TTFB
+)
+
+
+logger = logging.getLogger(__name__)
+
+session = None
+
+
+def create_session(pool_size=None):
+    """Создаёт сессию с пулом соединений на всех исполнителей конвейера."""
+    pooled = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=pool_size or max(
+        PIPELINE_FETCH_WORKERS, PIPELINE_SEND_WORKERS
+    ))
+    pooled.mount('https://', adapter)
+    pooled.mount('http://', adapter)
+    return pooled
+
+
+def configure():
+    """Включает общую сессию для API Практикума и Telegram.
+
+    TeleBot по умолчанию держит сессию на поток, а потоки конвейера
+    живут один цикл, поэтому соединения не переживали цикл.
+    """
+    global session
+    session = create_session()
+    apihelper.session = session
+    return session
+
+
+def http_get():
+    """Функция GET-запроса: общая сессия или requests.get."""
+    return requests.get if session is None else session.get
+
+
+def observe(response):
+    """Пишет в журнал время до первого байта ответа."""
+    elapsed = getattr(response, 'elapsed', None)
+    if elapsed is not None:
+        events.emit(
+            logger, logging.DEBUG, 'api_ttfb', API_TTFB,
+            elapsed=elapsed.total_seconds()
+        )
+
+
+class Prewarmer:
+    """Открывает соединения незадолго до очередного опроса.
+
+    За паузу между циклами сервер закрывает простаивающие соединения,
+    и первый запрос цикла снова платит за DNS, TCP и TLS. Прогрев
+    разрешает имя и делает лёгкий HEAD-запрос, после которого
+    соединение остаётся в пуле сессии, и запрос цикла идёт по нему
+    без рукопожатий.
+    """
+
+    def __init__(self, pooled, timeout=PREWARM_TIMEOUT):
+        """Запоминает сессию для прогрева."""
+        self.session = pooled
+        self.timeout = timeout
+
+    def warm_url(self, url):
+        """Прогревает соединение с одним адресом."""
+        parts = urlsplit(url)
+        started = time.monotonic()
+        try:
+            socket.getaddrinfo(
+                parts.hostname,
+                parts.port or (443 if parts.scheme == 'https' else 80),
+                type=socket.SOCK_STREAM
+            )
+            self.session.head(
+                url, timeout=self.timeout, allow_redirects=False
+            )
+        except (OSError, requests.RequestException) as error:
+            logger.warning(PREWARM_ERROR.format(url=url, error=error))
+            return False
+        logger.debug(PREWARM_DONE.format(
+            url=url, elapsed=time.monotonic() - started
+        ))
+        return True
+
+    def warm(self, urls):
+        """Прогревает соединения со всеми адресами параллельно."""
+        threads = [
+            threading.Thread(target=self.warm_url, args=(url,), daemon=True)
+            for url in urls
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def schedule(self, delay, urls):
+        """Запускает прогрев через `delay` секунд в фоновом потоке."""
+        timer = threading.Timer(max(0.0, delay), self.warm, args=(urls,))
+        timer.daemon = True
+        timer.start()
+        return timer
@@ -0,0 +1,121 @@
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+from constants import (
+    PROFILE_DIR,
+    PROFILE_SECONDS,
+    PROFILE_INTERVAL,
+    PROFILE_STARTED,
+    PROFILE_RUNNING,
+    PROFILE_SAVED
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfiler:
+    """Выборочный профилировщик всех потоков процесса.
+
+    Раз в `interval` секунд снимает стеки потоков через
+    `sys._current_frames()` и считает одинаковые стеки. Код бота при
+    этом не инструментируется, поэтому накладные расходы ограничены
+    одним проходом по стекам за выборку. Результат пишется в формате
+    collapsed stacks (`поток;функция;функция число`), который понимают
+    flamegraph.pl и speedscope.
+    """
+
+    def __init__(self, directory, seconds=PROFILE_SECONDS,
+                 interval=PROFILE_INTERVAL):
+        """Настраивает каталог для профилей и длительность сессии."""
+        self.directory = directory
+        self.seconds = seconds
+        self.interval = interval
+        self.thread = None
+        self.labels = {}
+        self.lock = threading.Lock()
+
+    @property
+    def running(self):
+        """Проверяет, идёт ли сессия профилирования."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """Запускает сессию в фоновом потоке, возвращает успех."""
+        with self.lock:
+            if self.running:
+                logger.warning(PROFILE_RUNNING)
+                return False
+            self.thread = threading.Thread(
+                target=self.run, name='profiler', daemon=True
+            )
+            self.thread.start()
+        logger.info(PROFILE_STARTED.format(seconds=self.seconds))
+        return True
+
+    def label(self, code):
+        """Подпись функции в стеке, кэшируется по объекту кода."""
+        label = self.labels.get(code)
+        if label is None:
+            label = self.labels[code] = '{} ({}:{})'.format(
+                code.co_name,
+                os.path.basename(code.co_filename),
+                code.co_firstlineno
+            )
+        return label
+
+    def sample(self, stacks, own_id):
+        """Снимает стеки всех потоков, кроме самого профилировщика."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self.label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            stacks[';'.join(reversed(stack))] += 1
+
+    def run(self):
+        """Собирает выборки заданное время и сохраняет профиль."""
+        stacks = Counter()
+        own_id = threading.get_ident()
+        finish = time.monotonic() + self.seconds
+        while time.monotonic() < finish:
+            self.sample(stacks, own_id)
+            time.sleep(self.interval)
+        return self.save(stacks)
+
+    def save(self, stacks):
+        """Пишет профиль в формате collapsed stacks."""
+        path = os.path.join(self.directory, 'profile-{}-{}.folded'.format(
+            os.getpid(), time.strftime('%Y%m%d-%H%M%S')
+        ))
+        temporary = path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as output:
+            for stack, count in stacks.most_common():
+                output.write(f'{stack} {count}\n')
+        os.replace(temporary, path)
+        logger.info(PROFILE_SAVED.format(
+            samples=sum(stacks.values()), path=path
+        ))
+        return path
+
+
+def install(directory=PROFILE_DIR, signum=getattr(signal, 'SIGUSR1', None)):
+    """Запускает профилирование по сигналу (`kill -USR1 <pid>`).
+
+    Обработчик только стартует фоновый поток, поэтому цикл опроса
+    не задерживается. Без SIGUSR1 (Windows) профилировщик доступен
+    только вызовом `start()`.
+    """
+    profiler = SamplingProfiler(directory)
+    if signum is not None:
+        signal.signal(signum, lambda *args: profiler.start())
+    return profiler
@@ -0,0 +1,68 @@
+import sys
+from collections import namedtuple
+from datetime import datetime
+
+
+HomeworkFields = namedtuple(
+    'HomeworkFields',
+    ('id', 'homework_name', 'status', 'lesson_name', 'date_updated')
+)
+
+
+def to_timestamp(date_updated):
+    """Переводит `date_updated` из ответа API в секунды UTC.
+
+    Пустая или нераспознанная дата даёт 0, чтобы уже отправленное
+    уведомление всё равно было записано и не повторялось.
+    """
+    try:
+        return int(
+            datetime.fromisoformat(date_updated.replace('Z', '+00:00'))
+            .timestamp()
+        )
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def intern(value):
+    """Делит одну копию строки между всеми записями."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def homework_key(homework):
+    """Возвращает ключ работы из ответа API: `id`, а без него — имя."""
+    key = homework.get('id')
+    return homework.get('homework_name') if key is None else key
+
+
+class Homework(HomeworkFields):
+    """Компактная запись о домашней работе.
+
+    Кортеж без словаря атрибутов, статус и урок интернируются,
+    а `date_updated` хранится числом секунд UTC.
+    """
+
+    __slots__ = ()
+
+    @property
+    def key(self):
+        """Ключ записи в состоянии, как у `homework_key`."""
+        return self.homework_name if self.id is None else self.id
+
+    @classmethod
+    def from_payload(cls, homework):
+        """Собирает запись из элемента `homeworks` ответа API."""
+        return cls(
+            homework.get('id'),
+            homework.get('homework_name'),
+            intern(homework.get('status')),
+            intern(homework.get('lesson_name')),
+            to_timestamp(homework.get('date_updated'))
+        )
+
+
+def from_payload(homeworks):
+    """Переводит список `homeworks` ответа API в компактные записи."""
+    return [Homework.from_payload(homework) for homework in homeworks]
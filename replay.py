@@ -0,0 +1,142 @@
+import builtins
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import cassette
+import commands
+import config
+import deadletters
+import homework
+import routing
+import storage
+from batching import Coalescer
+from latency import LatencyTracker
+from state_cache import StateCache
+
+
+class ReplayBot:
+    """Бот без сети: запоминает отправленные сообщения."""
+
+    def __init__(self):
+        """Начинает с пустого списка сообщений."""
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        """Запоминает сообщение вместо отправки."""
+        self.sent.append(text)
+        return SimpleNamespace(message_id=len(self.sent))
+
+    def edit_message_text(self, text, chat_id=None, message_id=None,
+                          **kwargs):
+        """Запоминает новый текст сообщения."""
+        self.sent.append(text)
+
+    def pin_chat_message(self, *args, **kwargs):
+        """Закрепление при воспроизведении не нужно."""
+
+
+def restore_error(error):
+    """Восстанавливает записанное исключение."""
+    error_type = getattr(builtins, error['type'], None)
+    if not (isinstance(error_type, type)
+            and issubclass(error_type, Exception)):
+        error_type = RuntimeError
+    return error_type(error['message'])
+
+
+class Player:
+    """Подставляет записанные ответы API вместо сетевых запросов."""
+
+    def __init__(self, events):
+        """Берёт из кассеты события запросов к API."""
+        self.answers = deque(
+            event for event in events if event['kind'] == 'api'
+        )
+
+    def __len__(self):
+        """Возвращает число оставшихся ответов."""
+        return len(self.answers)
+
+    def answer(self, account, timestamp):
+        """Возвращает следующий записанный ответ."""
+        event = self.answers.popleft()
+        if 'error' in event:
+            raise restore_error(event['error'])
+        return event['response']
+
+
+@contextmanager
+def substitute(module, name, value):
+    """Временно подменяет атрибут модуля."""
+    original = getattr(module, name)
+    setattr(module, name, value)
+    try:
+        yield
+    finally:
+        setattr(module, name, original)
+
+
+def build_runtime(bot):
+    """Собирает объекты цикла опроса без сети и внешнего хранилища."""
+    connection = storage.connect(':memory:')
+    return homework.Runtime(
+        bot=bot,
+        connection=connection,
+        states=StateCache(connection),
+        latency=LatencyTracker(export_path=None),
+        coalescer=Coalescer(window=0),
+        router=routing.Router(default_chats=[homework.TELEGRAM_CHAT_ID]),
+        status_cache=commands.StatusCache(),
+        dead_letters=deadletters.DeadLetters(connection)
+    )
+
+
+def run(path, speed=None, clock=time.monotonic, sleep=time.sleep):
+    """Прогоняет кассету через цикл опроса и сравнивает отправленное.
+
+    При `speed=None` ответы подаются без пауз, иначе с интервалами
+    записи, ускоренными в `speed` раз.
+    """
+    events = list(cassette.read(path))
+    player = Player(events)
+    # Отправка не выбрасывает ошибки, неудача записана как False или None
+    recorded_sends = [
+        event['request']['text'] for event in events
+        if event['kind'] == 'send' and event.get('response')
+    ]
+    bot = ReplayBot()
+    runtime = build_runtime(bot)
+    started = clock()
+    api_calls = 0
+    # Журнал рабочего бота воспроизведением не трогаем
+    with substitute(homework, 'get_account_answer', player.answer), \
+            substitute(homework, 'JOURNAL_PATH', None):
+        for event in list(player.answers):
+            if speed:
+                delay = started + event['offset'] / speed - clock()
+                if delay > 0:
+                    sleep(delay)
+            account = event['request']['account']
+            with runtime.states.pinned([account]):
+                homework.poll_account(
+                    runtime, config.Account(account, None)
+                )
+                homework.record_delivered(
+                    runtime, homework.flush_changes(runtime)
+                )
+            api_calls += 1
+    elapsed = clock() - started
+    mismatches = Counter(bot.sent)
+    mismatches.subtract(recorded_sends)
+    return {
+        'api_calls': api_calls,
+        'sends': len(bot.sent),
+        'recorded_sends': len(recorded_sends),
+        'elapsed': elapsed,
+        'throughput': api_calls / elapsed if elapsed else 0.0,
+        'mismatches': {
+            text: count for text, count in mismatches.items() if count
+        }
+    }
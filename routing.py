@@ -0,0 +1,56 @@
+import json
+import logging
+from functools import lru_cache
+from itertools import product
+
+from constants import ROUTES_LOADED, ERROR_ROUTE_RULE
+
+
+logger = logging.getLogger(__name__)
+
+# Поля правила, по которым строится индекс; отсутствие поля — «любое»
+RULE_FIELDS = ('account', 'status', 'lesson')
+
+
+class Router:
+    """Маршрутизация уведомлений по чатам.
+
+    Правила вида `{"chat_id": ..., "status": ..., "lesson": ...,
+    "account": ...}` при загрузке раскладываются в словарь по точному
+    ключу (account, status, lesson), где None означает «любое значение».
+    Маршрут события — объединение не более чем восьми поисков
+    в словаре, поэтому время не зависит от числа правил.
+    """
+
+    def __init__(self, rules=(), default_chats=()):
+        """Компилирует правила в индекс."""
+        index = {}
+        for rule in rules:
+            if 'chat_id' not in rule:
+                raise KeyError(ERROR_ROUTE_RULE.format(rule=rule))
+            key = tuple(rule.get(field) for field in RULE_FIELDS)
+            chats = index.setdefault(key, [])
+            if str(rule['chat_id']) not in chats:
+                chats.append(str(rule['chat_id']))
+        self.index = {key: tuple(chats) for key, chats in index.items()}
+        self.default_chats = tuple(str(chat) for chat in default_chats)
+        self.route = lru_cache(maxsize=4096)(self.resolve)
+
+    def resolve(self, account, status, lesson):
+        """Находит чаты для события без кэша."""
+        chats = list(self.default_chats)
+        for key in product((account, None), (status, None), (lesson, None)):
+            for chat_id in self.index.get(key, ()):
+                if chat_id not in chats:
+                    chats.append(chat_id)
+        return tuple(chats)
+
+
+def load(path, default_chats=()):
+    """Читает правила из JSON-файла со списком правил."""
+    rules = []
+    if path:
+        with open(path, encoding='utf-8') as source:
+            rules = json.load(source)
+        logger.info(ROUTES_LOADED.format(count=len(rules)))
+    return Router(rules, default_chats)
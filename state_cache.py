@@ -0,0 +1,162 @@
+import logging
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+import events
+import storage
+from constants import STATE_CACHE_SIZE, STATE_CACHE_TTL, STATE_SPILLED
+
+
+logger = logging.getLogger(__name__)
+
+
+class AccountState:
+    """Состояние опроса одного аккаунта."""
+
+    __slots__ = (
+        'account', 'timestamp', 'last_status', 'last_error', 'homeworks',
+        'touched_at', '__weakref__'
+    )
+
+    def __init__(self, account, timestamp, last_status=None,
+                 last_error=None, homeworks=None):
+        """Заполняет состояние, `homeworks` сопоставляет id записи."""
+        self.account = account
+        self.timestamp = timestamp
+        self.last_status = last_status
+        self.last_error = last_error
+        self.homeworks = homeworks or {}
+        self.touched_at = time.monotonic()
+
+
+class StateCache:
+    """Ограниченный кэш состояний аккаунтов с вытеснением в хранилище.
+
+    Давно не использованные аккаунты (LRU) и аккаунты, простоявшие
+    дольше `ttl` секунд, сохраняются в хранилище и удаляются из памяти,
+    а при следующем обращении загружаются обратно. Аккаунты с
+    доставленными изменениями сохраняются сразу (`flush`), чтобы
+    хранилище не отставало от отправленного. Закреплённые на время
+    цикла состояния не вытесняются. Если вытесненное состояние ещё
+    где-то используется (например, в очереди уведомлений), загрузка
+    возвращает тот же объект, чтобы его изменения не потерялись.
+    """
+
+    def __init__(self, connection, max_accounts=STATE_CACHE_SIZE,
+                 ttl=STATE_CACHE_TTL):
+        """Настраивает хранилище и границы кэша."""
+        self.connection = connection
+        self.max_accounts = max_accounts
+        self.ttl = ttl
+        self.states = OrderedDict()
+        self.pins = Counter()
+        self.spilled = weakref.WeakValueDictionary()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        """Возвращает число аккаунтов в памяти."""
+        return len(self.states)
+
+    def get(self, account):
+        """Возвращает состояние аккаунта, при необходимости загружая его."""
+        with self.lock:
+            state = self.states.pop(account, None)
+            if state is None:
+                state = self.load(account)
+            state.touched_at = time.monotonic()
+            self.states[account] = state
+            self.evict()
+            return state
+
+    @contextmanager
+    def pinned(self, accounts):
+        """Не вытесняет состояния аккаунтов, пока цикл с ними работает.
+
+        После выхода лишние состояния вытесняются со всеми изменениями
+        цикла.
+        """
+        accounts = list(accounts)
+        with self.lock:
+            self.pins.update(accounts)
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.pins.subtract(accounts)
+                self.pins += Counter()
+                self.evict()
+
+    def merge_stored(self, account):
+        """Подтягивает в состояние в памяти более свежие записи хранилища.
+
+        Нужно, когда записи аккаунта сохранил другой процесс.
+        """
+        with self.lock:
+            state = self.states.get(account) or self.spilled.get(account)
+            if state is None:
+                return
+            for stored in storage.load_homeworks(self.connection, account):
+                known = state.homeworks.get(stored.id)
+                if known is None or known.date_updated <= stored.date_updated:
+                    state.homeworks[stored.id] = stored
+
+    def load(self, account):
+        """Поднимает состояние аккаунта из хранилища."""
+        alive = self.spilled.pop(account, None)
+        if alive is not None:
+            return alive
+        saved = storage.load_account(self.connection, account)
+        if saved is None:
+            return AccountState(account, int(time.time()))
+        homeworks = storage.load_homeworks(self.connection, account)
+        return AccountState(account, *saved, homeworks={
+            homework.id: homework for homework in homeworks
+        })
+
+    def spill(self, state):
+        """Сохраняет состояние аккаунта в хранилище."""
+        storage.save_account(
+            self.connection,
+            state.account,
+            state.timestamp,
+            state.last_status,
+            state.last_error,
+            state.homeworks.values()
+        )
+        events.emit(
+            logger, logging.DEBUG, 'state_spilled', STATE_SPILLED,
+            account=state.account
+        )
+
+    def evict(self):
+        """Вытесняет лишние и просроченные незакреплённые состояния."""
+        excess = len(self.states) - self.max_accounts
+        expired_before = time.monotonic() - self.ttl
+        victims = []
+        for account, state in self.states.items():
+            if excess <= 0 and state.touched_at >= expired_before:
+                break
+            if account in self.pins:
+                continue
+            victims.append(account)
+            excess -= 1
+        for account in victims:
+            state = self.states.pop(account)
+            self.spill(state)
+            self.spilled[account] = state
+
+    def flush(self, accounts=None):
+        """Сохраняет состояния аккаунтов (по умолчанию все) в хранилище.
+
+        Состояния остаются в памяти.
+        """
+        with self.lock:
+            if accounts is None:
+                accounts = list(self.states)
+            for account in accounts:
+                state = self.states.get(account) or self.spilled.get(account)
+                if state is not None:
+                    self.spill(state)
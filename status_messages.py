@@ -0,0 +1,119 @@
+import logging
+
+import requests
+
+import botpool
+import cassette
+import deadline
+import events
+import storage
+from constants import (
+    NOTIFY_TIMEOUT,
+    SEND_MESSAGE_DEBUG,
+    SEND_MESSAGE_ERROR,
+    EDIT_MESSAGE_DEBUG,
+    EDIT_MESSAGE_ERROR,
+    PIN_MESSAGE_ERROR
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def call(bot, method, *args, **kwargs):
+    """Вызывает метод бота в пределах бюджета этапа `send`.
+
+    Таймаут передаётся, если метод его принимает, остальные методы
+    `TeleBot` работают с таймаутом по умолчанию. Таймаут запроса
+    приходит как TimeoutError.
+    """
+    timeout = deadline.timeout('send', NOTIFY_TIMEOUT)
+    if botpool.takes_timeout(type(bot), method):
+        kwargs['timeout'] = timeout
+    try:
+        return getattr(bot, method)(*args, **kwargs)
+    except requests.Timeout as e:
+        raise TimeoutError(e) from e
+
+
+@cassette.recorded('send', lambda bot, chat_id, message_id, message: {
+    'chat_id': str(chat_id), 'text': message
+})
+def edit(bot, chat_id, message_id, message):
+    """Обновляет текст сообщения, возвращает успех операции."""
+    try:
+        call(
+            bot, 'edit_message_text', message,
+            chat_id=chat_id, message_id=message_id
+        )
+    except TimeoutError:
+        raise
+    except Exception as e:
+        logger.warning(EDIT_MESSAGE_ERROR.format(
+            message_id=message_id, error=e
+        ))
+        return False
+    events.emit(
+        logger, logging.DEBUG, 'message_edited', EDIT_MESSAGE_DEBUG,
+        chat_id=chat_id, message_id=message_id, message=message
+    )
+    return True
+
+
+@cassette.recorded('send', lambda bot, chat_id, message: {
+    'chat_id': str(chat_id), 'text': message
+})
+def send_pinned(bot, chat_id, message):
+    """Отправляет и закрепляет сообщение, возвращает его id или None."""
+    try:
+        sent = call(bot, 'send_message', chat_id=chat_id, text=message)
+    except TimeoutError:
+        raise
+    except Exception as e:
+        logger.error(SEND_MESSAGE_ERROR.format(message, e), exc_info=True)
+        return None
+    events.emit(
+        logger, logging.DEBUG, 'message_sent', SEND_MESSAGE_DEBUG,
+        chat_id=chat_id, text=message
+    )
+    try:
+        call(
+            bot, 'pin_chat_message', chat_id, sent.message_id,
+            disable_notification=True
+        )
+    except Exception as e:
+        # Без прав на закрепление сообщение всё равно можно обновлять
+        logger.warning(PIN_MESSAGE_ERROR.format(
+            message_id=sent.message_id, error=e
+        ))
+    return sent.message_id
+
+
+def publish(bot, connection, account, homework_id, chat_id, message):
+    """Показывает статус работы одним сообщением, обновляя его на месте.
+
+    Первое изменение статуса отправляется и закрепляется, следующие
+    правят тот же текст через `edit_message_text`. Если сообщение
+    удалили, отправляется и запоминается новое. Таймаут учитывается
+    в бюджете цикла, изменение повторится в следующем цикле.
+    """
+    message_id = storage.load_message_id(
+        connection, account, homework_id, chat_id
+    )
+    try:
+        if message_id is not None and edit(
+            bot, chat_id, message_id, message
+        ):
+            return True
+        message_id = send_pinned(bot, chat_id, message)
+    except TimeoutError as e:
+        deadline.record_timeout(
+            'send', SEND_MESSAGE_ERROR.format(message, e)
+        )
+        return False
+    if message_id is None:
+        return False
+    storage.save_message_id(
+        connection, account, homework_id, chat_id, message_id
+    )
+    return True
@@ -0,0 +1,226 @@
+import sqlite3
+import threading
+
+from constants import STATE_DB_PATH
+from records import Homework
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS homeworks (
+    account TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    homework_name TEXT,
+    status TEXT,
+    lesson_name TEXT,
+    date_updated INTEGER,
+    PRIMARY KEY (account, id)
+);
+CREATE TABLE IF NOT EXISTS status_messages (
+    account TEXT NOT NULL,
+    homework_id INTEGER NOT NULL,
+    chat_id TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    PRIMARY KEY (account, homework_id, chat_id)
+);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    account TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    reason TEXT,
+    first_seen INTEGER,
+    last_seen INTEGER,
+    PRIMARY KEY (account, fingerprint)
+);
+CREATE TABLE IF NOT EXISTS accounts (
+    account TEXT PRIMARY KEY,
+    timestamp INTEGER,
+    last_status TEXT,
+    last_error TEXT
+);
+'''
+
+UPSERT_HOMEWORK = '''
+INSERT INTO homeworks (
+    account, id, homework_name, status, lesson_name, date_updated
+)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (account, id) DO UPDATE SET
+    homework_name = excluded.homework_name,
+    status = excluded.status,
+    lesson_name = excluded.lesson_name,
+    date_updated = excluded.date_updated
+'''
+
+SELECT_HOMEWORKS = '''
+SELECT id, homework_name, status, lesson_name, date_updated
+FROM homeworks
+WHERE account = ?
+ORDER BY id
+'''
+
+UPSERT_ACCOUNT = '''
+INSERT INTO accounts (account, timestamp, last_status, last_error)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (account) DO UPDATE SET
+    timestamp = excluded.timestamp,
+    last_status = excluded.last_status,
+    last_error = excluded.last_error
+'''
+
+SELECT_ACCOUNT = '''
+SELECT timestamp, last_status, last_error
+FROM accounts
+WHERE account = ?
+'''
+
+UPSERT_STATUS_MESSAGE = '''
+INSERT INTO status_messages (account, homework_id, chat_id, message_id)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (account, homework_id, chat_id) DO UPDATE SET
+    message_id = excluded.message_id
+'''
+
+SELECT_STATUS_MESSAGE = '''
+SELECT message_id
+FROM status_messages
+WHERE account = ? AND homework_id = ? AND chat_id = ?
+'''
+
+SELECT_LESSONS = '''
+SELECT id, lesson_name
+FROM homeworks
+WHERE lesson_name IS NOT NULL
+'''
+
+UPSERT_DEAD_LETTER = '''
+INSERT INTO dead_letters (
+    account, fingerprint, payload, reason, first_seen, last_seen
+)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (account, fingerprint) DO UPDATE SET
+    reason = excluded.reason,
+    last_seen = excluded.last_seen
+'''
+
+SELECT_DEAD_FINGERPRINTS = '''
+SELECT fingerprint
+FROM dead_letters
+WHERE account = ?
+'''
+
+SELECT_DEAD_LETTERS = '''
+SELECT account, fingerprint, payload, reason, first_seen, last_seen
+FROM dead_letters
+ORDER BY first_seen, account, fingerprint
+'''
+
+DELETE_DEAD_LETTER = '''
+DELETE FROM dead_letters
+WHERE account = ? AND fingerprint = ?
+'''
+
+# Соединение разделяется между потоками, запись ведём под блокировкой
+lock = threading.Lock()
+
+
+def connect(path=STATE_DB_PATH):
+    """Открывает хранилище состояния и создаёт недостающие таблицы."""
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def save_homeworks(connection, account, homeworks):
+    """Сохраняет пачку записей `Homework` одной транзакцией."""
+    rows = [(account, *homework) for homework in homeworks]
+    with lock, connection:
+        connection.executemany(UPSERT_HOMEWORK, rows)
+    return len(rows)
+
+
+def load_homeworks(connection, account):
+    """Возвращает сохранённые домашние работы аккаунта."""
+    with lock:
+        rows = connection.execute(SELECT_HOMEWORKS, (account,)).fetchall()
+    return [Homework(*row) for row in rows]
+
+
+def load_lessons(connection):
+    """Возвращает названия уроков по id работ всех аккаунтов."""
+    with lock:
+        return dict(connection.execute(SELECT_LESSONS))
+
+
+def save_account(connection, account, timestamp, last_status, last_error,
+                 homeworks):
+    """Сохраняет состояние аккаунта вместе с его работами.
+
+    Работы без `id` в таблицу не попадают: ключ в ней — id работы.
+    """
+    rows = [
+        (account, *homework) for homework in homeworks
+        if homework.id is not None
+    ]
+    with lock, connection:
+        connection.execute(
+            UPSERT_ACCOUNT, (account, timestamp, last_status, last_error)
+        )
+        connection.executemany(UPSERT_HOMEWORK, rows)
+
+
+def load_account(connection, account):
+    """Возвращает (timestamp, last_status, last_error) аккаунта или None."""
+    with lock:
+        return connection.execute(SELECT_ACCOUNT, (account,)).fetchone()
+
+
+def save_message_id(connection, account, homework_id, chat_id, message_id):
+    """Запоминает сообщение со статусом работы в чате."""
+    with lock, connection:
+        connection.execute(
+            UPSERT_STATUS_MESSAGE,
+            (account, homework_id, str(chat_id), message_id)
+        )
+
+
+def load_message_id(connection, account, homework_id, chat_id):
+    """Возвращает id сообщения со статусом работы в чате или None."""
+    with lock:
+        row = connection.execute(
+            SELECT_STATUS_MESSAGE, (account, homework_id, str(chat_id))
+        ).fetchone()
+    return row[0] if row else None
+
+
+def save_dead_letter(connection, account, fingerprint, payload, reason,
+                     seen_at):
+    """Сохраняет запись, которую не удалось обработать."""
+    with lock, connection:
+        connection.execute(UPSERT_DEAD_LETTER, (
+            account, fingerprint, payload, reason, seen_at, seen_at
+        ))
+
+
+def load_dead_fingerprints(connection, account):
+    """Возвращает отпечатки отложенных записей аккаунта."""
+    with lock:
+        rows = connection.execute(SELECT_DEAD_FINGERPRINTS, (account,))
+        return {fingerprint for fingerprint, in rows}
+
+
+def data_version(connection):
+    """Возвращает счётчик изменений хранилища другими соединениями."""
+    with lock:
+        return connection.execute('PRAGMA data_version').fetchone()[0]
+
+
+def load_dead_letters(connection):
+    """Возвращает все отложенные записи в порядке появления."""
+    with lock:
+        return connection.execute(SELECT_DEAD_LETTERS).fetchall()
+
+
+def delete_dead_letter(connection, account, fingerprint):
+    """Удаляет отложенную запись после успешной обработки."""
+    with lock, connection:
+        connection.execute(DELETE_DEAD_LETTER, (account, fingerprint))
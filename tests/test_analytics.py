@@ -0,0 +1,42 @@
+import analytics
+import journal
+from records import to_timestamp
+
+
+class TestAnalytics:
+    def test_turnaround_per_lesson(self, tmp_path):
+        path = str(tmp_path / 'journal.bin')
+        events = [
+            (1, 'reviewing', '2021-04-11T10:00:00Z'),
+            (2, 'reviewing', '2021-04-11T10:00:00Z'),
+            (1, 'rejected', '2021-04-11T12:00:00Z'),
+            (1, 'reviewing', '2021-04-12T10:00:00Z'),
+            (2, 'approved', '2021-04-12T10:00:00Z'),
+            (1, 'approved', '2021-04-12T14:00:00Z'),
+            (3, 'approved', '2021-04-12T14:00:00Z'),
+        ]
+        journal.append(path, [
+            journal.pack(
+                'student', homework_id, None, status, to_timestamp(date), 0
+            )
+            for homework_id, status, date in events
+        ])
+        report = analytics.turnaround(
+            path, {1: 'Деплой бота'}, percentiles=(50, 100)
+        )
+        assert set(report) == {'Деплой бота', 'Урок неизвестен'}
+        bot_lesson = report['Деплой бота']
+        assert bot_lesson['count'] == 2, (
+            'Каждый цикл «на проверке → вердикт» должен учитываться '
+            'отдельно.'
+        )
+        assert bot_lesson['percentiles'] == {50: 3.0, 100: 4.0}
+        assert bot_lesson['buckets'] == [0, 2, 0, 0, 0]
+        assert report['Урок неизвестен']['count'] == 1, (
+            'Вердикт без взятия в работу не должен учитываться.'
+        )
+
+    def test_turnaround_empty_journal(self, tmp_path):
+        path = tmp_path / 'journal.bin'
+        path.write_bytes(b'')
+        assert analytics.turnaround(str(path)) == {}
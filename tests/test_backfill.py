@@ -0,0 +1,135 @@
+import json
+from http import HTTPStatus
+
+import pytest
+import requests
+
+import backfill
+import cli
+import config
+import storage
+
+
+def split_into_chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class MockStreamResponse:
+    def __init__(self, payload, http_status=HTTPStatus.OK):
+        self.status_code = http_status
+        self.body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+    def iter_content(self, chunk_size=1):
+        return iter(split_into_chunks(self.body, 7))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class TestBackfill:
+    HOMEWORKS = [
+        {
+            'id': homework_id,
+            'homework_name': f'hw{homework_id}.zip',
+            'status': 'approved',
+            'date_updated': '2021-04-11T10:31:09Z',
+            'lesson_name': 'Проект спринта: Деплой бота'
+        }
+        for homework_id in range(1, 12)
+    ]
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 64, 4096])
+    def test_iter_homeworks_any_chunking(self, chunk_size):
+        payload = {'current_date': 1234567890, 'homeworks': self.HOMEWORKS}
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        result = list(backfill.iter_homeworks(
+            split_into_chunks(body, chunk_size)
+        ))
+        assert result == self.HOMEWORKS, (
+            'Поток `homeworks` должен разбираться одинаково при любом '
+            'разбиении ответа на куски.'
+        )
+
+    def test_numbers_split_at_chunk_boundary(self):
+        body = b'{"homeworks": [1.5, 22, -3e+2, 0.25E-1, 7]}'
+        for chunk_size in range(1, len(body) + 1):
+            assert list(backfill.iter_homeworks(
+                split_into_chunks(body, chunk_size)
+            )) == [1.5, 22, -300.0, 0.025, 7], (
+                'Число, разрезанное на `.` или `e`, должно дочитываться '
+                f'из следующего куска (размер куска {chunk_size}).'
+            )
+
+    @pytest.mark.parametrize('payload, error', [
+        ({'current_date': 1}, KeyError),
+        ({'homeworks': {'id': 1}}, TypeError),
+        ([{'homeworks': []}], TypeError),
+        ({'code': 'not_authenticated', 'homeworks': []}, RuntimeError),
+    ])
+    def test_iter_homeworks_invalid(self, payload, error):
+        body = json.dumps(payload).encode('utf-8')
+        with pytest.raises(error):
+            list(backfill.iter_homeworks(split_into_chunks(body, 5)))
+
+    def test_iter_homeworks_truncated(self):
+        body = json.dumps({'homeworks': self.HOMEWORKS}).encode('utf-8')
+        with pytest.raises(ValueError):
+            list(backfill.iter_homeworks([body[:-10]]))
+
+    def test_backfill_saves_in_batches(self, monkeypatch):
+        payload = {
+            'homeworks': self.HOMEWORKS + ['broken'],
+            'current_date': 1234567890
+        }
+        calls = []
+
+        def mock_get(*args, **kwargs):
+            calls.append(kwargs)
+            return MockStreamResponse(payload)
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        settings = config.defaults()._replace(
+            accounts=(config.Account('student', 'token'),)
+        )
+        monkeypatch.setattr(config, 'current', lambda: settings)
+        connection = storage.connect(':memory:')
+        saved = backfill.backfill(
+            connection, account='student', from_date=0, batch_size=4
+        )
+        assert saved == len(self.HOMEWORKS)
+        assert calls[0]['params'] == {'from_date': 0}
+        assert calls[0]['stream'], (
+            'Загрузка истории должна читать ответ API потоком.'
+        )
+        stored = storage.load_homeworks(connection, 'student')
+        assert [homework.id for homework in stored] == [
+            homework['id'] for homework in self.HOMEWORKS
+        ]
+
+    def test_backfill_not_ok_status(self, monkeypatch):
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda *args, **kwargs: MockStreamResponse(
+                {}, http_status=HTTPStatus.UNAUTHORIZED
+            )
+        )
+        with pytest.raises(RuntimeError):
+            backfill.backfill(storage.connect(':memory:'))
+
+    def test_backfill_unknown_account(self, monkeypatch):
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda *args, **kwargs: MockStreamResponse({'homeworks': []})
+        )
+        with pytest.raises(KeyError):
+            backfill.backfill(storage.connect(':memory:'), account='stranger')
+
+    @pytest.mark.parametrize('command', [
+        'backfill', 'turnaround', 'dead-letters', 'reprocess'
+    ])
+    def test_cli_refuses_memory_db(self, command):
+        with pytest.raises(SystemExit):
+            cli.main(['--db', ':memory:', command])
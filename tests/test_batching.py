@@ -0,0 +1,59 @@
+from batching import Coalescer, split_message
+
+
+class TestBatching:
+    def test_split_respects_limit(self):
+        lines = ['a' * 40, 'b' * 40, 'c' * 40, 'd' * 150]
+        chunks = split_message(lines, limit=100)
+        assert all(len(text) <= 100 for text, _ in chunks)
+        assert chunks[0] == ('a' * 40 + '\n' + 'b' * 40, [0, 1])
+        assert ''.join(text for text, _ in chunks[1:]).replace(
+            '\n', ''
+        ) == 'c' * 40 + 'd' * 150
+
+    def test_changes_coalesced_per_chat(self):
+        coalescer = Coalescer(window=0)
+        coalescer.add('chat', 1, 'hw1 на проверке', 'first')
+        coalescer.add('chat', 2, 'hw2 принято', 'second')
+        coalescer.add('chat', 1, 'hw1 принято', 'first-final')
+        coalescer.add('other', 3, 'hw3 принято', 'third')
+        batches = coalescer.flush()
+        assert len(batches) == 2, (
+            'Изменения одного чата должны уходить одним сообщением.'
+        )
+        assert batches[0] == (
+            'chat', 'hw2 принято\nhw1 принято', ['second', 'first-final']
+        )
+        assert not coalescer
+
+    def test_window_holds_changes(self):
+        coalescer = Coalescer(window=60)
+        coalescer.add('chat', 1, 'hw1 принято')
+        assert coalescer.flush() == []
+        assert len(coalescer) == 1
+        assert coalescer.flush(now=coalescer.started['chat'] + 60)
+
+    def test_errors_shed_first(self):
+        coalescer = Coalescer(window=0, max_items=3)
+        coalescer.add('chat', 'error', 'ошибка API', kind='error')
+        coalescer.add('chat', 1, 'hw1 на проверке')
+        coalescer.add('chat', 2, 'hw2 на проверке')
+        coalescer.add('chat', 1, 'hw1 принято')
+        coalescer.add('other', 3, 'hw3 принято')
+        assert coalescer.stats() == {
+            'queued': 3, 'collapsed': 1, 'shed_errors': 1, 'shed_statuses': 0
+        }, 'При переполнении первыми отбрасываются уведомления об ошибках.'
+        coalescer.add('other', 4, 'hw4 принято')
+        assert coalescer.stats()['shed_statuses'] == 1
+        assert [text for _, text, _ in coalescer.flush()] == [
+            'hw1 принято', 'hw3 принято\nhw4 принято'
+        ], 'Затем отбрасываются самые старые изменения.'
+        assert len(coalescer) == 0
+
+    def test_take_leaves_other_chats(self):
+        coalescer = Coalescer(window=0)
+        coalescer.add('chat', 1, 'hw1 принято')
+        coalescer.add('other', 2, 'hw2 принято')
+        assert coalescer.take('chat') == [('chat', 'hw1 принято', [None])]
+        assert coalescer.due() == ['other']
+        assert len(coalescer) == 1
@@ -0,0 +1,115 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import botapi
+
+
+class BotApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    limited_chats = set()
+    requests = []
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        params = json.loads(self.rfile.read(length))
+        method = self.path.rsplit('/', 1)[1]
+        self.requests.append((method, params))
+        if params['chat_id'] in self.limited_chats:
+            status, payload = 429, {
+                'ok': False,
+                'error_code': 429,
+                'description': 'Too Many Requests: retry after 5',
+                'parameters': {'retry_after': 5}
+            }
+        else:
+            status, payload = 200, {'ok': True, 'result': {
+                'message_id': len(self.requests), 'text': params.get('text')
+            }}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    BotApiHandler.limited_chats = set()
+    BotApiHandler.requests = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), BotApiHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(server, clock):
+    return botapi.BotApiClient(
+        '1234:token', base_url=server, session=requests.Session(),
+        workers=4, clock=clock
+    )
+
+
+class TestBotApiClient:
+    def test_send_message(self, client):
+        sent = client.send_message(chat_id=1, text='Привет')
+        assert sent.message_id == 1
+        assert BotApiHandler.requests == [
+            ('sendMessage', {'chat_id': '1', 'text': 'Привет'})
+        ], 'Клиент должен отправлять JSON в метод `sendMessage`.'
+
+    def test_edit_message_text(self, client):
+        client.edit_message_text('Новый текст', chat_id=1, message_id=7)
+        assert BotApiHandler.requests == [('editMessageText', {
+            'chat_id': '1', 'message_id': 7, 'text': 'Новый текст'
+        })]
+
+    def test_retry_after_blocks_chat(self, client, clock):
+        BotApiHandler.limited_chats.add('1')
+        with pytest.raises(botapi.BotApiError) as error:
+            client.send_message(chat_id=1, text='Первое')
+        assert error.value.code == 429
+        assert error.value.retry_after == 5
+        assert client.rate_limits() == {'1': 5}
+        clock.now = 3
+        with pytest.raises(botapi.BotApiError):
+            client.send_message(chat_id=1, text='Второе')
+        assert len(BotApiHandler.requests) == 1, (
+            'До истечения `retry_after` запросы в чат не должны уходить '
+            'в Telegram.'
+        )
+        BotApiHandler.limited_chats.clear()
+        clock.now = 5
+        assert client.send_message(chat_id=1, text='Третье').message_id == 2
+        assert client.rate_limits() == {}
+
+    def test_concurrent_sends_share_client(self, client):
+        BotApiHandler.limited_chats.add('2')
+        chats = [1] * 20 + [2]
+        with ThreadPoolExecutor(4) as executor:
+            futures = [
+                executor.submit(
+                    client.send_message, chat_id=chat_id, text=str(number)
+                )
+                for number, chat_id in enumerate(chats)
+            ]
+        results = [future.exception() or future.result() for future in futures]
+        assert [result.text for result in results[:-1]] == [
+            str(number) for number in range(20)
+        ], 'Каждый поток должен получить ответ на своё сообщение.'
+        assert isinstance(results[-1], botapi.BotApiError)
+        assert client.rate_limits() == {'2': 5}, (
+            'Ответ 429 из любого потока должен ограничивать чат.'
+        )
@@ -0,0 +1,155 @@
+from types import SimpleNamespace
+
+import pytest
+from telebot.apihelper import ApiTelegramException
+
+import botapi
+import botpool
+import deadline
+
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+        self.error = None
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        if self.error is not None:
+            raise self.error
+        self.sent.append((chat_id, text))
+        return SimpleNamespace(message_id=len(self.sent))
+
+    def edit_message_text(self, text, chat_id=None, message_id=None):
+        self.sent.append((chat_id, text))
+
+
+@pytest.fixture(autouse=True)
+def no_cycle(monkeypatch):
+    monkeypatch.setattr(deadline, 'current', None)
+
+
+def make_pool(clock, bots=2, rate=0):
+    return botpool.BotPool(
+        [FakeBot() for _ in range(bots)], rate=rate,
+        clock=clock, sleep=clock.sleep
+    )
+
+
+def bot_of(pool, chat_id):
+    return pool.slots.index(pool.assignments[str(chat_id)])
+
+
+class TestBotPool:
+    def test_chat_is_sticky(self, clock):
+        pool = make_pool(clock, bots=3)
+        for number in range(30):
+            pool.send_message(chat_id=number % 10, text='Статус')
+        senders = {}
+        for index, slot in enumerate(pool.slots):
+            for chat_id, _ in slot.bot.sent:
+                senders.setdefault(chat_id, set()).add(index)
+        assert all(len(bots) == 1 for bots in senders.values()), (
+            'Сообщения одного чата должны идти от одного бота.'
+        )
+        assert len(set().union(*senders.values())) > 1, (
+            'Чаты должны распределяться между ботами.'
+        )
+
+    def test_rate_limit_per_bot(self, clock):
+        pool = make_pool(clock, bots=1, rate=10)
+        for chat_id in range(5):
+            pool.send_message(chat_id=chat_id, text='')
+        assert clock.now == pytest.approx(0.4), (
+            'Бот должен отправлять не чаще заданного предела.'
+        )
+        assert pool.stats()[0]['sent'] == 5
+
+    def test_throughput_scales_with_bots(self, clock):
+        finished = []
+        for bots in (1, 4):
+            pool = make_pool(clock, bots=bots, rate=10)
+            for chat_id in range(200):
+                pool.send_message(chat_id=chat_id, text='')
+            finished.append(max(slot.next_at for slot in pool.slots))
+            clock.now = 0
+        assert finished[1] < finished[0] / 2, (
+            'Общая скорость отправки должна расти с числом ботов.'
+        )
+
+    @pytest.mark.parametrize('error', [
+        botapi.BotApiError('sendMessage', 429, 'Too Many Requests', 5),
+        ApiTelegramException('sendMessage', None, {
+            'error_code': 429,
+            'description': 'Too Many Requests',
+            'parameters': {'retry_after': 5}
+        }),
+    ])
+    def test_throttled_bot_rebalanced(self, clock, error):
+        pool = make_pool(clock, bots=2)
+        pool.send_message(chat_id=1, text='Первое')
+        first = bot_of(pool, 1)
+        pool.slots[first].bot.error = error
+        with pytest.raises(type(error)):
+            pool.send_message(chat_id=1, text='Второе')
+        assert pool.stats()[first]['throttled'] == 1
+        assert pool.stats()[first]['blocked_for'] == 5
+        pool.send_message(chat_id=1, text='Третье')
+        assert bot_of(pool, 1) != first, (
+            'Чат ограниченного бота должен переехать на свободный бот.'
+        )
+        assert pool.slots[1 - first].bot.sent == [(1, 'Третье')]
+        assert clock.now == 0
+
+    def test_new_chat_avoids_throttled_bot(self, clock):
+        pool = make_pool(clock, bots=2)
+        hashed = [
+            chat_id for chat_id in range(20)
+            if botpool.zlib.crc32(str(chat_id).encode()) % 2 == 0
+        ]
+        pool.slots[0].blocked_until = 300
+        for chat_id in hashed[:2]:
+            pool.send_message(chat_id=chat_id, text='')
+        assert pool.slots[0].bot.sent == []
+        assert len(pool.slots[1].bot.sent) == 2, (
+            'Новый чат не должен закрепляться за ограниченным ботом, '
+            'пока есть свободный.'
+        )
+        assert clock.now == 0
+
+    def test_long_wait_fails_fast(self, clock, monkeypatch):
+        pool = make_pool(clock, bots=2)
+        for slot in pool.slots:
+            slot.blocked_until = 300
+        with pytest.raises(TimeoutError):
+            pool.send_message(chat_id=1, text='')
+        assert clock.now == 0, (
+            'Ожидание дольше таймаута отправки не должно блокировать поток.'
+        )
+        monkeypatch.setattr(deadline, 'current', deadline.Deadline(
+            100, {'send': 0.4}, clock=clock
+        ))
+        for slot in pool.slots:
+            slot.blocked_until = 5
+        pool.send_message(chat_id=1, text='')
+        assert clock.now == 5
+
+    def test_other_errors_do_not_throttle(self, clock):
+        pool = make_pool(clock, bots=2)
+        for slot in pool.slots:
+            slot.bot.error = ValueError('сеть')
+        with pytest.raises(ValueError):
+            pool.send_message(chat_id=1, text='')
+        assert [stats['throttled'] for stats in pool.stats()] == [0, 0]
+
+    def test_parse_tokens(self):
+        assert botpool.parse_tokens('main', ' extra, main,,other ') == [
+            'main', 'extra', 'other'
+        ]
+
+    def test_timeout_dropped_when_bot_lacks_it(self, clock):
+        pool = make_pool(clock, bots=1)
+        pool.edit_message_text('новый', chat_id=1, message_id=5, timeout=3)
+        assert pool.slots[0].bot.sent == [(1, 'новый')], (
+            'Пул не должен передавать `timeout` методам бота, '
+            'которые его не принимают.'
+        )
@@ -0,0 +1,147 @@
+import gzip
+from http import HTTPStatus
+
+import requests
+
+import cassette
+import config
+import homework
+import replay
+
+
+class MockResponse:
+    status_code = HTTPStatus.OK
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class MockBot:
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.text = text
+
+
+class TestCassette:
+    HOMEWORK = {
+        'id': 7,
+        'homework_name': 'hw7.zip',
+        'status': 'approved',
+        'lesson_name': 'Проект спринта'
+    }
+
+    def record(self, path, monkeypatch, payloads):
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda *args, **kwargs: MockResponse(payloads.pop(0))
+        )
+        recorder = cassette.start(str(path))
+        try:
+            account = config.Account('student', 'secret')
+            for _ in range(2):
+                response = homework.get_account_answer(account, 0)
+                for item in response['homeworks']:
+                    homework.send_to_chat(
+                        MockBot(), homework.TELEGRAM_CHAT_ID,
+                        homework.parse_status(item)
+                    )
+        finally:
+            cassette.stop()
+        return recorder
+
+    def test_records_requests_and_responses(self, tmp_path, monkeypatch):
+        path = tmp_path / 'traffic.jsonl.gz'
+        self.record(path, monkeypatch, [
+            {'homeworks': [self.HOMEWORK], 'current_date': 1},
+            {'homeworks': [], 'current_date': 2}
+        ])
+        events = list(cassette.read(str(path)))
+        assert [event['kind'] for event in events] == ['api', 'send', 'api']
+        assert events[0]['request'] == {'account': 'student', 'from_date': 0}
+        assert 'secret' not in gzip.open(path, 'rt').read(), (
+            'Токен аккаунта не должен попадать в кассету.'
+        )
+        assert events[2]['response']['current_date'] == 2
+        assert events[0]['offset'] <= events[2]['offset']
+
+    def test_replay_matches_recording(self, tmp_path, monkeypatch):
+        path = tmp_path / 'traffic.jsonl.gz'
+        self.record(path, monkeypatch, [
+            {'homeworks': [self.HOMEWORK], 'current_date': 1},
+            {'homeworks': [], 'current_date': 2}
+        ])
+        monkeypatch.setattr(requests, 'get', None)
+        report = replay.run(str(path))
+        assert report['api_calls'] == 2
+        assert report['sends'] == report['recorded_sends'] == 1
+        assert report['mismatches'] == {}, (
+            'Воспроизведение должно отправлять те же сообщения, что и запись.'
+        )
+
+    def test_failed_send_not_expected_on_replay(self, tmp_path):
+        path = tmp_path / 'traffic.jsonl.gz'
+        recorder = cassette.Recorder(str(path), clock=lambda: 0.0)
+        recorder.write('api', {'account': 'student', 'from_date': 0}, 0.0,
+                       response={'homeworks': []})
+        recorder.write('send', {'chat_id': '1', 'text': 'Не дошло'}, 0.0,
+                       response=False)
+        recorder.close()
+        report = replay.run(str(path))
+        assert report['recorded_sends'] == 0, (
+            'Неудачная отправка не должна ожидаться при воспроизведении.'
+        )
+        assert report['mismatches'] == {}
+
+    def test_replay_at_recorded_speed(self, tmp_path):
+        path = tmp_path / 'traffic.jsonl.gz'
+        recorder = cassette.Recorder(str(path), clock=lambda: 0.0)
+        for offset in (0.0, 10.0):
+            recorder.write('api', {'account': 'student', 'from_date': 0},
+                           offset, response={'homeworks': []})
+        recorder.close()
+        now = [0.0]
+        pauses = []
+
+        def sleep(seconds):
+            pauses.append(seconds)
+            now[0] += seconds
+
+        report = replay.run(
+            str(path), speed=2, clock=lambda: now[0], sleep=sleep
+        )
+        assert report['api_calls'] == 2
+        assert pauses == [5.0], (
+            'Интервалы записи должны сокращаться в `speed` раз.'
+        )
+
+    def test_edit_mode_replay_matches_recording(self, tmp_path, monkeypatch):
+        path = tmp_path / 'traffic.jsonl.gz'
+        payloads = [
+            {'homeworks': [self.HOMEWORK], 'current_date': 1},
+            {'homeworks': [{**self.HOMEWORK, 'status': 'rejected'}],
+             'current_date': 2}
+        ]
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda *args, **kwargs: MockResponse(payloads.pop(0))
+        )
+        monkeypatch.setattr(homework, 'EDIT_STATUS_MESSAGES', True)
+        monkeypatch.setattr(homework, 'JOURNAL_PATH', None)
+        runtime = replay.build_runtime(replay.ReplayBot())
+        cassette.start(str(path))
+        try:
+            for _ in range(2):
+                homework.poll_account(
+                    runtime, config.Account('student', 'secret')
+                )
+        finally:
+            cassette.stop()
+        monkeypatch.setattr(requests, 'get', None)
+        report = replay.run(str(path))
+        assert report['recorded_sends'] == 2, (
+            'Отправка и правка сообщений в режиме обновления должны '
+            'записываться в кассету.'
+        )
+        assert report['mismatches'] == {}
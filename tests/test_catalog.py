@@ -0,0 +1,47 @@
+import pytest
+
+import catalog
+from constants import HOMEWORK_VERDICTS, STATUS_CHANGED
+
+
+class TestCatalog:
+    def test_default_locale_matches_template(self):
+        messages = catalog.Catalog(HOMEWORK_VERDICTS)
+        for status, verdict in HOMEWORK_VERDICTS.items():
+            assert messages.render('hw.zip', status, 'ru') == (
+                STATUS_CHANGED.format(homework_name='hw.zip', verdict=verdict)
+            ), 'Сообщение на языке по умолчанию не должно меняться.'
+
+    def test_other_locale_and_memoization(self):
+        messages = catalog.Catalog(HOMEWORK_VERDICTS)
+        english = messages.render('hw.zip', 'approved', 'en')
+        assert 'hw.zip' in english and 'Hooray' in english
+        messages.render('hw.zip', 'approved', 'en')
+        assert messages.render.cache_info().hits == 1, (
+            'Готовое сообщение должно браться из кэша.'
+        )
+        assert messages.render('hw.zip', 'approved', 'de') == (
+            messages.render('hw.zip', 'approved', 'ru')
+        ), 'Для неизвестного языка используется язык по умолчанию.'
+
+    def test_braces_in_names_and_verdicts(self):
+        messages = catalog.Catalog({'approved': 'Принято {ok}'})
+        assert messages.render('{hw}.zip', 'approved') == (
+            'Изменился статус проверки работы "{hw}.zip". Принято {ok}'
+        )
+
+    def test_unknown_status_fallback(self):
+        with pytest.raises(ValueError):
+            catalog.Catalog(HOMEWORK_VERDICTS).render('hw.zip', 'lost')
+        generic = catalog.Catalog(HOMEWORK_VERDICTS, fallback='generic')
+        assert '"lost"' in generic.render('hw.zip', 'lost'), (
+            'Запасной текст должен называть неизвестный статус.'
+        )
+
+    def test_rebuilt_on_new_verdicts(self):
+        verdicts = dict(HOMEWORK_VERDICTS)
+        first = catalog.for_verdicts(verdicts)
+        assert catalog.for_verdicts(verdicts) is first
+        assert catalog.for_verdicts(dict(verdicts)) is not first, (
+            'Новый снимок вердиктов должен пересобирать каталог.'
+        )
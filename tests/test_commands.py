@@ -0,0 +1,103 @@
+import time
+from types import SimpleNamespace
+
+import commands
+import config
+import storage
+from records import Homework
+
+
+class MockCommandBot:
+    def __init__(self):
+        self.handlers = []
+        self.replies = []
+
+    def message_handler(self, commands=None, **kwargs):
+        def decorator(handler):
+            self.handlers.append((commands, handler))
+            return handler
+        return decorator
+
+    def reply_to(self, message, text):
+        self.replies.append((message.chat.id, text))
+
+
+def make_message(chat_id, text):
+    return SimpleNamespace(chat=SimpleNamespace(id=chat_id), text=text)
+
+
+class TestCommands:
+    RECORD = Homework(1, 'hw1.zip', 'approved', 'Деплой бота', 0)
+
+    def test_status_and_history_from_cache(self):
+        cache = commands.StatusCache()
+        cache.touch('student')
+        cache.add('student', self.RECORD)
+        bot = MockCommandBot()
+        answer = commands.register(bot, cache, {'12345': 'student'})
+        assert set(bot.handlers[0][0]) == {'status', 'history'}
+
+        answer(make_message(12345, '/status'))
+        answer(make_message(12345, '/history@homework_bot'))
+        status_reply, history_reply = [text for _, text in bot.replies]
+        assert 'hw1.zip: Работа проверена' in status_reply
+        assert 'Последняя проверка API' in status_reply
+        assert 'hw1.zip' in history_reply
+
+    def test_foreign_chat_ignored(self):
+        bot = MockCommandBot()
+        answer = commands.register(
+            bot, commands.StatusCache(), {'12345': 'student'}
+        )
+        answer(make_message(999, '/status'))
+        assert not bot.replies, (
+            'Бот не должен отвечать на команды из чужих чатов.'
+        )
+
+    def test_stale_status(self, monkeypatch):
+        cache = commands.StatusCache(ttl=10)
+        cache.touch('student')
+        now = time.time()
+        monkeypatch.setattr(time, 'time', lambda: now + 11)
+        assert 'устаревшими' in commands.render_status(cache, 'student')
+
+    def test_verdicts_follow_config_and_locale(self, monkeypatch):
+        settings = config.defaults()._replace(
+            verdicts={'approved': 'Принято после перезагрузки'},
+            chat_locales={'777': 'en'}
+        )
+        monkeypatch.setattr(config, 'current', lambda: settings)
+        cache = commands.StatusCache()
+        cache.add('student', self.RECORD)
+        bot = MockCommandBot()
+        answer = commands.register(
+            bot, cache, {'12345': 'student', '777': 'student'}
+        )
+        answer(make_message(12345, '/status'))
+        answer(make_message(777, '/history'))
+        status_reply, history_reply = [text for _, text in bot.replies]
+        assert 'hw1.zip: Принято после перезагрузки' in status_reply, (
+            'Вердикт должен браться из текущих настроек, а не из '
+            'констант на момент импорта.'
+        )
+        assert 'The work has been reviewed' in history_reply, (
+            'Вердикт должен выводиться на языке чата.'
+        )
+
+    def test_seed_from_storage(self):
+        connection = storage.connect(':memory:')
+        storage.save_account(connection, 'student', 0, '', '', [self.RECORD])
+        cache = commands.StatusCache()
+        cache.seed('student', storage.load_homeworks(connection, 'student'))
+        assert 'hw1.zip: Работа проверена' in commands.render_status(
+            cache, 'student'
+        ), 'После перезапуска /status должен отвечать по хранилищу.'
+        assert not cache.changes('student'), (
+            'Сохранённые работы не должны попадать в историю изменений.'
+        )
+        newer = self.RECORD._replace(status='rejected')
+        cache.add('student', newer)
+        cache.seed('student', [self.RECORD])
+        assert cache.status('student')[0] == [newer], (
+            'Запись из хранилища не должна заменять более новую.'
+        )
@@ -0,0 +1,51 @@
+import json
+import os
+
+import config
+
+
+class TestConfig:
+    def write(self, path, data, mtime):
+        path.write_text(json.dumps(data), encoding='utf-8')
+        os.utime(path, ns=(mtime, mtime))
+
+    def test_defaults(self, monkeypatch):
+        monkeypatch.setenv('PRACTICUM_TOKEN', 'late-token')
+        settings = config.ConfigWatcher(path=None).reload()
+        assert settings.retry_period == 600
+        assert settings.accounts[0].token == 'late-token', (
+            'Токен должен читаться при запуске, а не при импорте модуля.'
+        )
+
+    def test_reload_swaps_snapshot(self, tmp_path):
+        path = tmp_path / 'config.json'
+        self.write(path, {'retry_period': 300}, 10 ** 18)
+        watcher = config.ConfigWatcher(str(path))
+        first = watcher.reload()
+        assert first.retry_period == 300
+        assert watcher.reload() is first, (
+            'Неизменённый файл не должен перечитываться.'
+        )
+        self.write(path, {
+            'verdicts': {'approved': 'Принято'},
+            'accounts': [{'name': 'student', 'token': 'secret'}]
+        }, 2 * 10 ** 18)
+        second = watcher.reload()
+        assert second.retry_period == 600
+        assert second.verdicts['approved'] == 'Принято'
+        assert second.verdicts['rejected'] == (
+            'Работа проверена: у ревьюера есть замечания.'
+        )
+        assert second.accounts == (config.Account('student', 'secret'),)
+        assert first.retry_period == 300, (
+            'Старый снимок настроек не должен меняться при перезагрузке.'
+        )
+
+    def test_broken_file_keeps_settings(self, tmp_path):
+        path = tmp_path / 'config.json'
+        self.write(path, {'retry_period': 300}, 10 ** 18)
+        watcher = config.ConfigWatcher(str(path))
+        watcher.reload()
+        path.write_text('{broken', encoding='utf-8')
+        os.utime(path, ns=(2 * 10 ** 18, 2 * 10 ** 18))
+        assert watcher.reload().retry_period == 300
@@ -0,0 +1,116 @@
+import logging
+
+import commands
+import config
+import deadline
+import homework
+import notifiers
+import replay
+import storage
+from batching import Coalescer
+
+
+ACCOUNT = config.Account('student', None)
+NAMELESS = [
+    {'homework_name': 'first.zip', 'status': 'approved'},
+    {'homework_name': 'second.zip', 'status': 'reviewing'}
+]
+
+
+class FailingBot(replay.ReplayBot):
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        raise RuntimeError('Telegram недоступен')
+
+
+def run_cycles(monkeypatch, runtime, homeworks, cycles):
+    monkeypatch.setattr(
+        homework, 'get_account_answer',
+        lambda account, timestamp: {'homeworks': homeworks, 'current_date': 1}
+    )
+    monkeypatch.setattr(homework, 'JOURNAL_PATH', None)
+    for _ in range(cycles):
+        with runtime.states.pinned([ACCOUNT.name]):
+            homework.poll_account(runtime, ACCOUNT)
+            homework.record_delivered(
+                runtime, homework.flush_changes(runtime)
+            )
+
+
+class TestCycle:
+    def test_records_without_id_sent_once(self, monkeypatch):
+        runtime = replay.build_runtime(replay.ReplayBot())
+        run_cycles(monkeypatch, runtime, NAMELESS, cycles=4)
+        sent = '\n'.join(runtime.bot.sent)
+        assert sent.count('first.zip') == 1, (
+            'Работы без `id` не должны затирать друг друга в состоянии '
+            'и отправляться повторно.'
+        )
+        assert sent.count('second.zip') == 1
+
+    def test_delivered_changes_persisted(self, monkeypatch):
+        runtime = replay.build_runtime(replay.ReplayBot())
+        change = {'id': 7, 'homework_name': 'hw.zip', 'status': 'reviewing'}
+        run_cycles(monkeypatch, runtime, [change], cycles=1)
+        run_cycles(
+            monkeypatch, runtime, [{**change, 'status': 'approved'}],
+            cycles=1
+        )
+        stored = storage.load_homeworks(runtime.connection, ACCOUNT.name)
+        assert [record.status for record in stored] == ['approved'], (
+            'Доставленное изменение должно сразу сохраняться в хранилище, '
+            'а не только при вытеснении аккаунта.'
+        )
+        restarted = commands.StatusCache()
+        restarted.seed(ACCOUNT.name, stored)
+        assert 'Работа проверена' in commands.render_status(
+            restarted, ACCOUNT.name
+        )
+
+    def test_broadcast_waits_for_telegram(self, monkeypatch):
+        broadcasts = []
+        monkeypatch.setattr(notifiers, 'broadcast', broadcasts.append)
+        runtime = replay.build_runtime(FailingBot())
+        change = {'id': 7, 'homework_name': 'hw.zip', 'status': 'approved'}
+        run_cycles(monkeypatch, runtime, [change], cycles=3)
+        assert broadcasts == [], (
+            'Дополнительные каналы не должны получать изменение, пока '
+            'его не принял Telegram.'
+        )
+        runtime = runtime._replace(bot=replay.ReplayBot())
+        run_cycles(monkeypatch, runtime, [change], cycles=2)
+        assert len(broadcasts) == 1
+
+    def test_batch_sent_when_window_expires(self, monkeypatch):
+        monkeypatch.setattr(deadline, 'current', None)
+        runtime = replay.build_runtime(replay.ReplayBot())._replace(
+            coalescer=Coalescer(window=0.05)
+        )
+        change = {'id': 7, 'homework_name': 'hw.zip', 'status': 'approved'}
+        run_cycles(monkeypatch, runtime, [change], cycles=1)
+        assert runtime.bot.sent == []
+        pause = homework.send_batches(runtime, 600)
+        assert len(runtime.bot.sent) == 1, (
+            'Изменения должны уходить по истечении окна накопления, '
+            'а не в следующем цикле опроса.'
+        )
+        assert pause == 600 - 0.05
+        assert homework.send_batches(runtime, 600) == 600
+
+    def test_exhausted_send_budget_counts_as_timeout(
+        self, monkeypatch, clock, caplog
+    ):
+        cycle = deadline.Deadline(10, {'send': 0.4}, clock=clock)
+        monkeypatch.setattr(deadline, 'current', cycle)
+        clock.now = 10
+        bot = replay.ReplayBot()
+        with caplog.at_level(logging.WARNING):
+            assert not homework.send_to_chat(bot, '1', 'принято')
+        assert bot.sent == [], (
+            'При исчерпанном бюджете запрос не должен уходить в Telegram '
+            'с нулевым таймаутом.'
+        )
+        assert cycle.timeouts['send'] == 1
+        assert not [
+            record for record in caplog.records
+            if record.levelno >= logging.ERROR
+        ]
@@ -0,0 +1,91 @@
+import deadletters
+import storage
+import validation
+from constants import HOMEWORK_VERDICTS
+
+
+class TestDeadLetters:
+    BROKEN = {'id': 5, 'homework_name': 'hw5.zip', 'status': 'lost'}
+
+    def test_known_record_skipped(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        letters = deadletters.DeadLetters(storage.connect(path))
+        assert letters.add('student', self.BROKEN, 'неизвестный статус')
+        assert not letters.add('student', dict(self.BROKEN), 'снова'), (
+            'Уже отложенная запись должна пропускаться по отпечатку.'
+        )
+        assert letters.add('other', self.BROKEN, 'другой аккаунт')
+        restarted = deadletters.DeadLetters(storage.connect(path))
+        assert not restarted.add('student', self.BROKEN, 'после перезапуска')
+        rows = storage.load_dead_letters(storage.connect(path))
+        assert sorted((row[0], row[3]) for row in rows) == [
+            ('other', 'другой аккаунт'), ('student', 'неизвестный статус')
+        ]
+
+    def test_fingerprint_ignores_key_order(self):
+        assert deadletters.fingerprint({'a': 1, 'b': 2}) == (
+            deadletters.fingerprint({'b': 2, 'a': 1})
+        )
+        assert deadletters.fingerprint({'a': 1}) != (
+            deadletters.fingerprint({'a': 2})
+        )
+
+    def test_reprocess_after_fix(self):
+        connection = storage.connect(':memory:')
+        letters = deadletters.DeadLetters(connection)
+        letters.add('student', self.BROKEN, 'неизвестный статус')
+        letters.add('student', {'status': 'approved'}, 'нет имени')
+        delivered = []
+
+        def deliver(account, homework):
+            delivered.append((account, homework))
+            return True
+
+        fixed = validation.Validator({**HOMEWORK_VERDICTS, 'lost': 'Потеряна'})
+        before = storage.load_dead_letters(connection)
+        assert deadletters.reprocess(
+            connection, fixed, deliver, dry_run=True
+        ) == (1, 1)
+        assert delivered == []
+        assert storage.load_dead_letters(connection) == before, (
+            'Проверка с `--dry-run` не должна менять хранилище.'
+        )
+        assert deadletters.reprocess(connection, fixed, deliver) == (1, 1)
+        assert delivered == [('student', self.BROKEN)]
+        rows = storage.load_dead_letters(connection)
+        assert len(rows) == 1 and 'homework_name' in rows[0][3], (
+            'Неисправленная запись остаётся с обновлённой причиной.'
+        )
+
+    def test_known_record_skipped_before_validation(self, monkeypatch):
+        letters = deadletters.DeadLetters(storage.connect(':memory:'))
+        letters.add('student', self.BROKEN, 'неизвестный статус')
+        calls = []
+        monkeypatch.setattr(
+            deadletters, 'fingerprint',
+            lambda homework: calls.append(homework) or 'key'
+        )
+        changed = dict(self.BROKEN, homework_name='hw6.zip')
+        good = {'id': 7, 'homework_name': 'hw7.zip', 'status': 'approved'}
+        assert letters.skip_known(
+            'student', [dict(self.BROKEN), changed, good]
+        ) == [changed, good]
+        assert calls == [], (
+            'Уже отложенная запись должна узнаваться без сериализации '
+            'и хеширования.'
+        )
+
+    def test_refresh_after_reprocess(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        letters = deadletters.DeadLetters(storage.connect(path))
+        letters.add('student', self.BROKEN, 'неизвестный статус')
+        assert letters.refresh() == []
+        other = storage.connect(path)
+        storage.delete_dead_letter(
+            other, 'student', deadletters.fingerprint(self.BROKEN)
+        )
+        assert letters.refresh() == ['student'], (
+            'Бот должен замечать записи, разобранные другим процессом.'
+        )
+        assert letters.skip_known('student', [self.BROKEN]) == [self.BROKEN]
+        assert letters.add('student', self.BROKEN, 'снова')
@@ -0,0 +1,69 @@
+import logging
+
+import pytest
+
+import deadline
+
+
+class TestDeadline:
+    SHARES = {'api': 0.5, 'parse': 0.1, 'send': 0.4}
+
+    def test_stage_timeout_is_bounded_by_share_and_cycle(self, clock):
+        cycle = deadline.Deadline(100, self.SHARES, clock=clock)
+        assert cycle.timeout('api') == 50
+        with cycle.stage('api'):
+            clock.now = 30
+        assert cycle.timeout('api') == 20, (
+            'Таймаут этапа должен уменьшаться на уже потраченное время.'
+        )
+        clock.now = 90
+        assert cycle.timeout('send') == 10, (
+            'Таймаут этапа не должен превышать остаток бюджета цикла.'
+        )
+        clock.now = 100
+        assert cycle.expired('send')
+
+    def test_overrun_recorded_once(self, clock, caplog):
+        cycle = deadline.Deadline(10, self.SHARES, clock=clock)
+        with caplog.at_level(logging.WARNING):
+            for _ in range(3):
+                with cycle.stage('parse'):
+                    clock.now += 1
+        assert cycle.timeouts['parse'] == 1, (
+            'Выход этапа за долю бюджета должен учитываться один раз.'
+        )
+        cycle.skip('parse')
+        assert cycle.timeouts['parse'] == 2
+
+    def test_parallel_operations_charge_wall_time(self, clock):
+        cycle = deadline.Deadline(2, self.SHARES, clock=clock)
+        operations = [cycle.stage('api') for _ in range(4)]
+        for operation in operations:
+            operation.__enter__()
+        clock.now = 0.3
+        assert cycle.timeout('api') == 0.7, (
+            'Параллельные операции этапа должны тратить долю по настенным '
+            'часам, а не по сумме своих времён.'
+        )
+        for operation in operations:
+            operation.__exit__(None, None, None)
+        clock.now = 0.5
+        assert cycle.timeout('api') == 0.7
+        assert not cycle.timeouts
+
+    def test_module_defaults_outside_cycle(self, monkeypatch):
+        monkeypatch.setattr(deadline, 'current', None)
+        assert deadline.timeout('api', 30) == 30
+        assert not deadline.expired('api')
+        with deadline.stage('api'):
+            pass
+        cycle = deadline.start(budget=4)
+        assert deadline.current is cycle
+        assert deadline.timeout('api', 30) <= 2
+
+    def test_exhausted_stage_raises_timeout(self, clock, monkeypatch):
+        cycle = deadline.Deadline(10, self.SHARES, clock=clock)
+        monkeypatch.setattr(deadline, 'current', cycle)
+        clock.now = 10
+        with pytest.raises(TimeoutError):
+            deadline.timeout('send', 30)
@@ -0,0 +1,111 @@
+import json
+import logging
+import sys
+
+import pytest
+
+import events
+
+
+class CountingTemplate(str):
+    calls = 0
+
+    def format(self, *args, **kwargs):
+        CountingTemplate.calls += 1
+        return super().format(*args, **kwargs)
+
+
+@pytest.fixture
+def sampler(monkeypatch):
+    sampler = events.Sampler(events.parse_sample_rates(
+        'message_sent=0.25, no_new_statuses=0'
+    ))
+    monkeypatch.setattr(events, 'sampler', sampler)
+    return sampler
+
+
+def make_record(message, exc_info=None):
+    return logging.LogRecord(
+        'homework', logging.DEBUG, __file__, 1, message, None, exc_info
+    )
+
+
+class TestEvents:
+    def test_parse_sample_rates(self):
+        assert events.parse_sample_rates(' a=1, b=0.1,c=0,,') == {
+            'a': 1, 'b': 10, 'c': None
+        }
+
+    def test_invalid_sample_rates_skipped(self, caplog):
+        with caplog.at_level(logging.WARNING):
+            assert events.parse_sample_rates(
+                'message_sent, status_changed=often, no_new_statuses=0.5'
+            ) == {'no_new_statuses': 2}
+        assert len(caplog.records) == 2, (
+            'Неразобранная доля должна пропускаться с предупреждением, '
+            'а не останавливать бота при запуске.'
+        )
+
+    def test_sampling(self, sampler):
+        kept = [sampler.keep('message_sent') for _ in range(8)]
+        assert kept == [True, False, False, False] * 2, (
+            'Событие с долей 0.25 должно записываться каждое четвёртое.'
+        )
+        assert not sampler.keep('no_new_statuses')
+        assert sampler.keep('status_changed')
+
+    def test_emit_is_lazy(self, caplog):
+        logger = logging.getLogger('events.test')
+        template = CountingTemplate('Статус {status}')
+        CountingTemplate.calls = 0
+        with caplog.at_level(logging.INFO, logger='events.test'):
+            events.emit(logger, logging.DEBUG, 'status', template, status=1)
+        assert CountingTemplate.calls == 0, (
+            'Текст выключенного события не должен собираться.'
+        )
+        with caplog.at_level(logging.DEBUG, logger='events.test'):
+            events.emit(logger, logging.DEBUG, 'status', template, status=1)
+        assert [record.getMessage() for record in caplog.records] == [
+            'Статус 1'
+        ]
+        assert caplog.records[0].funcName == 'test_emit_is_lazy'
+
+    def test_emit_sampled(self, caplog, sampler):
+        logger = logging.getLogger('events.test')
+        with caplog.at_level(logging.DEBUG, logger='events.test'):
+            for _ in range(8):
+                events.emit(
+                    logger, logging.DEBUG, 'message_sent', '{text}', text=''
+                )
+                events.emit(
+                    logger, logging.DEBUG, 'no_new_statuses', '', name='x'
+                )
+        assert len(caplog.records) == 2
+
+    def test_json_event(self):
+        line = events.JsonFormatter().format(make_record(events.Event(
+            'status_changed', '{account}', {
+                'account': 'student', 'homework_id': 7, 'status': 'approved'
+            }, every=10
+        )))
+        entry = json.loads(line)
+        assert entry.pop('ts') > 0
+        assert entry == {
+            'level': 'DEBUG',
+            'logger': 'homework',
+            'event': 'status_changed',
+            'sample': 10,
+            'account': 'student',
+            'homework_id': 7,
+            'status': 'approved'
+        }, 'Событие должно выводиться полями в одной строке JSON.'
+        assert '\n' not in line and ', ' not in line
+
+    def test_json_plain_message_and_error(self):
+        try:
+            raise ValueError('сбой')
+        except ValueError:
+            record = make_record('Сбой в работе', exc_info=sys.exc_info())
+        entry = json.loads(events.JsonFormatter().format(record))
+        assert entry['message'] == 'Сбой в работе'
+        assert 'ValueError: сбой' in entry['exc']
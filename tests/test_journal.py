@@ -0,0 +1,51 @@
+import journal
+
+
+class TestJournal:
+    def fill_journal(self, path, events):
+        journal.append(path, [
+            journal.pack(account, homework_id, old, new, 1618137069,
+                         notified_at)
+            for account, homework_id, old, new, notified_at in events
+        ])
+
+    def test_record_is_fixed_width(self):
+        record = journal.pack('student', 1, None, 'reviewing', 1618137069,
+                              1618137070)
+        assert len(record) == journal.RECORD.size == 48
+        assert journal.unpack(record) == {
+            'account': 'student',
+            'homework_id': 1,
+            'old_status': '',
+            'new_status': 'reviewing',
+            'date_updated': 1618137069,
+            'notified_at': 1618137070
+        }
+
+    def test_query_uses_index_and_tail(self, tmp_path):
+        path = str(tmp_path / 'journal.bin')
+        self.fill_journal(path, [
+            ('student', 1, None, 'reviewing', 10),
+            ('student', 2, None, 'reviewing', 11),
+            ('other', 1, None, 'reviewing', 12),
+        ])
+        assert journal.build_index(path) == 3
+        self.fill_journal(path, [('student', 1, 'reviewing', 'approved', 13)])
+        events = journal.query(path, 'student', 1)
+        assert [event['notified_at'] for event in events] == [10, 13], (
+            'Запрос должен находить записи и по индексу, и в хвосте журнала, '
+            'дописанном после построения индекса.'
+        )
+        assert events[-1]['new_status'] == 'approved'
+        assert journal.query(path, 'student', 3) == []
+
+    def test_append_truncates_broken_tail(self, tmp_path):
+        path = str(tmp_path / 'journal.bin')
+        self.fill_journal(path, [('student', 1, None, 'reviewing', 10)])
+        with open(path, 'ab') as broken:
+            broken.write(b'\0' * 5)
+        self.fill_journal(path, [('student', 1, 'reviewing', 'rejected', 11)])
+        events = journal.query(path, 'student', 1)
+        assert [event['new_status'] for event in events] == [
+            'reviewing', 'rejected'
+        ]
@@ -0,0 +1,44 @@
+import json
+import logging
+import random
+
+from latency import LatencyTracker, QuantileSketch
+
+
+class TestLatency:
+    def test_sketch_relative_accuracy(self):
+        values = [random.uniform(1, 10000) for _ in range(5000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        ordered = sorted(values)
+        for share in (0.5, 0.95, 0.99):
+            exact = ordered[int(share * (len(ordered) - 1))]
+            assert abs(sketch.quantile(share) - exact) <= exact * 0.011
+
+    def test_sketch_memory_is_bounded(self):
+        sketch = QuantileSketch(max_buckets=50)
+        for value in range(1, 100000, 7):
+            sketch.add(value)
+        assert len(sketch.buckets) <= 50, (
+            'Число корзин оценки квантилей должно быть ограничено.'
+        )
+        assert sketch.quantile(0.99) > 90000
+
+    def test_tracker_alerts_on_slo_breach(self, tmp_path, caplog):
+        export_path = str(tmp_path / 'latency.json')
+        tracker = LatencyTracker(
+            slo_seconds=60, slo_quantile=0.95, report_every=5,
+            export_path=export_path
+        )
+        with caplog.at_level(logging.ERROR):
+            for _ in range(5):
+                tracker.observe(1000, 1300)
+        assert any(
+            record.levelno == logging.ERROR for record in caplog.records
+        ), 'Нарушение SLO задержки должно логироваться с уровнем `ERROR`.'
+        with open(export_path, encoding='utf-8') as exported:
+            snapshot = json.load(exported)
+        assert snapshot['count'] == 5
+        assert snapshot['slo_breached']
+        assert 297 <= snapshot['p50'] <= 303
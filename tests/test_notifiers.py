@@ -0,0 +1,120 @@
+import smtplib
+import threading
+import time
+
+import pytest
+import requests
+
+import notifiers
+
+
+class SlowNotifier(notifiers.Notifier):
+    name = 'slow'
+
+    def __init__(self):
+        super().__init__(timeout=1)
+        self.release = threading.Event()
+
+    def deliver(self, message):
+        self.release.wait(1)
+
+
+class StuckNotifier(notifiers.Notifier):
+    name = 'stuck'
+
+    def __init__(self):
+        super().__init__(timeout=0.1)
+        self.release = threading.Event()
+        self.calls = 0
+
+    def deliver(self, message):
+        self.calls += 1
+        self.release.wait(2)
+
+
+class RecordingNotifier(notifiers.Notifier):
+    name = 'recording'
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def deliver(self, message):
+        self.messages.append(message)
+
+
+class MockSMTP:
+    sent = []
+
+    def __init__(self, host, port, timeout=None):
+        self.timeout = timeout
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def send_message(self, email):
+        MockSMTP.sent.append(email)
+
+
+class TestNotifiers:
+    def test_slow_sink_does_not_block(self):
+        slow = SlowNotifier()
+        fast = RecordingNotifier()
+        fanout = notifiers.Fanout([slow, fast])
+        started = time.monotonic()
+        futures = fanout.send('Статус изменился')
+        assert time.monotonic() - started < 0.1, (
+            'Рассылка не должна ждать доставки по каналам.'
+        )
+        assert futures[1].result(timeout=0.5)
+        assert fast.messages == ['Статус изменился']
+        slow.release.set()
+        assert futures[0].result(timeout=0.5)
+
+    def test_stuck_sink_under_load(self):
+        stuck = StuckNotifier()
+        fast = RecordingNotifier()
+        fanout = notifiers.Fanout([stuck, fast])
+        futures = [fanout.send(str(number)) for number in range(5)]
+        assert all(
+            future.result(timeout=0.2) for _, future in futures
+        ), 'Зависший канал не должен задерживать остальные.'
+        assert fast.messages == [str(number) for number in range(5)]
+        assert not any(
+            future.result(timeout=1) for future, _ in futures
+        ), 'Доставка дольше таймаута канала должна считаться неудачной.'
+        assert stuck.calls == 1, (
+            'Пока вызов канала висит, новые вызовы не должны начинаться.'
+        )
+        stuck.release.set()
+
+    def test_sink_queue_is_bounded(self):
+        stuck = StuckNotifier()
+        worker = notifiers.SinkWorker(stuck, queue_size=3)
+        futures = [worker.submit(str(number)) for number in range(10)]
+        assert worker.dropped >= 6, 'Очередь канала должна быть ограничена.'
+        assert not any(future.done() and future.result() for future in futures)
+        stuck.release.set()
+
+    def test_failed_sink_reports_false(self, monkeypatch):
+        def mock_post(*args, **kwargs):
+            raise requests.ConnectionError('refused')
+
+        monkeypatch.setattr(requests, 'post', mock_post)
+        sink = notifiers.WebhookNotifier('http://localhost:9/hook')
+        assert sink.send('Статус изменился') is False
+
+    def test_email_notifier(self, monkeypatch):
+        monkeypatch.setattr(smtplib, 'SMTP', MockSMTP)
+        sink = notifiers.EmailNotifier(['student@localhost'], timeout=3)
+        assert sink.send('Статус изменился')
+        email = MockSMTP.sent[-1]
+        assert email['To'] == 'student@localhost'
+        assert email.get_content().strip() == 'Статус изменился'
+
+    def test_notifier_requires_deliver(self):
+        with pytest.raises(TypeError):
+            notifiers.Notifier()
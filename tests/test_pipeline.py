@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pytest
+
+from pipeline import Pipeline, Stage
+
+
+class TestPipeline:
+    def test_items_flow_through_stages(self):
+        errors = []
+        pipeline = Pipeline([
+            Stage('split', lambda item: [item, item * 10], 2),
+            Stage('check', lambda item: [item] if item != 30 else 1 / 0, 3),
+            Stage('square', lambda item: [item * item], 1),
+        ], on_error=lambda *args: errors.append(args[:2]), queue_size=1)
+        assert sorted(pipeline.run(range(1, 5))) == [
+            1, 4, 9, 16, 100, 400, 1600
+        ]
+        assert errors == [('check', 30)], (
+            'Ошибка одного элемента не должна останавливать остальные.'
+        )
+
+    def test_io_stages_overlap(self):
+        def slow_io(item):
+            time.sleep(0.05)
+            return [item]
+
+        started = time.monotonic()
+        results = Pipeline([
+            Stage('fetch', slow_io, 8),
+            Stage('send', slow_io, 8),
+        ], on_error=None).run(range(8))
+        assert sorted(results) == list(range(8))
+        assert time.monotonic() - started < 0.4, (
+            'Этапы ввода-вывода должны выполняться параллельно.'
+        )
+
+    def test_base_exception_reraised_without_hanging(self):
+        calls = []
+
+        def stop(item):
+            calls.append(item)
+            raise SystemExit('stop')
+
+        pipeline = Pipeline([
+            Stage('fetch', lambda item: [item], 1),
+            Stage('check', stop, 1),
+        ], on_error=None, queue_size=1)
+        with pytest.raises(SystemExit):
+            pipeline.run(range(20))
+        assert calls == [0]
+        assert not {'fetch-0', 'check-0'} & {
+            thread.name for thread in threading.enumerate()
+        }, 'После ошибки потоки конвейера должны завершаться.'
@@ -0,0 +1,62 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import prewarm
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def respond(self, body=b''):
+        self.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.respond()
+
+    def do_GET(self):
+        self.respond(b'{"homeworks": []}')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    KeepAliveHandler.connections = set()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}/'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestPrewarm:
+    def test_poll_reuses_prewarmed_connection(self, server):
+        session = prewarm.create_session()
+        prewarmer = prewarm.Prewarmer(session, timeout=1)
+        prewarmer.schedule(0, [server]).join()
+        assert len(KeepAliveHandler.connections) == 1
+        assert session.get(server, timeout=1).json() == {'homeworks': []}
+        assert len(KeepAliveHandler.connections) == 1, (
+            'Запрос после прогрева должен идти по уже открытому соединению.'
+        )
+
+    def test_failed_warm_logged(self):
+        prewarmer = prewarm.Prewarmer(prewarm.create_session(), timeout=0.2)
+        assert not prewarmer.warm_url('http://127.0.0.1:9/')
+
+    def test_http_get_defaults_to_requests(self, monkeypatch):
+        monkeypatch.setattr(prewarm, 'session', None)
+        monkeypatch.setattr(requests, 'get', 'patched')
+        assert prewarm.http_get() == 'patched', (
+            'Без прогрева запросы к API идут через requests.get.'
+        )
@@ -0,0 +1,59 @@
+import signal
+import threading
+
+import pytest
+
+import profiler
+
+
+def waiting_in_poll_loop(event):
+    event.wait()
+
+
+class TestProfiler:
+    def start_worker(self):
+        event = threading.Event()
+        worker = threading.Thread(
+            target=waiting_in_poll_loop, args=(event,), name='poll-loop'
+        )
+        worker.start()
+        return event, worker
+
+    def test_collapsed_stacks(self, tmp_path):
+        event, worker = self.start_worker()
+        try:
+            path = profiler.SamplingProfiler(
+                str(tmp_path), seconds=0.05, interval=0.005
+            ).run()
+        finally:
+            event.set()
+            worker.join()
+        lines = open(path, encoding='utf-8').read().splitlines()
+        worker_lines = [
+            line for line in lines if line.startswith('poll-loop;')
+        ]
+        assert worker_lines, 'Профиль должен содержать стеки всех потоков.'
+        stack, count = worker_lines[0].rsplit(' ', 1)
+        assert 'waiting_in_poll_loop (test_profiler.py:' in stack
+        assert int(count) > 1
+        assert not any(line.startswith('profiler;') for line in lines), (
+            'Профилировщик не должен попадать в собственный профиль.'
+        )
+
+    @pytest.mark.skipif(
+        not hasattr(signal, 'SIGUSR1'), reason='нет SIGUSR1'
+    )
+    def test_signal_starts_single_session(self, tmp_path):
+        previous = signal.getsignal(signal.SIGUSR1)
+        try:
+            session = profiler.install(str(tmp_path))
+            session.seconds = 0.05
+            signal.raise_signal(signal.SIGUSR1)
+            assert session.running
+            assert not session.start(), (
+                'Повторный сигнал не должен запускать вторую сессию.'
+            )
+            session.thread.join()
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+        assert len(list(tmp_path.glob('profile-*.folded'))) == 1
@@ -0,0 +1,37 @@
+from records import Homework, from_payload, to_timestamp
+
+
+class TestRecords:
+    PAYLOAD = {
+        'id': 777777777,
+        'homework_name': 'hw777.zip',
+        'status': 'approved',
+        'reviewer_comment': 'Принято!',
+        'date_updated': '2021-04-11T10:31:09Z',
+        'lesson_name': 'Проект спринта: Деплой бота'
+    }
+
+    def test_record_from_payload(self):
+        record = Homework.from_payload(self.PAYLOAD)
+        assert record == (
+            777777777, 'hw777.zip', 'approved',
+            'Проект спринта: Деплой бота', 1618137069
+        )
+        assert not hasattr(record, '__dict__'), (
+            'Запись о работе не должна хранить словарь атрибутов.'
+        )
+
+    def test_strings_are_shared(self):
+        first, second = from_payload([
+            dict(self.PAYLOAD, status=''.join(['appr', 'oved'])),
+            dict(self.PAYLOAD, status=''.join(['app', 'roved'])),
+        ])
+        assert first.status is second.status, (
+            'Одинаковые статусы должны ссылаться на одну строку.'
+        )
+
+    def test_to_timestamp(self):
+        assert to_timestamp('1970-01-01T00:01:00Z') == 60
+        assert to_timestamp(None) == 0
+        assert to_timestamp(1618137069) == 0
+        assert to_timestamp('вчера') == 0
@@ -0,0 +1,51 @@
+import json
+import time
+
+import pytest
+
+import routing
+
+
+class TestRouting:
+    RULES = [
+        {'chat_id': 'mentor', 'status': 'rejected'},
+        {'chat_id': 'group', 'lesson': 'Деплой бота'},
+        {'chat_id': 'curator', 'account': 'student', 'status': 'approved'},
+        {'chat_id': 'everything'},
+    ]
+
+    def test_route_matches_wildcards(self):
+        router = routing.Router(self.RULES, default_chats=['12345'])
+        assert router.route('student', 'rejected', 'Деплой бота') == (
+            '12345', 'mentor', 'group', 'everything'
+        )
+        assert router.route('student', 'approved', 'Другой урок') == (
+            '12345', 'curator', 'everything'
+        )
+        assert router.route('other', 'reviewing', None) == (
+            '12345', 'everything'
+        )
+
+    def test_rule_without_chat(self):
+        with pytest.raises(KeyError):
+            routing.Router([{'status': 'rejected'}])
+
+    def test_load_from_file(self, tmp_path):
+        path = tmp_path / 'routes.json'
+        path.write_text(json.dumps(self.RULES), encoding='utf-8')
+        router = routing.load(str(path), default_chats=[12345])
+        assert router.route('x', 'rejected', None)[:2] == ('12345', 'mentor')
+        assert routing.load(None, ['1']).route('x', 'y', 'z') == ('1',)
+
+    def test_many_rules_constant_lookup(self):
+        rules = [
+            {'chat_id': f'chat{number}', 'lesson': f'lesson{number}'}
+            for number in range(20000)
+        ]
+        router = routing.Router(rules)
+        started = time.perf_counter()
+        for number in range(20000):
+            assert router.resolve('student', 'approved', f'lesson{number}')
+        assert time.perf_counter() - started < 0.5, (
+            'Маршрут не должен перебирать все правила.'
+        )
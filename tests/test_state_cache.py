@@ -0,0 +1,82 @@
+import time
+
+import storage
+from records import Homework
+from state_cache import StateCache
+
+
+class TestStateCache:
+    def test_lru_spills_and_reloads(self):
+        cache = StateCache(storage.connect(':memory:'), max_accounts=2)
+        first = cache.get('first')
+        first.last_status = 'Работа взята на проверку ревьюером.'
+        first.homeworks[1] = Homework(1, 'hw1.zip', 'reviewing', None, 0)
+        cache.get('second')
+        cache.get('third')
+        assert len(cache) == 2, (
+            'Кэш состояний не должен хранить больше `max_accounts` '
+            'аккаунтов.'
+        )
+        assert 'first' not in cache.states
+        last_status, homeworks = first.last_status, first.homeworks
+        del first
+        reloaded = cache.get('first')
+        assert reloaded.last_status == last_status, (
+            'Вытесненное состояние должно загружаться из хранилища.'
+        )
+        assert reloaded.homeworks == homeworks
+        assert 'second' not in cache.states
+
+    def test_ttl_expiration(self, monkeypatch):
+        cache = StateCache(storage.connect(':memory:'), ttl=60)
+        cache.get('idle').timestamp = 123
+        now = time.monotonic()
+        monkeypatch.setattr(time, 'monotonic', lambda: now + 61)
+        cache.get('active')
+        assert list(cache.states) == ['active']
+        assert cache.get('idle').timestamp == 123
+
+    def test_pinned_states_not_spilled(self):
+        connection = storage.connect(':memory:')
+        cache = StateCache(connection, max_accounts=2)
+        accounts = ['first', 'second', 'third', 'fourth']
+        with cache.pinned(accounts):
+            states = [cache.get(account) for account in accounts]
+            assert len(cache) == 4, (
+                'Состояния, закреплённые на цикл, не должны вытесняться.'
+            )
+            for state in states:
+                state.timestamp = 777
+        assert len(cache) == 2
+        assert all(
+            storage.load_account(connection, account)[0] == 777
+            for account in accounts[:2]
+        ), 'После цикла состояния должны вытесняться со всеми изменениями.'
+
+    def test_spilled_state_still_in_use_is_reused(self):
+        cache = StateCache(storage.connect(':memory:'), max_accounts=1)
+        queued = cache.get('first')
+        cache.get('second')
+        assert 'first' not in cache.states
+        queued.last_error = 'Сбой'
+        assert cache.get('first') is queued, (
+            'Пока вытесненное состояние используется, загрузка должна '
+            'возвращать тот же объект.'
+        )
+
+    def test_merge_stored_prefers_newer_records(self):
+        connection = storage.connect(':memory:')
+        cache = StateCache(connection)
+        state = cache.get('student')
+        state.homeworks[1] = Homework(1, 'hw1.zip', 'reviewing', None, 10)
+        state.homeworks[2] = Homework(2, 'hw2.zip', 'approved', None, 30)
+        storage.save_homeworks(connection, 'student', [
+            Homework(1, 'hw1.zip', 'approved', None, 20),
+            Homework(2, 'hw2.zip', 'reviewing', None, 5),
+        ])
+        cache.merge_stored('student')
+        assert state.homeworks[1].status == 'approved', (
+            'Записи, сохранённые другим процессом, должны попадать '
+            'в состояние в памяти.'
+        )
+        assert state.homeworks[2].status == 'approved'
@@ -0,0 +1,145 @@
+from types import SimpleNamespace
+
+import deadline
+import homework
+import notifiers
+import replay
+import routing
+import status_messages
+import storage
+
+
+class MockEditingBot:
+    def __init__(self, fail_edit=False):
+        self.fail_edit = fail_edit
+        self.sent = []
+        self.edited = []
+        self.pinned = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append(text)
+        return SimpleNamespace(message_id=100 + len(self.sent))
+
+    def edit_message_text(self, text, chat_id=None, message_id=None):
+        if self.fail_edit:
+            raise RuntimeError('message to edit not found')
+        self.edited.append((message_id, text))
+
+    def pin_chat_message(self, chat_id, message_id, **kwargs):
+        self.pinned.append(message_id)
+
+
+class TimeoutBot(MockEditingBot):
+    def __init__(self):
+        super().__init__()
+        self.timeouts = []
+
+    def send_message(self, chat_id=None, text=None, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        return super().send_message(chat_id, text)
+
+    def edit_message_text(self, text, chat_id=None, message_id=None,
+                          timeout=None):
+        self.timeouts.append(timeout)
+        return super().edit_message_text(text, chat_id, message_id)
+
+
+class TestStatusMessages:
+    def test_second_change_edits_pinned_message(self):
+        connection = storage.connect(':memory:')
+        bot = MockEditingBot()
+        for text in ('на проверке', 'принято'):
+            assert status_messages.publish(
+                bot, connection, 'student', 1, '12345', text
+            )
+        assert bot.sent == ['на проверке']
+        assert bot.pinned == [101]
+        assert bot.edited == [(101, 'принято')], (
+            'Повторное изменение статуса должно обновлять '
+            'закреплённое сообщение.'
+        )
+
+    def test_missing_message_is_resent(self):
+        connection = storage.connect(':memory:')
+        storage.save_message_id(connection, 'student', 1, '12345', 55)
+        bot = MockEditingBot(fail_edit=True)
+        assert status_messages.publish(
+            bot, connection, 'student', 1, '12345', 'принято'
+        )
+        assert bot.sent == ['принято']
+        assert storage.load_message_id(
+            connection, 'student', 1, '12345'
+        ) == 101
+
+    def test_edit_mode_broadcasts_once_per_change(self, monkeypatch):
+        broadcasts = []
+        monkeypatch.setattr(homework, 'EDIT_STATUS_MESSAGES', True)
+        monkeypatch.setattr(notifiers, 'broadcast', broadcasts.append)
+        runtime = replay.build_runtime(MockEditingBot())._replace(
+            router=routing.Router(default_chats=['1', '2', '3'])
+        )
+        state = runtime.states.get('student')
+        change = {'id': 1, 'homework_name': 'hw.zip', 'status': 'approved'}
+        delivered = homework.queue_changes(
+            runtime, state, [(change, 'принято')]
+        )
+        assert delivered == [(state, change)]
+        assert len(runtime.bot.sent) == 3
+        assert broadcasts == ['принято'], (
+            'Дополнительные каналы должны получать изменение один раз, '
+            'сколько бы чатов ни было в маршруте.'
+        )
+
+    def test_edit_mode_queues_records_without_id(self, monkeypatch):
+        monkeypatch.setattr(homework, 'EDIT_STATUS_MESSAGES', True)
+        runtime = replay.build_runtime(MockEditingBot())
+        state = runtime.states.get('student')
+        change = {'homework_name': 'hw.zip', 'status': 'approved'}
+        delivered = homework.queue_changes(
+            runtime, state, [(change, 'принято')]
+        )
+        assert delivered == [] and not runtime.bot.sent, (
+            'Работу без `id` нельзя связать с сообщением, она должна '
+            'идти обычной очередью.'
+        )
+        assert homework.flush_changes(runtime) == [(state, change)]
+        assert runtime.bot.sent == ['принято']
+        assert not runtime.bot.pinned
+
+    def test_edit_mode_no_broadcast_on_failure(self, monkeypatch):
+        broadcasts = []
+        monkeypatch.setattr(homework, 'EDIT_STATUS_MESSAGES', True)
+        monkeypatch.setattr(notifiers, 'broadcast', broadcasts.append)
+        monkeypatch.setattr(
+            status_messages, 'publish', lambda *args, **kwargs: False
+        )
+        runtime = replay.build_runtime(MockEditingBot())
+        state = runtime.states.get('student')
+        change = {'id': 1, 'homework_name': 'hw.zip', 'status': 'approved'}
+        assert homework.queue_changes(
+            runtime, state, [(change, 'принято')]
+        ) == []
+        assert broadcasts == [], (
+            'Без отправки в основной чат изменение не должно уходить '
+            'в дополнительные каналы.'
+        )
+
+    def test_calls_use_send_budget(self, clock, monkeypatch):
+        cycle = deadline.Deadline(10, {'send': 0.4}, clock=clock)
+        monkeypatch.setattr(deadline, 'current', cycle)
+        connection = storage.connect(':memory:')
+        bot = TimeoutBot()
+        for text in ('на проверке', 'принято'):
+            assert status_messages.publish(
+                bot, connection, 'student', 1, '12345', text
+            )
+        assert bot.timeouts == [4, 4], (
+            'Отправка и правка сообщений должны получать таймаут '
+            'из бюджета этапа `send`.'
+        )
+        clock.now = 10
+        assert not status_messages.publish(
+            bot, connection, 'student', 1, '12345', 'доработать'
+        )
+        assert len(bot.timeouts) == 2 and bot.sent == ['на проверке']
+        assert cycle.timeouts['send'] == 1
@@ -0,0 +1,43 @@
+import pytest
+
+import validation
+from constants import HOMEWORK_VERDICTS
+
+
+class TestValidation:
+    GOOD = {
+        'id': 1,
+        'homework_name': 'hw.zip',
+        'status': 'approved',
+        'lesson_name': 'Проект спринта',
+        'date_updated': '2021-04-11T10:31:09Z'
+    }
+
+    @pytest.mark.parametrize('homework, hint', [
+        ('broken', 'dict'),
+        ({'status': 'approved'}, 'homework_name'),
+        ({'homework_name': 'hw.zip', 'status': 1}, 'status'),
+        ({'homework_name': 'hw.zip', 'status': 'lost'}, 'lost'),
+        ({'id': '1', 'homework_name': 'hw.zip', 'status': 'approved'}, 'id'),
+        ({'homework_name': 'hw.zip', 'status': 'approved', 'lesson_name': 1},
+         'lesson_name'),
+        ({'homework_name': 'hw.zip', 'status': 'approved',
+          'date_updated': 1618137069}, 'date_updated'),
+        ({'homework_name': 'hw.zip', 'status': 'approved',
+          'date_updated': 'вчера'}, 'date_updated'),
+    ])
+    def test_bad_records_quarantined(self, homework, hint):
+        validator = validation.Validator(HOMEWORK_VERDICTS)
+        valid, rejected = validator.split([self.GOOD, homework, self.GOOD])
+        assert valid == [self.GOOD, self.GOOD], (
+            'Корректные записи должны обрабатываться, несмотря на плохие.'
+        )
+        assert len(rejected) == 1 and rejected[0][0] == homework
+        assert hint in rejected[0][1], (
+            'Причина отказа должна называть проблемное поле.'
+        )
+
+    def test_generic_fallback_accepts_unknown_status(self):
+        validator = validation.Validator(HOMEWORK_VERDICTS, fallback='generic')
+        homework = dict(self.GOOD, status='lost')
+        assert validator.split([homework]) == ([homework], [])
@@ -0,0 +1,51 @@
+import logging
+import threading
+
+import watchdog
+
+
+class TestWatchdog:
+    def test_stall_reported_once_with_stack(self, clock, caplog):
+        guard = watchdog.Watchdog(threshold=5, clock=clock)
+        with caplog.at_level(logging.CRITICAL):
+            with guard.watch('api'):
+                clock.now = 3
+                assert guard.check() == 0
+                clock.now = 6
+                assert guard.check() == 1
+                assert guard.check() == 0, (
+                    'О зависании этапа достаточно сообщить один раз.'
+                )
+        assert 'test_stall_reported_once_with_stack' in caplog.text, (
+            'В журнал должен попадать стек зависшего потока.'
+        )
+        assert guard.active == {}
+
+    def test_nested_stages_restore_outer(self, clock):
+        guard = watchdog.Watchdog(threshold=5, clock=clock)
+        thread_id = threading.get_ident()
+        with guard.watch('api'):
+            with guard.watch('send'):
+                assert guard.active[thread_id][0] == 'send'
+            assert guard.active[thread_id][0] == 'api'
+
+    def test_exit_on_stall(self, clock):
+        codes = []
+        guard = watchdog.Watchdog(
+            threshold=1, exit_on_stall=True, clock=clock, exit=codes.append
+        )
+        with guard.watch('send'):
+            clock.now = 2
+            guard.check()
+        assert codes == [watchdog.WATCHDOG_EXIT_CODE], (
+            'При зависании процесс должен завершаться для перезапуска.'
+        )
+
+    def test_background_thread(self):
+        guard = watchdog.Watchdog(threshold=0.02).start()
+        stalled = threading.Event()
+        guard.check = lambda: stalled.set()
+        try:
+            assert stalled.wait(1)
+        finally:
+            guard.stop()
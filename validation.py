@@ -0,0 +1,107 @@
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+from constants import (
+    UNKNOWN_STATUS_FALLBACK,
+    INVALID_STATUS,
+    INVALID_RECORD_TYPE,
+    INVALID_FIELD_TYPE,
+    INVALID_DATE,
+    DATE_CACHE_SIZE
+)
+
+
+# Обязательные поля записи и допустимые типы их значений
+REQUIRED_FIELDS = (('homework_name', str), ('status', str))
+OPTIONAL_FIELDS = (('id', int), ('lesson_name', str), ('date_updated', str))
+ID_TYPES = frozenset((int, type(None)))
+OPTIONAL_STR_TYPES = frozenset((str, type(None)))
+
+
+# Одни и те же записи приходят каждый опрос, даты разбираются один раз
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def is_iso_date(value):
+    """Проверяет, что строка разбирается как дата ISO 8601."""
+    try:
+        datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return False
+    return True
+
+
+def is_date(value):
+    """Проверяет, что `date_updated` пусто или в формате ISO 8601."""
+    return value is None or type(value) is str and is_iso_date(value)
+
+
+class Validator:
+    """Проверка списка `homeworks` за один проход.
+
+    Всё, что можно вычислить заранее (допустимые статусы, типы полей),
+    собирается при создании. Корректная запись проходит одну короткую
+    проверку, причина отказа ищется только для плохих записей.
+    """
+
+    def __init__(self, verdicts, fallback=UNKNOWN_STATUS_FALLBACK):
+        """Собирает проверку записи под допустимые статусы."""
+        self.verdicts = verdicts
+        # При общем запасном тексте годится любой строковый статус
+        self.statuses = None if fallback == 'generic' else frozenset(verdicts)
+
+    def is_valid(self, homework):
+        """Быстро проверяет одну запись."""
+        return (
+            type(homework) is dict
+            and type(homework.get('homework_name')) is str
+            and type(homework.get('status')) is str
+            and (self.statuses is None or homework['status'] in self.statuses)
+            and type(homework.get('id')) in ID_TYPES
+            and type(homework.get('lesson_name')) in OPTIONAL_STR_TYPES
+            and is_date(homework.get('date_updated'))
+        )
+
+    def reason(self, homework):
+        """Объясняет, почему запись не прошла проверку."""
+        if not isinstance(homework, dict):
+            return INVALID_RECORD_TYPE.format(
+                type_name=type(homework).__name__
+            )
+        for key, expected in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+            value = homework.get(key)
+            if value is None and (key, expected) in OPTIONAL_FIELDS:
+                continue
+            if type(value) is not expected:
+                return INVALID_FIELD_TYPE.format(
+                    key=key,
+                    expected=expected.__name__,
+                    actual=type(value).__name__
+                )
+        if not is_date(homework.get('date_updated')):
+            return INVALID_DATE.format(value=homework['date_updated'])
+        return INVALID_STATUS.format(homework_status=homework['status'])
+
+    def split(self, homeworks):
+        """Делит записи на корректные и отклонённые с причинами."""
+        is_valid = self.is_valid
+        valid = []
+        rejected = []
+        for homework in homeworks:
+            if is_valid(homework):
+                valid.append(homework)
+            else:
+                rejected.append((homework, self.reason(homework)))
+        return valid, rejected
+
+
+validator = None
+lock = threading.Lock()
+
+
+def for_verdicts(verdicts):
+    """Возвращает проверку для текущих вердиктов, пересобирая её при смене."""
+    global validator
+    with lock:
+        if validator is None or validator.verdicts is not verdicts:
+            validator = Validator(verdicts)
+        return validator
@@ -0,0 +1,131 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+from constants import (
+    WATCHDOG_THRESHOLD,
+    WATCHDOG_EXIT,
+    WATCHDOG_EXIT_CODE,
+    WATCHDOG_STALL,
+    WATCHDOG_EXITING
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class Watchdog:
+    """Сторож этапов цикла опроса.
+
+    Этапы отмечают начало и конец через `watch()`. Фоновый поток
+    проверяет, не выполняется ли какой-то этап дольше `threshold`
+    секунд, и пишет в журнал стек зависшего потока. С `exit_on_stall`
+    процесс завершается, чтобы платформа перезапустила бота.
+    """
+
+    def __init__(self, threshold=WATCHDOG_THRESHOLD, exit_on_stall=False,
+                 clock=time.monotonic, exit=os._exit):
+        """Настраивает порог и реакцию на зависание."""
+        self.threshold = threshold
+        self.exit_on_stall = exit_on_stall
+        self.clock = clock
+        self.exit = exit
+        self.active = {}
+        self.reported = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @contextmanager
+    def watch(self, stage):
+        """Отмечает выполнение этапа текущим потоком."""
+        thread_id = threading.get_ident()
+        beat = (stage, self.clock())
+        with self.lock:
+            previous = self.active.get(thread_id)
+            self.active[thread_id] = beat
+        try:
+            yield
+        finally:
+            with self.lock:
+                if previous is None:
+                    self.active.pop(thread_id, None)
+                else:
+                    self.active[thread_id] = previous
+                self.reported.discard((thread_id, beat))
+
+    def stalled(self):
+        """Возвращает этапы, превысившие порог, о которых ещё не сообщали."""
+        now = self.clock()
+        with self.lock:
+            stalled = [
+                (thread_id, beat) for thread_id, beat in self.active.items()
+                if now - beat[1] > self.threshold
+                and (thread_id, beat) not in self.reported
+            ]
+            self.reported.update(stalled)
+        return stalled
+
+    def check(self):
+        """Сообщает о зависших этапах, возвращает их число."""
+        stalled = self.stalled()
+        frames = sys._current_frames() if stalled else {}
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, (stage, started) in stalled:
+            frame = frames.get(thread_id)
+            logger.critical(WATCHDOG_STALL.format(
+                stage=stage,
+                thread=names.get(thread_id, thread_id),
+                elapsed=self.clock() - started,
+                threshold=self.threshold,
+                stack=''.join(traceback.format_stack(frame)) if frame else ''
+            ))
+        if stalled and self.exit_on_stall:
+            logger.critical(WATCHDOG_EXITING)
+            for handler in logging.getLogger().handlers:
+                handler.flush()
+            # os._exit не ждёт зависший поток, в отличие от sys.exit
+            self.exit(WATCHDOG_EXIT_CODE)
+        return len(stalled)
+
+    def run(self):
+        """Проверяет этапы, пока сторож не остановлен."""
+        interval = max(self.threshold / 4, 0.01)
+        while not self.stopped.wait(interval):
+            self.check()
+
+    def start(self):
+        """Запускает фоновый поток проверки."""
+        self.thread = threading.Thread(
+            target=self.run, name='watchdog', daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Останавливает фоновый поток."""
+        self.stopped.set()
+
+
+current = None
+
+
+def start(threshold=WATCHDOG_THRESHOLD, exit_on_stall=WATCHDOG_EXIT):
+    """Включает сторожа цикла опроса."""
+    global current
+    current = Watchdog(threshold, exit_on_stall).start()
+    return current
+
+
+@contextmanager
+def watch(stage):
+    """Отмечает этап для сторожа, если он включён."""
+    if current is None:
+        yield
+        return
+    with current.watch(stage):
+        yield